@@ -6,15 +6,16 @@ from routes.auth import auth_bp
 from routes.main import main_bp
 from routes.api import api_bp
 from config import config
+import utils.rate_limit_storage  # registers the sqlite:// limiter storage
 import os
 from datetime import timedelta
 
 # Initialize extensions
 csrf = CSRFProtect()
+# Counter storage comes from RATELIMIT_STORAGE_URI (shared across workers)
 limiter = Limiter(
     key_func=get_remote_address,
     default_limits=["200 per day", "50 per hour"],
-    storage_uri="memory://",
 )
 
 def create_app(config_name=None):
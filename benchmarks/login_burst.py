@@ -0,0 +1,144 @@
+"""
+Login burst benchmark
+Fires a burst of failed logins at a running CellApp instance while a probe
+keeps requesting a cheap page, and reports how many probe requests were
+served during the burst. With sync workers, every worker ends up parked in a
+failed login (bcrypt + padding) and the probe stalls; with threaded or
+gevent workers the padding wait no longer holds the worker.
+
+Usage (plain-HTTP test instance; app:app uses the development config so the
+session cookie is not Secure, and the rate limiter is switched off):
+    RATELIMIT_ENABLED=false gunicorn --workers 4 --worker-class gthread --threads 8 \
+        --bind 127.0.0.1:5001 app:app
+    python benchmarks/login_burst.py --url http://127.0.0.1:5001 --logins 64 --concurrency 32
+
+Only the standard library is used so it runs from any machine.
+"""
+
+import argparse
+import http.cookiejar
+import re
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+CSRF_PATTERN = re.compile(r'name="csrf_token" value="([^"]+)"')
+
+
+def _opener():
+    return urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+
+
+def _request(opener, url, data=None, timeout=60):
+    """Perform a request and return (status, body, seconds)"""
+    started = time.perf_counter()
+    try:
+        with opener.open(url, data=data, timeout=timeout) as response:
+            body = response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        body = e.read()
+        status = e.code
+    return status, body, time.perf_counter() - started
+
+
+def bad_login(base_url, index, results):
+    """GET the login form for a CSRF token, then POST a wrong password"""
+    opener = _opener()
+    status, body, _ = _request(opener, f"{base_url}/login")
+    match = CSRF_PATTERN.search(body.decode('utf-8', 'replace'))
+    form = {
+        'mobile': f"07{index % 100000000:08d}",
+        'password': 'wrong-password',
+        'csrf_token': match.group(1) if match else ''
+    }
+    status, _, seconds = _request(opener, f"{base_url}/login", urllib.parse.urlencode(form).encode('ascii'))
+    results.append((status, seconds))
+
+
+def probe(base_url, path, stop, results):
+    """Request a cheap page back to back until stopped"""
+    opener = _opener()
+    while not stop.is_set():
+        try:
+            status, _, seconds = _request(opener, f"{base_url}{path}", timeout=30)
+        except OSError:
+            continue
+        results.append((status, seconds))
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run(base_url, logins, concurrency, probe_path, probes):
+    login_results = []
+    probe_results = []
+    stop = threading.Event()
+
+    probe_threads = [threading.Thread(target=probe, args=(base_url, probe_path, stop, probe_results), daemon=True)
+                     for _ in range(probes)]
+    for thread in probe_threads:
+        thread.start()
+
+    started = time.perf_counter()
+    pending = list(range(logins))
+    lock = threading.Lock()
+
+    def login_worker():
+        while True:
+            with lock:
+                if not pending:
+                    return
+                index = pending.pop()
+            bad_login(base_url, index, login_results)
+
+    login_threads = [threading.Thread(target=login_worker, daemon=True) for _ in range(concurrency)]
+    for thread in login_threads:
+        thread.start()
+    for thread in login_threads:
+        thread.join()
+    burst_seconds = time.perf_counter() - started
+
+    stop.set()
+    for thread in probe_threads:
+        thread.join(timeout=30)
+
+    login_times = [seconds for _, seconds in login_results]
+    probe_times = [seconds for status, seconds in probe_results if status == 200]
+    statuses = {}
+    for status, _ in login_results:
+        statuses[status] = statuses.get(status, 0) + 1
+
+    print(f"burst: {logins} failed logins, {concurrency} concurrent, {burst_seconds:.2f}s "
+          f"({logins / burst_seconds:.1f} logins/s), statuses {statuses}")
+    print(f"login latency: p50 {statistics.median(login_times) * 1000:.0f} ms, "
+          f"p95 {percentile(login_times, 0.95) * 1000:.0f} ms, max {max(login_times) * 1000:.0f} ms")
+    if probe_times:
+        print(f"probe {probe_path}: {len(probe_times)} served during the burst "
+              f"({len(probe_times) / burst_seconds:.1f} req/s), "
+              f"p50 {statistics.median(probe_times) * 1000:.0f} ms, "
+              f"p95 {percentile(probe_times, 0.95) * 1000:.0f} ms, max {max(probe_times) * 1000:.0f} ms")
+    else:
+        print(f"probe {probe_path}: no requests served during the burst")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', default='http://127.0.0.1:5001', help='Base URL of the app')
+    parser.add_argument('--logins', type=int, default=64, help='Failed logins in the burst')
+    parser.add_argument('--concurrency', type=int, default=32, help='Concurrent login clients')
+    parser.add_argument('--probe-path', default='/api/health', help='Cheap page requested during the burst')
+    parser.add_argument('--probes', type=int, default=2, help='Concurrent probe clients')
+    args = parser.parse_args()
+    run(args.url.rstrip('/'), args.logins, args.concurrency, args.probe_path, args.probes)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+"""
+Worker class benchmark
+Starts the app under gunicorn once per worker class (sync, gthread, gevent)
+using gunicorn.conf.py, logs in as a leader and loads the dashboard and the
+attendance list with concurrent clients, then reports requests per second and
+latency percentiles for each page and worker class.
+
+Usage (against a test Supabase project or a local PostgREST; app:app uses the
+development config so the session cookie is not Secure over plain HTTP, and
+the rate limiter is switched off for the run):
+    python benchmarks/worker_classes.py --mobile 07XXXXXXXX --password '...' \\
+        --classes sync,gthread,gevent --workers 4 --threads 8 --concurrency 16 --duration 10
+
+Only the standard library is used (plus gunicorn, and gevent for that class).
+"""
+
+import argparse
+import http.cookiejar
+import importlib.util
+import os
+import re
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CSRF_PATTERN = re.compile(r'name="csrf_token" value="([^"]+)"')
+
+
+def _request(opener, url, data=None, timeout=60):
+    """Perform a request and return (status, final url, seconds)"""
+    started = time.perf_counter()
+    try:
+        with opener.open(url, data=data, timeout=timeout) as response:
+            response.read()
+            status = response.status
+            final_url = response.geturl()
+    except urllib.error.HTTPError as e:
+        e.read()
+        status = e.code
+        final_url = url
+    return status, final_url, time.perf_counter() - started
+
+
+def start_server(app, worker_class, workers, threads, port):
+    """Start gunicorn with gunicorn.conf.py and the given worker class"""
+    env = dict(os.environ)
+    env.update({
+        'GUNICORN_WORKER_CLASS': worker_class,
+        'GUNICORN_WORKERS': str(workers),
+        'GUNICORN_THREADS': str(threads),
+        'GUNICORN_WORKER_CONNECTIONS': str(threads * 8),
+        'GUNICORN_MAX_REQUESTS': '0',
+        'RATELIMIT_ENABLED': 'false'
+    })
+    return subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', os.path.join(ROOT, 'gunicorn.conf.py'),
+         '--bind', f"127.0.0.1:{port}", '--log-level', 'warning', app],
+        cwd=ROOT, env=env
+    )
+
+
+def wait_ready(base_url, process, timeout=30):
+    opener = urllib.request.build_opener()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            return False
+        try:
+            if _request(opener, f"{base_url}/api/health", timeout=2)[0] == 200:
+                return True
+        except OSError:
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def login(base_url, mobile, password):
+    """Log in through the form and return an opener carrying the session cookie"""
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+    with opener.open(f"{base_url}/login", timeout=30) as response:
+        match = CSRF_PATTERN.search(response.read().decode('utf-8', 'replace'))
+    form = urllib.parse.urlencode({
+        'mobile': mobile,
+        'password': password,
+        'csrf_token': match.group(1) if match else ''
+    }).encode('ascii')
+    status, final_url, _ = _request(opener, f"{base_url}/login", form)
+    if status != 200 or urllib.parse.urlparse(final_url).path.rstrip('/').endswith('login'):
+        raise RuntimeError(f"Login failed (status {status}); check --mobile/--password")
+    return opener
+
+
+def load(opener, url, concurrency, duration):
+    """Request url from concurrent clients for duration seconds; returns (latencies, errors, seconds)"""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client():
+        while time.monotonic() < deadline:
+            try:
+                status, _, seconds = _request(opener, url)
+            except OSError:
+                status, seconds = None, 0.0
+            with lock:
+                if status == 200:
+                    latencies.append(seconds)
+                else:
+                    errors[0] += 1
+
+    started = time.perf_counter()
+    clients = [threading.Thread(target=client, daemon=True) for _ in range(concurrency)]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    return latencies, errors[0], time.perf_counter() - started
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run(args):
+    base_url = f"http://127.0.0.1:{args.port}"
+    pages = [page.strip() for page in args.pages.split(',') if page.strip()]
+    rows = []
+
+    for worker_class in [name.strip() for name in args.classes.split(',') if name.strip()]:
+        if worker_class == 'gevent' and importlib.util.find_spec('gevent') is None:
+            print(f"{worker_class}: skipped (gevent is not installed)")
+            continue
+        process = start_server(args.app, worker_class, args.workers, args.threads, args.port)
+        try:
+            if not wait_ready(base_url, process):
+                print(f"{worker_class}: server did not start")
+                continue
+            opener = login(base_url, args.mobile, args.password)
+            for page in pages:
+                load(opener, f"{base_url}{page}", args.concurrency, min(2.0, args.duration))  # warm up
+                latencies, errors, seconds = load(opener, f"{base_url}{page}", args.concurrency, args.duration)
+                rows.append((worker_class, page, len(latencies) / seconds,
+                             statistics.median(latencies) * 1000 if latencies else 0.0,
+                             percentile(latencies, 0.95) * 1000, errors))
+                print(f"{worker_class} {page}: {rows[-1][2]:.1f} req/s, p95 {rows[-1][4]:.0f} ms")
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    print()
+    print(f"{'worker class':<14}{'page':<20}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'errors':>8}")
+    for worker_class, page, rps, p50, p95, errors in rows:
+        print(f"{worker_class:<14}{page:<20}{rps:>10.1f}{p50:>10.0f}{p95:>10.0f}{errors:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--mobile', required=True, help='Leader mobile number to log in with')
+    parser.add_argument('--password', required=True, help='Leader password')
+    parser.add_argument('--app', default='app:app', help='WSGI app passed to gunicorn')
+    parser.add_argument('--classes', default='sync,gthread,gevent', help='Worker classes to compare')
+    parser.add_argument('--workers', type=int, default=4, help='Gunicorn workers')
+    parser.add_argument('--threads', type=int, default=8, help='Threads per gthread worker (gevent gets 8x connections)')
+    parser.add_argument('--pages', default='/,/attendance-list', help='Pages to load, comma separated')
+    parser.add_argument('--concurrency', type=int, default=16, help='Concurrent clients per page')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds of load per page')
+    parser.add_argument('--port', type=int, default=5099, help='Port for the benchmark server')
+    run(parser.parse_args())
+
+
+if __name__ == '__main__':
+    main()
@@ -36,8 +36,10 @@ class Config:
     PERMANENT_SESSION_LIFETIME = 1800  # 30 minutes (reduced from 1 hour)
     
     # Rate limiting settings
-    RATELIMIT_ENABLED = True
-    RATELIMIT_STORAGE_URL = "memory://"
+    RATELIMIT_ENABLED = os.getenv('RATELIMIT_ENABLED', 'true').lower() == 'true'
+    # Counter storage: sqlite:// is one file shared by all workers on the host
+    # (memory:// counts per worker, so each limit would be multiplied by the worker count)
+    RATELIMIT_STORAGE_URI = os.getenv('RATELIMIT_STORAGE_URI', 'sqlite://')
     
     # Database settings (if you add a database later)
     DATABASE_URL = os.getenv('DATABASE_URL')
@@ -46,6 +48,36 @@ class Config:
     SMS_API_KEY = os.getenv('SMS_API_KEY')
     SMS_SENDER_ID = os.getenv('SMS_SENDER_ID')
     
+    # Meetings calendar cache (seconds before the meetings table is re-read)
+    MEETINGS_CACHE_TTL = int(os.getenv('MEETINGS_CACHE_TTL') or '300')
+    # Seconds between checks of the meetings fingerprint (reloads as soon as a meeting changes)
+    MEETINGS_VERSION_CHECK_INTERVAL = int(os.getenv('MEETINGS_VERSION_CHECK_INTERVAL') or '15')
+    
+    # Tutorials cache (seconds a meeting date's tutorials, or "no tutorial", are reused)
+    TUTORIALS_CACHE_TTL = int(os.getenv('TUTORIALS_CACHE_TTL') or '300')
+    # "No tutorial" answers expire sooner: an upload only invalidates the worker that handled it
+    TUTORIALS_EMPTY_CACHE_TTL = int(os.getenv('TUTORIALS_EMPTY_CACHE_TTL') or '5')
+    
+    # Leader context kept in the session (seconds before branch/country are re-read from users)
+    LEADER_CONTEXT_TTL = int(os.getenv('LEADER_CONTEXT_TTL') or '300')
+    
+    # Dashboard recent-activity feed (seconds before a leader's buffer is backfilled from the table again)
+    RECENT_ACTIVITY_TTL = int(os.getenv('RECENT_ACTIVITY_TTL') or '300')
+    
+    # Password hashing: bcrypt cost for stored hashes (others are rehashed on login)
+    # and the per-worker bcrypt pool (threads, waiting checks, seconds a login waits,
+    # seconds between pool metrics log lines; 0 turns them off)
+    BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS') or '12')
+    BCRYPT_MAX_CONCURRENCY = int(os.getenv('BCRYPT_MAX_CONCURRENCY') or str(max(1, min(4, os.cpu_count() or 1))))
+    BCRYPT_MAX_QUEUE = int(os.getenv('BCRYPT_MAX_QUEUE') or '32')
+    BCRYPT_WAIT_TIMEOUT = float(os.getenv('BCRYPT_WAIT_TIMEOUT') or '10')
+    BCRYPT_STATS_LOG_INTERVAL = int(os.getenv('BCRYPT_STATS_LOG_INTERVAL') or '300')
+    
+    # Query fan-out: threads per worker running a page's independent reads at once,
+    # and seconds from the start of a fan-out until its results are given up on
+    QUERY_FANOUT_WORKERS = int(os.getenv('QUERY_FANOUT_WORKERS') or '8')
+    QUERY_FANOUT_TIMEOUT = float(os.getenv('QUERY_FANOUT_TIMEOUT') or '10')
+    
     # File upload settings
     MAX_CONTENT_LENGTH = 10 * 1024 * 1024  # 10MB max file size
     ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx', 'ppt', 'pptx', 'txt'}
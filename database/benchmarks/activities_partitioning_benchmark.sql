@@ -0,0 +1,247 @@
+-- ===========================================
+-- Activities Partitioning Benchmark
+-- Compares the original activities layout (one heap, nine single-purpose
+-- indexes + keyset index) with the monthly-partitioned layout from
+-- partition_activities_table.sql (two composite indexes) for insert cost,
+-- the app's read queries, and retention
+-- ===========================================
+
+-- Usage (scratch database, NOT production):
+--   psql "$DATABASE_URL" -v rows=1000000 -v leaders=200 -f database/benchmarks/activities_partitioning_benchmark.sql
+--
+-- Everything lives in the activities_bench schema and is dropped at the end.
+-- Tables have no FK to leaders so the script runs on an empty database; the
+-- FK costs the same in both layouts. Compare the "Time:" lines printed by
+-- \timing and the "Execution Time" / "Buffers" lines of each EXPLAIN pair.
+
+\set ON_ERROR_STOP on
+\if :{?rows}
+\else
+    \set rows 1000000
+\endif
+\if :{?leaders}
+\else
+    \set leaders 200
+\endif
+
+DROP SCHEMA IF EXISTS activities_bench CASCADE;
+CREATE SCHEMA activities_bench;
+SET search_path = activities_bench, public;
+
+-- ===========================================
+-- 1. Layouts
+-- ===========================================
+
+CREATE TABLE activities_flat (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    leader_id UUID NOT NULL,
+    user_id VARCHAR(255) NOT NULL,
+    user_role VARCHAR(50) NOT NULL DEFAULT 'leader',
+    user_name VARCHAR(255),
+    activity_type VARCHAR(100) NOT NULL,
+    activity_category VARCHAR(50) NOT NULL,
+    description TEXT NOT NULL,
+    source VARCHAR(50) NOT NULL DEFAULT 'cell_app',
+    platform VARCHAR(50),
+    activity_date DATE NOT NULL DEFAULT CURRENT_DATE,
+    activity_time TIME NOT NULL DEFAULT CURRENT_TIME,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    details JSONB,
+    metadata JSONB,
+    is_important BOOLEAN DEFAULT FALSE,
+    is_system BOOLEAN DEFAULT FALSE
+);
+
+CREATE INDEX ON activities_flat(leader_id);
+CREATE INDEX ON activities_flat(activity_date);
+CREATE INDEX ON activities_flat(user_role);
+CREATE INDEX ON activities_flat(activity_type);
+CREATE INDEX ON activities_flat(activity_category);
+CREATE INDEX ON activities_flat(source);
+CREATE INDEX ON activities_flat(leader_id, activity_date DESC);
+CREATE INDEX ON activities_flat(user_role, activity_date DESC);
+CREATE INDEX ON activities_flat(activity_type, activity_date DESC);
+CREATE INDEX ON activities_flat(created_at DESC);
+CREATE INDEX ON activities_flat(is_important) WHERE is_important = TRUE;
+CREATE INDEX ON activities_flat(leader_id, created_at DESC, id DESC);
+
+CREATE TABLE activities_part (LIKE activities_flat INCLUDING DEFAULTS) PARTITION BY RANGE (created_at);
+ALTER TABLE activities_part ALTER COLUMN created_at SET NOT NULL;
+ALTER TABLE activities_part ADD PRIMARY KEY (id, created_at);
+CREATE TABLE activities_part_default PARTITION OF activities_part DEFAULT;
+
+-- 13 monthly partitions: the last 12 months plus the current one
+DO $$
+DECLARE
+    v_month DATE;
+BEGIN
+    FOR v_month IN
+        SELECT generate_series(
+            date_trunc('month', NOW() AT TIME ZONE 'UTC') - INTERVAL '12 months',
+            date_trunc('month', NOW() AT TIME ZONE 'UTC'),
+            INTERVAL '1 month'
+        )::date
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF activities_part FOR VALUES FROM (%L) TO (%L)',
+            'activities_part_' || to_char(v_month, 'YYYY_MM'),
+            v_month::timestamp AT TIME ZONE 'UTC',
+            (v_month + INTERVAL '1 month')::timestamp AT TIME ZONE 'UTC'
+        );
+    END LOOP;
+END;
+$$;
+
+CREATE INDEX ON activities_part(leader_id, created_at DESC, id DESC);
+CREATE INDEX ON activities_part(leader_id, activity_date DESC);
+
+-- ===========================================
+-- 2. Sample data (same rows for both layouts)
+-- ===========================================
+
+CREATE UNLOGGED TABLE leaders AS
+SELECT gen_random_uuid() AS id FROM generate_series(1, :leaders);
+
+CREATE UNLOGGED TABLE sample AS
+SELECT
+    gen_random_uuid() AS id,
+    leader_ids[1 + n % :leaders] AS leader_id,
+    'user-' || (n % :leaders) AS user_id,
+    (ARRAY['leader', 'admin', 'super_admin'])[1 + n % 3] AS user_role,
+    'Leader ' || (n % :leaders) AS user_name,
+    (ARRAY['member_added', 'member_updated', 'attendance_marked', 'tutorial_viewed', 'dashboard_viewed', 'login'])[1 + n % 6] AS activity_type,
+    (ARRAY['member', 'member', 'attendance', 'tutorial', 'system', 'profile'])[1 + n % 6] AS activity_category,
+    'Benchmark activity ' || n AS description,
+    (ARRAY['cell_app', 'cell_portal'])[1 + n % 2] AS source,
+    'web' AS platform,
+    ts::date AS activity_date,
+    ts::time AS activity_time,
+    ts AS created_at,
+    jsonb_build_object('n', n) AS details,
+    jsonb_build_object('ip_address', '127.0.0.1') AS metadata,
+    n % 50 = 0 AS is_important,
+    FALSE AS is_system
+FROM (
+    SELECT n, NOW() - (random() * INTERVAL '365 days') AS ts
+    FROM generate_series(1, :rows) AS n
+) AS s
+CROSS JOIN (SELECT array_agg(id) AS leader_ids FROM leaders) AS l;
+
+ANALYZE leaders;
+ANALYZE sample;
+
+-- ===========================================
+-- 3. Insert cost
+-- ===========================================
+
+\timing on
+
+\echo '--- bulk load: flat (9 + keyset indexes) ---'
+INSERT INTO activities_flat SELECT * FROM sample;
+
+\echo '--- bulk load: partitioned (2 indexes) ---'
+INSERT INTO activities_part SELECT * FROM sample;
+
+-- What the app's batched writer does: small multi-row inserts of current rows
+\echo '--- 1000 x 50-row batch inserts: flat ---'
+DO $$
+BEGIN
+    FOR i IN 1..1000 LOOP
+        INSERT INTO activities_flat (leader_id, user_id, activity_type, activity_category, description)
+        SELECT id, 'bench', 'member_added', 'member', 'batch insert' FROM leaders LIMIT 50;
+    END LOOP;
+END;
+$$;
+
+\echo '--- 1000 x 50-row batch inserts: partitioned ---'
+DO $$
+BEGIN
+    FOR i IN 1..1000 LOOP
+        INSERT INTO activities_part (leader_id, user_id, activity_type, activity_category, description)
+        SELECT id, 'bench', 'member_added', 'member', 'batch insert' FROM leaders LIMIT 50;
+    END LOOP;
+END;
+$$;
+
+\timing off
+
+ANALYZE activities_flat;
+ANALYZE activities_part;
+
+\echo '--- index size ---'
+SELECT 'flat' AS layout, pg_size_pretty(pg_indexes_size('activities_flat')) AS index_size
+UNION ALL
+SELECT 'partitioned', pg_size_pretty(SUM(pg_indexes_size(inhrelid)))
+FROM pg_inherits WHERE inhparent = 'activities_part'::regclass;
+
+-- ===========================================
+-- 4. Read queries used by utils/activity_logger.py
+-- ===========================================
+
+SELECT id AS bench_leader FROM leaders LIMIT 1 \gset
+
+\echo '--- get_recent_activities / get_activities_page first page ---'
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT * FROM activities_flat WHERE leader_id = :'bench_leader' ORDER BY created_at DESC, id DESC LIMIT 50;
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT * FROM activities_part WHERE leader_id = :'bench_leader' ORDER BY created_at DESC, id DESC LIMIT 50;
+
+\echo '--- get_activities_page deep keyset page (6 months back) ---'
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT * FROM activities_flat
+WHERE leader_id = :'bench_leader' AND (created_at, id) < (NOW() - INTERVAL '6 months', 'ffffffff-ffff-ffff-ffff-ffffffffffff'::uuid)
+ORDER BY created_at DESC, id DESC LIMIT 50;
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT * FROM activities_part
+WHERE leader_id = :'bench_leader' AND (created_at, id) < (NOW() - INTERVAL '6 months', 'ffffffff-ffff-ffff-ffff-ffffffffffff'::uuid)
+ORDER BY created_at DESC, id DESC LIMIT 50;
+
+\echo '--- get_activities_by_type with a date range ---'
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT * FROM activities_flat
+WHERE leader_id = :'bench_leader' AND activity_type = 'attendance_marked' AND activity_date >= CURRENT_DATE - 30
+ORDER BY created_at DESC LIMIT 50;
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT * FROM activities_part
+WHERE leader_id = :'bench_leader' AND activity_type = 'attendance_marked' AND activity_date >= CURRENT_DATE - 30
+ORDER BY created_at DESC LIMIT 50;
+
+\echo '--- get_activities_by_date ---'
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT * FROM activities_flat WHERE leader_id = :'bench_leader' AND activity_date = CURRENT_DATE - 10 ORDER BY activity_time DESC;
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT * FROM activities_part WHERE leader_id = :'bench_leader' AND activity_date = CURRENT_DATE - 10 ORDER BY activity_time DESC;
+
+\echo '--- get_activity_statistics scan (last 90 days) ---'
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT activity_type, COUNT(*) FROM activities_flat
+WHERE leader_id = :'bench_leader' AND activity_date >= CURRENT_DATE - 90 GROUP BY activity_type;
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT activity_type, COUNT(*) FROM activities_part
+WHERE leader_id = :'bench_leader' AND activity_date >= CURRENT_DATE - 90 GROUP BY activity_type;
+
+-- ===========================================
+-- 5. Retention: expire the oldest month
+-- ===========================================
+
+SELECT 'activities_part_' || to_char(date_trunc('month', NOW() AT TIME ZONE 'UTC') - INTERVAL '12 months', 'YYYY_MM') AS oldest_partition,
+       (date_trunc('month', NOW() AT TIME ZONE 'UTC') - INTERVAL '11 months') AT TIME ZONE 'UTC' AS oldest_month_end
+\gset
+
+\timing on
+
+\echo '--- retention: DELETE from flat ---'
+DELETE FROM activities_flat WHERE created_at < :'oldest_month_end';
+
+\echo '--- retention: DETACH + DROP partition ---'
+ALTER TABLE activities_part DETACH PARTITION :"oldest_partition";
+DROP TABLE :"oldest_partition";
+
+\timing off
+
+-- ===========================================
+-- Cleanup
+-- ===========================================
+
+RESET search_path;
+DROP SCHEMA activities_bench CASCADE;
@@ -0,0 +1,17 @@
+-- ===========================================
+-- Activities Keyset Pagination Index
+-- Backs the cursor-paginated activity feed (GET /api/activities)
+-- ===========================================
+
+-- Pages are read as:
+--   WHERE leader_id = $1 [AND (created_at, id) < ($cursor_created_at, $cursor_id)]
+--   ORDER BY created_at DESC, id DESC
+--   LIMIT $page_size + 1
+-- so every page is a short range scan on this index, however deep the cursor is.
+CREATE INDEX IF NOT EXISTS idx_activities_leader_created_id ON activities(leader_id, created_at DESC, id DESC);
+
+-- ===========================================
+-- COMMENTS for Documentation
+-- ===========================================
+
+COMMENT ON INDEX idx_activities_leader_created_id IS 'Keyset pagination of a leader''s activities, newest first';
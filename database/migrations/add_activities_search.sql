@@ -0,0 +1,74 @@
+-- ===========================================
+-- Activities Full-Text Search
+-- Adds a generated tsvector over description and user_name, a GIN index,
+-- and the search_activities function behind GET /api/activities/search
+-- ===========================================
+
+-- Run after partition_activities_table.sql (the column and index cascade to every partition).
+--
+-- Called from utils/activity_logger.py (search_activities) via:
+--   supabase.rpc('search_activities', {
+--       'p_leader_id': ..., 'p_query': 'bulk attendance', 'p_limit': 51,
+--       'p_cursor_rank': ..., 'p_cursor_created_at': ..., 'p_cursor_id': ...   -- NULL for the first page
+--   })
+--
+-- Returns rows of {activity: <activity row as JSON>, rank: <real>} ordered by
+-- rank DESC, created_at DESC, id DESC. The next page passes the last row's
+-- (rank, created_at, id) as the cursor. Ranking needs every match, so a page
+-- costs one GIN lookup of the leader's matches; the cursor only skips rows
+-- already returned.
+
+-- btree_gin lets leader_id share the GIN index with the tsvector
+CREATE EXTENSION IF NOT EXISTS btree_gin;
+
+-- 'english' stems words ("updated" matches "update"); names still match as typed
+ALTER TABLE activities
+    ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', COALESCE(description, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(user_name, '')), 'B')
+    ) STORED;
+
+CREATE OR REPLACE FUNCTION search_activities(
+    p_leader_id UUID,
+    p_query TEXT,
+    p_limit INTEGER DEFAULT 50,
+    p_cursor_rank REAL DEFAULT NULL,
+    p_cursor_created_at TIMESTAMP WITH TIME ZONE DEFAULT NULL,
+    p_cursor_id UUID DEFAULT NULL
+)
+RETURNS TABLE (activity JSONB, rank REAL)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH hits AS (
+        SELECT a.*, ts_rank_cd(a.search_vector, q.query) AS hit_rank
+        FROM activities a,
+             websearch_to_tsquery('english', p_query) AS q(query)
+        WHERE a.leader_id = p_leader_id
+          AND a.search_vector @@ q.query
+    )
+    SELECT to_jsonb(hits) - 'search_vector' - 'hit_rank', hits.hit_rank
+    FROM hits
+    WHERE p_cursor_rank IS NULL
+       OR hits.hit_rank < p_cursor_rank
+       OR (hits.hit_rank = p_cursor_rank AND (hits.created_at, hits.id) < (p_cursor_created_at, p_cursor_id))
+    ORDER BY hits.hit_rank DESC, hits.created_at DESC, hits.id DESC
+    LIMIT LEAST(GREATEST(p_limit, 1), 201);
+$$;
+
+GRANT EXECUTE ON FUNCTION search_activities(UUID, TEXT, INTEGER, REAL, TIMESTAMP WITH TIME ZONE, UUID) TO anon, authenticated;
+
+-- ===========================================
+-- INDEXES
+-- ===========================================
+
+-- Leader + full-text terms in one GIN index (needs btree_gin)
+CREATE INDEX IF NOT EXISTS idx_activities_leader_search ON activities USING GIN (leader_id, search_vector);
+
+-- ===========================================
+-- COMMENTS for Documentation
+-- ===========================================
+
+COMMENT ON COLUMN activities.search_vector IS 'Generated tsvector over description (weight A) and user_name (weight B) for full-text search';
+COMMENT ON FUNCTION search_activities(UUID, TEXT, INTEGER, REAL, TIMESTAMP WITH TIME ZONE, UUID) IS 'Ranked, keyset-paginated full-text search over a leader''s activities';
@@ -0,0 +1,62 @@
+-- ===========================================
+-- Attendance Unique Constraint
+-- One attendance record per (leader, member, meeting date)
+-- Lets bulk_update_attendance write in one upsert (it falls back to
+-- select + insert/update without it)
+-- ===========================================
+
+-- Remove duplicate records first, keeping the most recently written row of each
+-- (leader, member, meeting date): newest updated_at, then newest created_at
+-- (whichever of those columns the table has), then the physically last row
+DO $$
+DECLARE
+    v_order TEXT := '';
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+               WHERE table_schema = current_schema() AND table_name = 'attendance' AND column_name = 'updated_at') THEN
+        v_order := v_order || 'updated_at DESC NULLS LAST, ';
+    END IF;
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+               WHERE table_schema = current_schema() AND table_name = 'attendance' AND column_name = 'created_at') THEN
+        v_order := v_order || 'created_at DESC NULLS LAST, ';
+    END IF;
+
+    EXECUTE format(
+        'DELETE FROM attendance
+         WHERE ctid IN (
+             SELECT ctid FROM (
+                 SELECT ctid, ROW_NUMBER() OVER (
+                     PARTITION BY leader_id, member_id, meeting_date
+                     ORDER BY %s ctid DESC
+                 ) AS row_number
+                 FROM attendance
+             ) ranked
+             WHERE row_number > 1
+         )',
+        v_order
+    );
+END;
+$$;
+
+-- Unique constraint used as the ON CONFLICT target:
+--   supabase.table('attendance').upsert(rows, on_conflict='leader_id,member_id,meeting_date')
+-- (skipped if it already exists, so the migration can be re-run)
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conname = 'attendance_leader_member_meeting_key'
+          AND conrelid = 'attendance'::regclass
+    ) THEN
+        ALTER TABLE attendance
+            ADD CONSTRAINT attendance_leader_member_meeting_key
+            UNIQUE (leader_id, member_id, meeting_date);
+    END IF;
+END;
+$$;
+
+-- ===========================================
+-- COMMENTS for Documentation
+-- ===========================================
+
+COMMENT ON CONSTRAINT attendance_leader_member_meeting_key ON attendance IS 'One attendance record per leader, member and meeting date (upsert conflict target)';
@@ -0,0 +1,86 @@
+-- ===========================================
+-- Activity Statistics Function
+-- Counts a leader's activities by type, category, role, source and date
+-- in Postgres so the app receives compact count maps instead of every row
+-- ===========================================
+
+-- Called from utils/activity_logger.py (get_activity_statistics) via:
+--   supabase.rpc('get_activity_statistics', {
+--       'p_leader_id': ..., 'p_start_date': 'YYYY-MM-DD' | None, 'p_end_date': 'YYYY-MM-DD' | None
+--   })
+--
+-- Returns JSON:
+--   {"total_activities": n, "by_type": {...}, "by_category": {...},
+--    "by_role": {...}, "by_source": {...}, "by_date": {"YYYY-MM-DD": n, ...}}
+--
+-- Counts are event counts, not row counts: a roll-up row (details.count) stands for
+-- that many events and a sampled row (details.sample_rate) for 1/sample_rate events
+-- (see get_activity_policy in utils/activity_logger.py); sums are rounded to integers.
+--
+-- Missing bounds are replaced by +/- infinity (rather than "IS NULL OR ...") so the
+-- range stays sargable and the scan uses idx_activities_leader_date.
+
+CREATE OR REPLACE FUNCTION get_activity_statistics(
+    p_leader_id UUID,
+    p_start_date DATE DEFAULT NULL,
+    p_end_date DATE DEFAULT NULL
+)
+RETURNS JSON
+LANGUAGE sql
+STABLE
+AS $$
+    WITH grouped AS (
+        -- One pass over the leader's rows, grouped five ways at once
+        SELECT
+            CASE
+                WHEN GROUPING(activity_type) = 0 THEN 'by_type'
+                WHEN GROUPING(activity_category) = 0 THEN 'by_category'
+                WHEN GROUPING(user_role) = 0 THEN 'by_role'
+                WHEN GROUPING(source) = 0 THEN 'by_source'
+                WHEN GROUPING(activity_date) = 0 THEN 'by_date'
+                ELSE 'total'
+            END AS dimension,
+            COALESCE(
+                CASE
+                    WHEN GROUPING(activity_type) = 0 THEN activity_type
+                    WHEN GROUPING(activity_category) = 0 THEN activity_category
+                    WHEN GROUPING(user_role) = 0 THEN user_role
+                    WHEN GROUPING(source) = 0 THEN source
+                    WHEN GROUPING(activity_date) = 0 THEN activity_date::text
+                END,
+                'unknown'
+            ) AS group_key,
+            ROUND(SUM(
+                COALESCE((details->>'count')::numeric, 1)
+                / COALESCE(NULLIF((details->>'sample_rate')::numeric, 0), 1)
+            ))::bigint AS activity_count
+        FROM activities
+        WHERE leader_id = p_leader_id
+          AND activity_date >= COALESCE(p_start_date, '-infinity'::date)
+          AND activity_date <= COALESCE(p_end_date, 'infinity'::date)
+        GROUP BY GROUPING SETS (
+            (activity_type),
+            (activity_category),
+            (user_role),
+            (source),
+            (activity_date),
+            ()
+        )
+    )
+    SELECT json_build_object(
+        'total_activities', COALESCE((SELECT activity_count FROM grouped WHERE dimension = 'total'), 0),
+        'by_type', COALESCE((SELECT json_object_agg(group_key, activity_count) FROM grouped WHERE dimension = 'by_type'), '{}'::json),
+        'by_category', COALESCE((SELECT json_object_agg(group_key, activity_count) FROM grouped WHERE dimension = 'by_category'), '{}'::json),
+        'by_role', COALESCE((SELECT json_object_agg(group_key, activity_count) FROM grouped WHERE dimension = 'by_role'), '{}'::json),
+        'by_source', COALESCE((SELECT json_object_agg(group_key, activity_count) FROM grouped WHERE dimension = 'by_source'), '{}'::json),
+        'by_date', COALESCE((SELECT json_object_agg(group_key, activity_count ORDER BY group_key) FROM grouped WHERE dimension = 'by_date'), '{}'::json)
+    );
+$$;
+
+GRANT EXECUTE ON FUNCTION get_activity_statistics(UUID, DATE, DATE) TO anon, authenticated;
+
+-- ===========================================
+-- COMMENTS for Documentation
+-- ===========================================
+
+COMMENT ON FUNCTION get_activity_statistics(UUID, DATE, DATE) IS 'Activity counts for a leader by type, category, role, source and date (backed by idx_activities_leader_date)';
@@ -0,0 +1,125 @@
+-- ===========================================
+-- Dashboard Bundle Function
+-- Returns everything the dashboard (index route) needs as one JSON document
+-- so the page costs a single PostgREST round trip
+-- ===========================================
+
+-- Called from routes/main.py (load_dashboard_bundle) via:
+--   supabase.rpc('get_dashboard_bundle', {
+--       'p_leader_id': ..., 'p_next_meeting_date': 'YYYY-MM-DD', 'p_attendance_date': 'YYYY-MM-DD'
+--   })
+--
+-- Meeting dates are computed by the app (Tuesday/Wednesday cut-over rules) and passed in.
+-- A member counts towards a meeting when created_at <= meeting_date (midnight),
+-- matching the app's previous `.lte('created_at', meeting_date)` filter.
+
+CREATE OR REPLACE FUNCTION get_dashboard_bundle(
+    p_leader_id UUID,
+    p_next_meeting_date DATE,
+    p_attendance_date DATE
+)
+RETURNS JSON
+LANGUAGE sql
+STABLE
+AS $$
+    WITH leader AS (
+        SELECT created_at::date AS created_date
+        FROM users
+        WHERE id = p_leader_id
+    ),
+    recent_meetings AS (
+        -- Last 4 meetings on or after the leader's creation date
+        SELECT m.meeting_date
+        FROM meetings m
+        WHERE m.meeting_date >= COALESCE((SELECT created_date FROM leader), '-infinity'::date)
+        ORDER BY m.meeting_date DESC
+        LIMIT 4
+    ),
+    meeting_counts AS (
+        -- Eligible members and attendance records per meeting (recent meetings + current week)
+        SELECT
+            d.meeting_date,
+            (
+                SELECT COUNT(*)
+                FROM cell_members cm
+                WHERE cm.leader_id = p_leader_id
+                  AND cm.created_at <= d.meeting_date::timestamptz
+            ) AS member_total,
+            (
+                SELECT COUNT(*)
+                FROM attendance a
+                JOIN cell_members cm ON cm.id = a.member_id
+                WHERE a.leader_id = p_leader_id
+                  AND a.meeting_date = d.meeting_date
+                  AND cm.leader_id = p_leader_id
+                  AND cm.created_at <= d.meeting_date::timestamptz
+            ) AS attendance_count
+        FROM (
+            SELECT meeting_date FROM recent_meetings
+            UNION
+            SELECT p_attendance_date
+        ) d
+    )
+    SELECT json_build_object(
+        'member_count', (
+            SELECT COUNT(*) FROM cell_members WHERE leader_id = p_leader_id
+        ),
+        'next_meeting', (
+            SELECT json_build_object(
+                'meeting_date', p_next_meeting_date,
+                'has_tutorials', COUNT(*) > 0,
+                'is_placeholder', COALESCE(
+                    (ARRAY_AGG(t.tutorial_name ORDER BY t.id))[1] = 'No Tutorial Uploaded', FALSE
+                )
+            )
+            FROM tutorials t
+            WHERE t.meeting_date = p_next_meeting_date
+        ),
+        'recent_meetings', COALESCE((
+            SELECT json_agg(json_build_object(
+                'meeting_date', rm.meeting_date,
+                'tutorial', (
+                    SELECT json_build_object('title', t.title, 'description', t.description)
+                    FROM tutorials t
+                    WHERE t.meeting_date = rm.meeting_date
+                    ORDER BY t.id
+                    LIMIT 1
+                ),
+                'member_total', mc.member_total,
+                'attendance_count', mc.attendance_count
+            ) ORDER BY rm.meeting_date DESC)
+            FROM recent_meetings rm
+            JOIN meeting_counts mc ON mc.meeting_date = rm.meeting_date
+        ), '[]'::json),
+        'current_week', (
+            SELECT json_build_object(
+                'meeting_date', mc.meeting_date,
+                'member_total', mc.member_total,
+                'attendance_count', mc.attendance_count
+            )
+            FROM meeting_counts mc
+            WHERE mc.meeting_date = p_attendance_date
+        )
+    );
+$$;
+
+GRANT EXECUTE ON FUNCTION get_dashboard_bundle(UUID, DATE, DATE) TO anon, authenticated;
+
+-- ===========================================
+-- INDEXES backing the function
+-- ===========================================
+
+-- Roster lookups by leader filtered on creation date
+CREATE INDEX IF NOT EXISTS idx_cell_members_leader_created ON cell_members(leader_id, created_at);
+
+-- Attendance lookups by leader + meeting date
+CREATE INDEX IF NOT EXISTS idx_attendance_leader_meeting_date ON attendance(leader_id, meeting_date);
+
+-- Tutorial lookups by meeting date
+CREATE INDEX IF NOT EXISTS idx_tutorials_meeting_date ON tutorials(meeting_date);
+
+-- ===========================================
+-- COMMENTS for Documentation
+-- ===========================================
+
+COMMENT ON FUNCTION get_dashboard_bundle(UUID, DATE, DATE) IS 'Dashboard data (member count, next-meeting tutorial status, last 4 meetings with tutorial and attendance counts, current-week attendance) as one JSON document';
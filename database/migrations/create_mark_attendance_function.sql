@@ -0,0 +1,98 @@
+-- ===========================================
+-- Mark Attendance Function
+-- Ownership check, eligibility check and upsert/delete of one attendance
+-- record in a single database call (used by the update_attendance route)
+-- ===========================================
+
+-- Requires add_attendance_unique_constraint.sql (ON CONFLICT target)
+--
+-- Called from routes/main.py via:
+--   supabase.rpc('mark_attendance', {
+--       'p_leader_id': ..., 'p_member_id': ..., 'p_meeting_date': 'YYYY-MM-DD',
+--       'p_status': 'present' | 'absent' | 'clear'
+--   })
+--
+-- Returns JSON: {"code": ..., "member_name": ...} where code is one of
+--   ok             - record written (or cleared)
+--   not_found      - member does not exist or belongs to another leader
+--   created_after  - member was created after the meeting date
+--   no_meeting     - no meetings row for the date (meeting_number is required)
+--   no_record      - nothing to clear
+--   invalid_status - status is not present/absent/clear
+-- The attendance deadline is enforced by the app before calling.
+
+CREATE OR REPLACE FUNCTION mark_attendance(
+    p_leader_id cell_members.leader_id%TYPE,
+    p_member_id cell_members.id%TYPE,
+    p_meeting_date DATE,
+    p_status TEXT
+)
+RETURNS JSON
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_member_name TEXT;
+    v_member_created DATE;
+    v_meeting_number meetings.meeting_number%TYPE;
+    v_deleted INTEGER;
+BEGIN
+    -- Ownership: member must belong to this leader
+    SELECT name, created_at::date
+    INTO v_member_name, v_member_created
+    FROM cell_members
+    WHERE id = p_member_id
+      AND leader_id = p_leader_id;
+
+    IF NOT FOUND THEN
+        RETURN json_build_object('code', 'not_found');
+    END IF;
+
+    -- Eligibility: member must exist on the meeting date
+    IF v_member_created IS NOT NULL AND v_member_created > p_meeting_date THEN
+        RETURN json_build_object('code', 'created_after', 'member_name', v_member_name);
+    END IF;
+
+    IF p_status = 'clear' THEN
+        DELETE FROM attendance
+        WHERE leader_id = p_leader_id
+          AND member_id = p_member_id
+          AND meeting_date = p_meeting_date;
+        GET DIAGNOSTICS v_deleted = ROW_COUNT;
+
+        IF v_deleted = 0 THEN
+            RETURN json_build_object('code', 'no_record', 'member_name', v_member_name);
+        END IF;
+        RETURN json_build_object('code', 'ok', 'member_name', v_member_name);
+    END IF;
+
+    IF p_status NOT IN ('present', 'absent') THEN
+        RETURN json_build_object('code', 'invalid_status', 'member_name', v_member_name);
+    END IF;
+
+    SELECT meeting_number
+    INTO v_meeting_number
+    FROM meetings
+    WHERE meeting_date = p_meeting_date
+    LIMIT 1;
+
+    IF v_meeting_number IS NULL THEN
+        RETURN json_build_object('code', 'no_meeting', 'member_name', v_member_name);
+    END IF;
+
+    INSERT INTO attendance (leader_id, member_id, meeting_date, meeting_number, status)
+    VALUES (p_leader_id, p_member_id, p_meeting_date, v_meeting_number, p_status)
+    ON CONFLICT (leader_id, member_id, meeting_date)
+    DO UPDATE SET status = EXCLUDED.status,
+                  meeting_number = EXCLUDED.meeting_number;
+
+    RETURN json_build_object('code', 'ok', 'member_name', v_member_name);
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION mark_attendance(cell_members.leader_id%TYPE, cell_members.id%TYPE, DATE, TEXT) TO anon, authenticated;
+
+-- ===========================================
+-- COMMENTS for Documentation
+-- ===========================================
+
+COMMENT ON FUNCTION mark_attendance(cell_members.leader_id%TYPE, cell_members.id%TYPE, DATE, TEXT) IS 'Validate ownership and eligibility, then upsert or clear one attendance record';
@@ -0,0 +1,30 @@
+-- ===========================================
+-- Meetings Version Function
+-- A fingerprint of the meetings table, so each app worker can tell cheaply
+-- whether its cached meetings calendar is out of date
+-- ===========================================
+
+-- Called from utils/meetings_calendar.py (MeetingsCalendar) via:
+--   supabase.rpc('get_meetings_version', {})
+--
+-- Returns the md5 of every meetings row; it changes whenever a meeting is added,
+-- edited or deleted (e.g. from the portal). The table holds one row per week,
+-- so hashing all of it costs less than a round trip. Without this function the
+-- calendar falls back to reloading after MEETINGS_CACHE_TTL.
+
+CREATE OR REPLACE FUNCTION get_meetings_version()
+RETURNS TEXT
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT md5(COALESCE(string_agg(m::text, '|' ORDER BY m.id::text), ''))
+    FROM meetings m;
+$$;
+
+GRANT EXECUTE ON FUNCTION get_meetings_version() TO anon, authenticated;
+
+-- ===========================================
+-- COMMENTS for Documentation
+-- ===========================================
+
+COMMENT ON FUNCTION get_meetings_version() IS 'Fingerprint of the meetings table; the app reloads its cached calendar when it changes';
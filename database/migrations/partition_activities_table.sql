@@ -0,0 +1,330 @@
+-- ===========================================
+-- Partition Activities by Month
+-- Converts activities into a table range-partitioned by created_at (one
+-- partition per calendar month, UTC), replaces the nine single-purpose
+-- indexes with the two the app actually queries, and adds partition
+-- maintenance + retention functions
+-- ===========================================
+
+-- Run after create_activities_table.sql and add_activities_keyset_index.sql.
+-- Benchmark: database/benchmarks/activities_partitioning_benchmark.sql
+--
+-- REQUIRED after running: schedule ensure_activities_partitions() daily (see
+-- SCHEDULING below). The migration creates partitions 12 months ahead and
+-- schedules the job itself when pg_cron is installed; otherwise it warns and
+-- the job must be run from an external scheduler before those months run out.
+-- Rows for a month without a partition go to activities_default and are moved
+-- into the month's partition when it is created.
+--
+-- Row level security, policies and table grants are copied from the old table,
+-- so access through the API is unchanged. Partitions get RLS enabled with no
+-- policies, so they can't be read directly (only through activities).
+--
+-- Index set (what utils/activity_logger.py reads):
+--   PRIMARY KEY (id, created_at)          - row identity (must include the partition key)
+--   idx_activities_leader_created_id      - get_recent_activities, get_activities_by_role/_type/_category,
+--                                           get_activities_page (keyset): leader_id = ? ORDER BY created_at DESC, id DESC
+--   idx_activities_leader_date            - get_activities_by_date, get_activity_statistics RPC:
+--                                           leader_id = ? AND activity_date [=|BETWEEN] ...
+-- Dropped: idx_activities_leader_id (prefix of both composites), idx_activities_activity_date,
+--   idx_activities_user_role, idx_activities_activity_type, idx_activities_activity_category,
+--   idx_activities_source, idx_activities_role_date, idx_activities_type_date,
+--   idx_activities_created_at (replaced by partition pruning), idx_activities_important
+--   (no reader). Role/type/category/source filters are applied on the leader's index range.
+
+BEGIN;
+
+-- ===========================================
+-- 1. Move the existing table out of the way
+-- ===========================================
+
+ALTER TABLE activities RENAME TO activities_unpartitioned;
+ALTER TABLE activities_unpartitioned RENAME CONSTRAINT activities_pkey TO activities_unpartitioned_pkey;
+ALTER TABLE activities_unpartitioned RENAME CONSTRAINT activities_leader_id_fkey TO activities_unpartitioned_leader_id_fkey;
+
+DROP INDEX IF EXISTS idx_activities_leader_id;
+DROP INDEX IF EXISTS idx_activities_activity_date;
+DROP INDEX IF EXISTS idx_activities_user_role;
+DROP INDEX IF EXISTS idx_activities_activity_type;
+DROP INDEX IF EXISTS idx_activities_activity_category;
+DROP INDEX IF EXISTS idx_activities_source;
+DROP INDEX IF EXISTS idx_activities_leader_date;
+DROP INDEX IF EXISTS idx_activities_role_date;
+DROP INDEX IF EXISTS idx_activities_type_date;
+DROP INDEX IF EXISTS idx_activities_created_at;
+DROP INDEX IF EXISTS idx_activities_important;
+DROP INDEX IF EXISTS idx_activities_leader_created_id;
+
+-- ===========================================
+-- 2. Partitioned table (same columns as create_activities_table.sql)
+-- ===========================================
+
+CREATE TABLE activities (
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
+    leader_id UUID NOT NULL,
+    user_id VARCHAR(255) NOT NULL,
+    user_role VARCHAR(50) NOT NULL DEFAULT 'leader',
+    user_name VARCHAR(255),
+    activity_type VARCHAR(100) NOT NULL,
+    activity_category VARCHAR(50) NOT NULL,
+    description TEXT NOT NULL,
+    source VARCHAR(50) NOT NULL DEFAULT 'cell_app',
+    platform VARCHAR(50),
+    activity_date DATE NOT NULL DEFAULT CURRENT_DATE,
+    activity_time TIME NOT NULL DEFAULT CURRENT_TIME,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    details JSONB,
+    metadata JSONB,
+    is_important BOOLEAN DEFAULT FALSE,
+    is_system BOOLEAN DEFAULT FALSE,
+
+    CONSTRAINT activities_pkey PRIMARY KEY (id, created_at),
+    CONSTRAINT activities_leader_id_fkey FOREIGN KEY (leader_id) REFERENCES leaders(id) ON DELETE CASCADE
+) PARTITION BY RANGE (created_at);
+
+-- Catches rows outside every monthly partition (e.g. clock skew, or a lapsed
+-- partition job) instead of failing the insert
+CREATE TABLE activities_default PARTITION OF activities DEFAULT;
+ALTER TABLE activities_default ENABLE ROW LEVEL SECURITY;
+
+-- Same access rules as the old table: RLS flags, policies and grants
+DO $$
+DECLARE
+    v_policy RECORD;
+    v_grant RECORD;
+BEGIN
+    IF (SELECT relrowsecurity FROM pg_class WHERE oid = 'activities_unpartitioned'::regclass) THEN
+        ALTER TABLE activities ENABLE ROW LEVEL SECURITY;
+    END IF;
+    IF (SELECT relforcerowsecurity FROM pg_class WHERE oid = 'activities_unpartitioned'::regclass) THEN
+        ALTER TABLE activities FORCE ROW LEVEL SECURITY;
+    END IF;
+
+    FOR v_policy IN
+        SELECT * FROM pg_policies WHERE schemaname = current_schema() AND tablename = 'activities_unpartitioned'
+    LOOP
+        EXECUTE format(
+            'CREATE POLICY %I ON activities AS %s FOR %s TO %s%s%s',
+            v_policy.policyname,
+            v_policy.permissive,
+            v_policy.cmd,
+            (SELECT string_agg(CASE WHEN r = 'public' THEN 'PUBLIC' ELSE quote_ident(r) END, ', ')
+             FROM unnest(v_policy.roles) AS r),
+            CASE WHEN v_policy.qual IS NOT NULL THEN ' USING (' || v_policy.qual || ')' ELSE '' END,
+            CASE WHEN v_policy.with_check IS NOT NULL THEN ' WITH CHECK (' || v_policy.with_check || ')' ELSE '' END
+        );
+    END LOOP;
+
+    FOR v_grant IN
+        SELECT grantee, privilege_type
+        FROM information_schema.role_table_grants
+        WHERE table_schema = current_schema() AND table_name = 'activities_unpartitioned'
+          AND grantee <> (SELECT pg_get_userbyid(relowner) FROM pg_class WHERE oid = 'activities_unpartitioned'::regclass)
+    LOOP
+        EXECUTE format(
+            'GRANT %s ON activities TO %s',
+            v_grant.privilege_type,
+            CASE WHEN v_grant.grantee = 'PUBLIC' THEN 'PUBLIC' ELSE quote_ident(v_grant.grantee) END
+        );
+    END LOOP;
+END;
+$$;
+
+-- ===========================================
+-- 3. Partition maintenance
+-- ===========================================
+
+-- Create the partition holding a given month (no-op if it exists); returns its name.
+-- Rows for that month already in activities_default (the job lapsed) would make
+-- the new partition's bounds conflict with the default partition, so the default
+-- partition is detached, the month's rows are moved into the new partition and
+-- the default partition is attached again.
+CREATE OR REPLACE FUNCTION create_activities_partition(p_month DATE)
+RETURNS TEXT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_start DATE := date_trunc('month', p_month)::date;
+    v_end DATE := (date_trunc('month', p_month) + INTERVAL '1 month')::date;
+    v_name TEXT := 'activities_' || to_char(v_start, 'YYYY_MM');
+    v_from TIMESTAMP WITH TIME ZONE := v_start::timestamp AT TIME ZONE 'UTC';
+    v_to TIMESTAMP WITH TIME ZONE := v_end::timestamp AT TIME ZONE 'UTC';
+    v_has_default BOOLEAN := to_regclass('activities_default') IS NOT NULL;
+    v_stranded BOOLEAN := FALSE;
+    v_moved BIGINT;
+BEGIN
+    IF to_regclass(v_name) IS NOT NULL THEN
+        RETURN v_name;
+    END IF;
+
+    IF v_has_default THEN
+        SELECT EXISTS (SELECT 1 FROM activities_default WHERE created_at >= v_from AND created_at < v_to)
+        INTO v_stranded;
+    END IF;
+
+    IF v_stranded THEN
+        ALTER TABLE activities DETACH PARTITION activities_default;
+    END IF;
+
+    EXECUTE format(
+        'CREATE TABLE %I PARTITION OF activities FOR VALUES FROM (%L) TO (%L)',
+        v_name, v_from, v_to
+    );
+    -- Readable only through activities (whose RLS policies then apply)
+    EXECUTE format('ALTER TABLE %I ENABLE ROW LEVEL SECURITY', v_name);
+
+    IF v_stranded THEN
+        EXECUTE format(
+            'INSERT INTO %I SELECT * FROM activities_default WHERE created_at >= %L AND created_at < %L',
+            v_name, v_from, v_to
+        );
+        GET DIAGNOSTICS v_moved = ROW_COUNT;
+        DELETE FROM activities_default WHERE created_at >= v_from AND created_at < v_to;
+        ALTER TABLE activities ATTACH PARTITION activities_default DEFAULT;
+        RAISE NOTICE 'Moved % rows from activities_default into %', v_moved, v_name;
+    END IF;
+
+    RETURN v_name;
+END;
+$$;
+
+-- Make sure the current month and the next p_months_ahead months have partitions
+CREATE OR REPLACE FUNCTION ensure_activities_partitions(p_months_ahead INTEGER DEFAULT 3)
+RETURNS SETOF TEXT
+LANGUAGE sql
+AS $$
+    SELECT create_activities_partition(month::date)
+    FROM generate_series(
+        date_trunc('month', NOW() AT TIME ZONE 'UTC'),
+        date_trunc('month', NOW() AT TIME ZONE 'UTC') + make_interval(months => p_months_ahead),
+        INTERVAL '1 month'
+    ) AS month;
+$$;
+
+-- ===========================================
+-- 4. Retention
+-- ===========================================
+
+CREATE SCHEMA IF NOT EXISTS activities_archive;
+
+-- Detach monthly partitions that ended before the last p_keep_months months.
+-- Archived partitions become standalone tables in the activities_archive schema
+-- (dump them with pg_dump -t 'activities_archive.*' and drop when no longer needed);
+-- with p_archive = FALSE they are dropped. Returns the affected partition names.
+CREATE OR REPLACE FUNCTION activities_retention(p_keep_months INTEGER DEFAULT 12, p_archive BOOLEAN DEFAULT TRUE)
+RETURNS SETOF TEXT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_cutoff DATE := (date_trunc('month', NOW() AT TIME ZONE 'UTC') - make_interval(months => p_keep_months))::date;
+    v_partition TEXT;
+BEGIN
+    FOR v_partition IN
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'activities'::regclass
+          AND c.relname ~ '^activities_[0-9]{4}_[0-9]{2}$'
+        ORDER BY c.relname
+    LOOP
+        -- The partition name encodes its month; it is expired once the whole month is before the cutoff
+        IF (to_date(substring(v_partition FROM 12), 'YYYY_MM') + INTERVAL '1 month')::date <= v_cutoff THEN
+            EXECUTE format('ALTER TABLE activities DETACH PARTITION %I', v_partition);
+            IF p_archive THEN
+                EXECUTE format('ALTER TABLE %I SET SCHEMA activities_archive', v_partition);
+            ELSE
+                EXECUTE format('DROP TABLE %I', v_partition);
+            END IF;
+            RETURN NEXT v_partition;
+        END IF;
+    END LOOP;
+END;
+$$;
+
+-- ===========================================
+-- 5. Copy existing rows
+-- ===========================================
+
+-- The partitioned table requires created_at (it is the partition key); rows written
+-- before the column was enforced get it from their activity date/time, else NOW()
+UPDATE activities_unpartitioned
+SET created_at = COALESCE(
+    (activity_date + COALESCE(activity_time, TIME '00:00'))::timestamp AT TIME ZONE 'UTC',
+    NOW()
+)
+WHERE created_at IS NULL;
+
+-- One partition per month that has data, plus the upcoming months
+SELECT create_activities_partition(month::date)
+FROM generate_series(
+    date_trunc('month', (SELECT MIN(created_at) FROM activities_unpartitioned) AT TIME ZONE 'UTC'),
+    date_trunc('month', NOW() AT TIME ZONE 'UTC'),
+    INTERVAL '1 month'
+) AS month;
+
+-- A year ahead, so a lapsed partition job has a long grace period
+SELECT ensure_activities_partitions(12);
+
+INSERT INTO activities (
+    id, leader_id, user_id, user_role, user_name, activity_type, activity_category,
+    description, source, platform, activity_date, activity_time, created_at,
+    details, metadata, is_important, is_system
+)
+SELECT
+    id, leader_id, user_id, user_role, user_name, activity_type, activity_category,
+    description, source, platform, activity_date, activity_time, created_at,
+    details, metadata, is_important, is_system
+FROM activities_unpartitioned;
+
+-- ===========================================
+-- INDEXES (created after the copy; cascade to every partition)
+-- ===========================================
+
+-- Leader feed, newest first (also the keyset pagination order)
+CREATE INDEX IF NOT EXISTS idx_activities_leader_created_id ON activities(leader_id, created_at DESC, id DESC);
+
+-- Leader + activity date (date-wise reads and the statistics RPC)
+CREATE INDEX IF NOT EXISTS idx_activities_leader_date ON activities(leader_id, activity_date DESC);
+
+COMMIT;
+
+-- Keep the old table until the copy is verified, then:
+-- DROP TABLE activities_unpartitioned;
+
+-- ===========================================
+-- SCHEDULING (required)
+-- ===========================================
+
+-- With pg_cron (Supabase: Database > Extensions > pg_cron) the jobs are scheduled
+-- here; without it, run these from an external scheduler instead:
+--   daily:   SELECT ensure_activities_partitions(3);
+--   monthly: SELECT activities_retention(12, TRUE);
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+        PERFORM cron.schedule('activities-partitions', '0 3 * * *', 'SELECT ensure_activities_partitions(3)');
+        PERFORM cron.schedule('activities-retention', '30 3 1 * *', 'SELECT activities_retention(12, TRUE)');
+    ELSE
+        RAISE WARNING 'pg_cron is not installed: schedule SELECT ensure_activities_partitions(3) daily '
+                      'before the partitions created by this migration run out';
+    END IF;
+END;
+$$;
+
+-- ===========================================
+-- COMMENTS for Documentation
+-- ===========================================
+
+COMMENT ON TABLE activities IS 'Comprehensive activity tracking table for Cell App and Cell Portal (monthly range partitions on created_at)';
+COMMENT ON COLUMN activities.leader_id IS 'Foreign key to leaders table';
+COMMENT ON COLUMN activities.user_id IS 'User ID from authentication system';
+COMMENT ON COLUMN activities.user_role IS 'Role of the user: leader, admin, super_admin, etc.';
+COMMENT ON COLUMN activities.activity_type IS 'Type of activity: member_added, attendance_marked, etc.';
+COMMENT ON COLUMN activities.activity_category IS 'Category: member, attendance, tutorial, meeting, profile, system';
+COMMENT ON COLUMN activities.source IS 'Source of activity: cell_app or cell_portal';
+COMMENT ON COLUMN activities.activity_date IS 'Date of the activity for date-wise tracking';
+COMMENT ON COLUMN activities.details IS 'JSONB field for activity-specific details';
+COMMENT ON COLUMN activities.metadata IS 'JSONB field for additional metadata (IP, user agent, etc.)';
+COMMENT ON FUNCTION create_activities_partition(DATE) IS 'Create the monthly activities partition containing the given date';
+COMMENT ON FUNCTION ensure_activities_partitions(INTEGER) IS 'Create partitions for the current month and the next N months';
+COMMENT ON FUNCTION activities_retention(INTEGER, BOOLEAN) IS 'Detach (archive or drop) activities partitions older than N months';
@@ -0,0 +1,64 @@
+"""
+Gunicorn configuration for CellApp
+Requests spend most of their time waiting on PostgREST, so workers use
+cooperative I/O instead of one blocking request per process:
+
+    gthread  threads per worker (default, no extra dependencies)
+    gevent   greenlets per worker (pip install gevent)
+    sync     one request per worker (previous behaviour; login padding
+             then blocks the worker, so not for production)
+
+Usage:
+    gunicorn -c gunicorn.conf.py wsgi:application
+    GUNICORN_WORKER_CLASS=gevent gunicorn -c gunicorn.conf.py wsgi:application
+
+Settings are read from the environment (.env via systemd's EnvironmentFile);
+command-line flags still override them
+"""
+
+import importlib.util
+import os
+import sys
+
+bind = os.getenv('GUNICORN_BIND', '127.0.0.1:5001')
+workers = int(os.getenv('GUNICORN_WORKERS') or os.getenv('WORKERS') or '4')
+
+# Worker model
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread').lower()
+threads = int(os.getenv('GUNICORN_THREADS') or '8')  # gthread: concurrent requests per worker
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS') or '100')  # gevent: concurrent requests per worker
+
+if worker_class == 'gevent' and importlib.util.find_spec('gevent') is None:
+    print("WARNING: gevent is not installed, falling back to gthread workers", file=sys.stderr)
+    worker_class = 'gthread'
+
+# gunicorn quietly turns sync workers into gthread when threads > 1
+if worker_class == 'sync':
+    threads = 1
+    print("WARNING: sync workers hold the whole worker while a login is padded to its "
+          "constant duration (utils/timing.py); use gthread or gevent in production", file=sys.stderr)
+
+# Timeouts (seconds)
+timeout = int(os.getenv('GUNICORN_TIMEOUT') or '60')
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT') or '30')
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE') or '5')
+
+# Recycle workers now and then so slow leaks can't build up (jitter avoids all restarting at once)
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS') or '2000')
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER') or '200')
+
+# The app is imported in each worker after the fork (and after gevent patches
+# the standard library); preloading would import it unpatched in the master
+preload_app = False
+
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_fork(server, worker):
+    """Drop per-process state the worker may have inherited from the master"""
+    # Only touch modules that are already imported: importing them here would
+    # happen before a gevent worker patches the standard library
+    supabase_client = sys.modules.get('utils.supabase_client')
+    if supabase_client is not None:
+        supabase_client.reset_supabase()
+    server.log.info(f"Worker {worker.pid} started ({worker_class})")
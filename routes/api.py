@@ -1,5 +1,15 @@
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, request, jsonify, session, Response, stream_with_context
 from functools import wraps
+from datetime import datetime
+import json
+import logging
+from utils.password_hashing import password_hasher
+from utils.activity_logger import get_activities_page, search_activities, iter_activities, log_activity, ACTIVITY_PAGE_MAX
+
+logger = logging.getLogger(__name__)
+
+# Activities serialized per chunk written to the export stream
+EXPORT_CHUNK_ROWS = 200
 # Create blueprint
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 def login_required(f):
@@ -23,7 +33,9 @@ def health_check():
     """Health check endpoint"""
     return jsonify({
         'status': 'healthy',
-        'message': 'API is running'
+        'message': 'API is running',
+        # This worker's bcrypt pool: queue/run times show whether to change BCRYPT_MAX_CONCURRENCY or BCRYPT_ROUNDS
+        'password_hashing': password_hasher.stats()
     })
 @api_bp.route('/test')
 @login_required
@@ -33,3 +45,142 @@ def test_endpoint():
         'message': 'This is a protected endpoint',
         'user_id': session['user']['id']
     })
+def parse_date_arg(name):
+    """Parse an optional YYYY-MM-DD query argument (raises ValueError if malformed)"""
+    value = request.args.get(name)
+    if not value:
+        return None
+    return datetime.strptime(value, "%Y-%m-%d").date()
+@api_bp.route('/activities')
+@login_required
+def list_activities():
+    """Activity feed for the current leader, newest first, with cursor pagination
+    
+    Query args: limit, cursor (next_cursor of the previous page), activity_type,
+    activity_category, user_role, source, start_date and end_date (YYYY-MM-DD)
+    """
+    try:
+        limit = int(request.args.get('limit', 50))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    if limit < 1 or limit > ACTIVITY_PAGE_MAX:
+        return jsonify({'error': f'limit must be between 1 and {ACTIVITY_PAGE_MAX}'}), 400
+    try:
+        start_date = parse_date_arg('start_date')
+        end_date = parse_date_arg('end_date')
+    except ValueError:
+        return jsonify({'error': 'Dates must be in YYYY-MM-DD format'}), 400
+    try:
+        page = get_activities_page(
+            leader_id=session['user']['id'],
+            limit=limit,
+            cursor=request.args.get('cursor') or None,
+            activity_type=request.args.get('activity_type') or None,
+            activity_category=request.args.get('activity_category') or None,
+            user_role=request.args.get('user_role') or None,
+            source=request.args.get('source') or None,
+            start_date=start_date,
+            end_date=end_date
+        )
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+    return jsonify({
+        'activities': page['activities'],
+        'next_cursor': page['next_cursor'],
+        'status': 'success'
+    })
+@api_bp.route('/activities/search')
+@login_required
+def search_activity_feed():
+    """Full-text search over the current leader's activity descriptions, best matches first
+    
+    Query args: q (words, "quoted phrases", OR, -excluded), limit, cursor
+    (next_cursor of the previous page)
+    """
+    search_query = (request.args.get('q') or '').strip()
+    if not search_query:
+        return jsonify({'error': 'q is required'}), 400
+    try:
+        limit = int(request.args.get('limit', 50))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    if limit < 1 or limit > ACTIVITY_PAGE_MAX:
+        return jsonify({'error': f'limit must be between 1 and {ACTIVITY_PAGE_MAX}'}), 400
+    try:
+        page = search_activities(
+            leader_id=session['user']['id'],
+            query=search_query,
+            limit=limit,
+            cursor=request.args.get('cursor') or None
+        )
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+    return jsonify({
+        'activities': page['activities'],
+        'next_cursor': page['next_cursor'],
+        'status': 'success'
+    })
+@api_bp.route('/activities/export')
+@login_required
+def export_activities():
+    """Stream the current leader's activities as NDJSON (one JSON object per line), newest first
+    
+    Query args: activity_type, activity_category, user_role, source, start_date and
+    end_date (YYYY-MM-DD). Rows are read in keyset pages and written as they arrive,
+    so memory use does not grow with the range. If a page query fails mid-stream the
+    last line is {"error": ...} (the status code has already been sent).
+    """
+    try:
+        start_date = parse_date_arg('start_date')
+        end_date = parse_date_arg('end_date')
+    except ValueError:
+        return jsonify({'error': 'Dates must be in YYYY-MM-DD format'}), 400
+    
+    leader_id = session['user']['id']
+    filters = {
+        'activity_type': request.args.get('activity_type') or None,
+        'activity_category': request.args.get('activity_category') or None,
+        'user_role': request.args.get('user_role') or None,
+        'source': request.args.get('source') or None,
+        'start_date': start_date,
+        'end_date': end_date
+    }
+    
+    log_activity(
+        leader_id=leader_id,
+        user_id=leader_id,
+        activity_type='export_created',
+        description='Exported activities',
+        user_role='leader',
+        user_name=session['user'].get('name', 'Leader'),
+        source='cell_app',
+        platform='api',
+        details={key: value.isoformat() if hasattr(value, 'isoformat') else value
+                 for key, value in filters.items() if value}
+    )
+    
+    def generate():
+        lines = []
+        try:
+            for activity in iter_activities(leader_id, **filters):
+                lines.append(json.dumps(activity, default=str))
+                if len(lines) >= EXPORT_CHUNK_ROWS:
+                    yield '\n'.join(lines) + '\n'
+                    lines = []
+        except Exception as e:
+            logger.error(f"Activity export failed: {str(e)}")
+            lines.append(json.dumps({'error': 'Export interrupted'}))
+        if lines:
+            yield '\n'.join(lines) + '\n'
+    
+    filename = f"activities-{datetime.now().strftime('%Y-%m-%d')}.ndjson"
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={
+            'Content-Disposition': f'attachment; filename="{filename}"',
+            # Let nginx pass chunks through instead of buffering the whole export
+            'X-Accel-Buffering': 'no',
+            'Cache-Control': 'no-store'
+        }
+    )
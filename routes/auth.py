@@ -1,12 +1,13 @@
 from flask import Blueprint, render_template, request, redirect, url_for, session, flash
-from supabase import create_client, Client
 import os
-import bcrypt
-import time
 import logging
 from dotenv import load_dotenv
 from utils.activity_logger import log_activity
 from utils.device_detector import get_template_suffix
+from utils.leader_context import store_leader_context
+from utils.supabase_client import supabase
+from utils.timing import ResponseTimer, LOGIN_MIN_DURATION
+from utils.password_hashing import password_hasher, PasswordHasherBusy
 
 # Load environment variables
 load_dotenv()
@@ -17,15 +18,6 @@ auth_bp = Blueprint('auth', __name__)
 # Configure secure logging
 logger = logging.getLogger(__name__)
 
-# Supabase configuration
-SUPABASE_URL = os.getenv('SUPABASE_URL')
-SUPABASE_KEY = os.getenv('SUPABASE_ANON_KEY')
-
-if SUPABASE_URL and SUPABASE_KEY:
-    supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-else:
-    supabase = None
-
 # Import limiter from app (will be set during blueprint registration)
 from flask import current_app
 
@@ -37,6 +29,15 @@ def get_limiter():
     except:
         return None
 
+def rehash_password(user_id, password):
+    """Store the password hashed at the configured BCRYPT_ROUNDS (failures only logged)"""
+    try:
+        new_hash = password_hasher.hash(password)
+        supabase.table('users').update({'password': new_hash}).eq('id', user_id).execute()
+        logger.info(f"Rehashed password for user {user_id} at cost {password_hasher.rounds}")
+    except Exception as e:
+        logger.error(f"Failed to rehash password: {str(e)}")
+
 @auth_bp.route('/login', methods=['GET', 'POST'])
 def login():
     # Rate limiting decorator would be applied here if using Flask-Limiter
@@ -46,13 +47,12 @@ def login():
         mobile = request.form.get('mobile', '').strip()
         password = request.form.get('password', '')
         
-        # Start timing for constant-time response
-        start_time = time.time()
+        # Start timing for constant-time response (monotonic clock)
+        timer = ResponseTimer(LOGIN_MIN_DURATION)
         
         # Default values for timing attack prevention
         login_successful = False
         user_data = None
-        dummy_hash = b'$2b$12$dummyhashfortimingatttackprevention1234567890'
         
         if not mobile or not password:
             flash("Mobile number and password are required", 'error')
@@ -62,8 +62,12 @@ def login():
         # Validate mobile number format
         if len(mobile) != 10 or not mobile.isdigit():
             # Perform dummy bcrypt check for timing consistency
-            bcrypt.checkpw(b'dummy', dummy_hash)
+            try:
+                password_hasher.check(password, None)
+            except PasswordHasherBusy:
+                pass
             flash("Invalid mobile number or password", 'error')
+            timer.pad()
             template_name = f'auth/login{get_template_suffix()}.html'
             return render_template(template_name)
         
@@ -75,23 +79,20 @@ def login():
                 user_data = user_result.data[0]
                 stored_password = user_data.get('password', '')
                 
-                # Verify password using bcrypt
-                if stored_password:
-                    try:
-                        if bcrypt.checkpw(password.encode('utf-8'), stored_password.encode('utf-8')):
-                            login_successful = True
-                    except Exception:
-                        login_successful = False
-                else:
-                    # Perform dummy check for timing consistency
-                    bcrypt.checkpw(b'dummy', dummy_hash)
+                # Verify password using bcrypt on the bounded pool (an empty or
+                # malformed hash costs a dummy check for timing consistency)
+                login_successful = password_hasher.check(password, stored_password)
             else:
                 # User not found - perform dummy bcrypt check for timing consistency
-                bcrypt.checkpw(b'dummy', dummy_hash)
+                password_hasher.check(password, None)
             
             if login_successful and user_data:
                 user_id = user_data.get('id')
                 
+                # Stored at a different cost than BCRYPT_ROUNDS: upgrade it while we have the password
+                if password_hasher.needs_rehash(stored_password):
+                    rehash_password(user_id, password)
+                
                 # Clear old session and regenerate to prevent session fixation
                 old_session_data = dict(session)
                 session.clear()
@@ -106,6 +107,9 @@ def login():
                     'role_id': user_data.get('role_id')
                 }
                 
+                # Keep the leader context (created_at, branch_id, country) with the session
+                store_leader_context(user_data)
+                
                 # Log login activity (without sensitive data)
                 try:
                     log_activity(
@@ -131,14 +135,16 @@ def login():
                 # Generic error message to prevent user enumeration
                 flash("Invalid mobile number or password", 'error')
                 
+        except PasswordHasherBusy as e:
+            logger.warning(f"Login rejected, password checks saturated: {str(e)}")
+            flash("Too many login attempts right now. Please try again in a moment.", 'error')
         except Exception as e:
             logger.error(f"Login error: {str(e)}")
             flash("An error occurred during login. Please try again.", 'error')
         
-        # Ensure minimum response time to prevent timing attacks (300ms)
-        elapsed = time.time() - start_time
-        if elapsed < 0.3:
-            time.sleep(0.3 - elapsed)
+        # Ensure minimum response time to prevent timing attacks (300ms); the wait
+        # yields to other requests instead of blocking the worker
+        timer.pad()
     
     template_name = f'auth/login{get_template_suffix()}.html'
     return render_template(template_name)
@@ -1,13 +1,20 @@
 from flask import Blueprint, render_template, session, redirect, url_for, flash, request, jsonify, abort
-from supabase import create_client, Client
 from datetime import datetime, timedelta
 import os
 import re
 import logging
 from functools import wraps
 from dotenv import load_dotenv
-from utils.activity_logger import log_activity
+from utils.activity_logger import log_activity, get_recent_activity_feed
+from utils.data_context import fetch, fetch_one, get_data_context, invalidate
+from utils.attendance_engine import summarize_attendance, submit_attendance_queries, get_attendance_status, fetch_all
+from utils.meetings_calendar import meetings_calendar
+from utils.tutorial_cache import tutorial_cache
+from utils.concurrent_queries import QueryFanOut
+from utils.models import Attendance, Member, parse_date
+from utils.leader_context import get_leader_context, get_leader_created_date, refresh_leader_context
 from utils.device_detector import get_template_suffix
+from utils.supabase_client import supabase, missing_rpcs, rpc_function_missing
 
 # Configure secure logging
 logger = logging.getLogger(__name__)
@@ -28,10 +35,7 @@ def validate_ownership(supabase, table, record_id, owner_field):
         leader_id = session.get('user', {}).get('id')
         if not leader_id:
             return None
-        result = supabase.table(table).select('*').eq('id', record_id).eq(owner_field, leader_id).execute()
-        if result.data and len(result.data) > 0:
-            return result.data[0]
-        return None
+        return fetch_one(supabase.table(table).select('*').eq('id', record_id).eq(owner_field, leader_id))
     except Exception as e:
         logger.error(f"Error validating ownership: {str(e)}")
         return None
@@ -112,42 +116,7 @@ def secure_filename_custom(filename):
     return f"{name_hash}.{ext}"
 # Load environment variables
 load_dotenv()
-# Supabase configuration
-SUPABASE_URL = os.getenv('SUPABASE_URL')
-SUPABASE_KEY = os.getenv('SUPABASE_ANON_KEY')
-if SUPABASE_URL and SUPABASE_KEY:
-    supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-else:
-    supabase = None
 
-# Helper function to get user's created_at date
-def get_user_created_date(user_id):
-    """Get the user's created_at date from users table"""
-    try:
-        user_result = supabase.table('users')\
-            .select('created_at')\
-            .eq('id', user_id)\
-            .execute()
-        
-        if user_result.data and len(user_result.data) > 0:
-            user_created_at_str = user_result.data[0].get('created_at')
-            if user_created_at_str:
-                # Parse the created_at timestamp
-                if isinstance(user_created_at_str, str):
-                    try:
-                        user_created_at = datetime.fromisoformat(user_created_at_str.replace('Z', '+00:00'))
-                    except ValueError:
-                        try:
-                            user_created_at = datetime.strptime(user_created_at_str, "%Y-%m-%dT%H:%M:%S.%f")
-                        except ValueError:
-                            user_created_at = datetime.strptime(user_created_at_str.split('T')[0], "%Y-%m-%d")
-                else:
-                    user_created_at = user_created_at_str
-                # Extract just the date part for comparison with meeting_date
-                return user_created_at.date() if hasattr(user_created_at, 'date') else user_created_at
-    except Exception as e:
-        logger.error(f"Error fetching user created_at: {str(e)}")
-    return None
 # Create blueprint
 main_bp = Blueprint('main', __name__)
 
@@ -306,297 +275,277 @@ def get_past_tuesdays():
         tuesdays.append(tuesday.strftime("%B %d, %Y"))
     return tuesdays
 
-@main_bp.route('/')
-def index():
+def tutorial_list_item(parsed_date, tutorial_record, today):
+    """Build a Quick Access tutorial list entry for a meeting date"""
+    has_tutorial = tutorial_record is not None
+    # Check if it's a placeholder (check title field)
+    is_placeholder_tutorial = has_tutorial and (tutorial_record.get('title') == 'No Tutorial Uploaded' or tutorial_record.get('title') == '')
+    return {
+        'date': parsed_date.strftime("%B %d, %Y"),
+        'date_iso': parsed_date.isoformat(),
+        'has_tutorial': has_tutorial,
+        'is_placeholder': is_placeholder_tutorial,
+        'is_upcoming': parsed_date > today,  # Determine if this is upcoming or past
+        'status': 'updated' if has_tutorial and not is_placeholder_tutorial else 'not_updated',
+        'tutorial_name': tutorial_record.get('title', 'No Tutorial') if has_tutorial else None,
+        'description': tutorial_record.get('description', '') if has_tutorial else None,
+        'sort_date': parsed_date
+    }
+
+def tutorial_card(next_meeting_date, has_tutorials, is_placeholder):
+    """Build the dashboard tutorial card for the next meeting"""
+    return {
+        'upcoming_date': next_meeting_date.strftime('%B %d, %Y'),
+        'has_tutorials': has_tutorials,
+        'is_placeholder': is_placeholder,
+        'meeting_date_iso': next_meeting_date.isoformat(),
+        'status': 'updated' if has_tutorials and not is_placeholder else 'not_updated'
+    }
+
+# Unique key of attendance rows (database/migrations/add_attendance_unique_constraint.sql)
+ATTENDANCE_CONFLICT_TARGET = 'leader_id,member_id,meeting_date'
+
+# Upsert conflict targets without a matching unique constraint (same idea as missing_rpcs)
+missing_conflict_targets = set()
+
+def conflict_target_missing(error):
+    """Whether an upsert error means no unique constraint matches on_conflict (42P10)"""
+    return str(getattr(error, 'code', '') or '') == '42P10'
+
+def load_dashboard_bundle(leader_id, next_meeting_date, current_attendance_date):
+    """
+    Load everything the dashboard needs with one get_dashboard_bundle RPC call.
+    See database/migrations/create_dashboard_bundle_function.sql
+    
+    Returns:
+        dict: Bundle JSON document, or None if the function is unavailable
+    """
+    if 'get_dashboard_bundle' in missing_rpcs:
+        return None
+    try:
+        result = supabase.rpc('get_dashboard_bundle', {
+            'p_leader_id': leader_id,
+            'p_next_meeting_date': next_meeting_date.isoformat(),
+            'p_attendance_date': current_attendance_date.isoformat()
+        }).execute()
+        bundle = result.data
+        if isinstance(bundle, list):
+            bundle = bundle[0] if bundle else None
+        return bundle if isinstance(bundle, dict) else None
+    except Exception as e:
+        if rpc_function_missing(e):
+            missing_rpcs.add('get_dashboard_bundle')
+            logger.warning("get_dashboard_bundle is not installed, using individual queries from now on")
+        else:
+            logger.warning(f"Dashboard bundle RPC unavailable, falling back to queries: {str(e)}")
+        return None
+
+def build_dashboard_from_bundle(bundle, next_meeting_date, current_attendance_date):
+    """Build dashboard template data from a get_dashboard_bundle document"""
+    today = datetime.now().date()
+    
+    next_meeting = bundle.get('next_meeting') or {}
+    
+    tutorial_list = []
+    attendance_list = []
+    for meeting in bundle.get('recent_meetings') or []:
+        parsed_date = parse_date(meeting['meeting_date'])
+        tutorial_record = meeting.get('tutorial')
+        tutorial_list.append(tutorial_list_item(parsed_date, tutorial_record, today))
+        
+        count = meeting.get('attendance_count') or 0
+        total = meeting.get('member_total') or 0
+        attendance_list.append({
+            'date': parsed_date.strftime("%B %d, %Y"),
+            'date_iso': parsed_date.isoformat(),
+            'status': get_attendance_status(count, total),
+            'count': count,
+            'total': total
+        })
+    
+    # Sort tutorials: upcoming first, then past tutorials (most recent first)
+    tutorial_list.sort(key=lambda x: (not x['is_upcoming'], -x['sort_date'].toordinal()))
+    
+    current_week = bundle.get('current_week') or {}
+    return {
+        'member_count': bundle.get('member_count') or 0,
+        'tutorial_card': tutorial_card(next_meeting_date,
+                                       bool(next_meeting.get('has_tutorials')),
+                                       bool(next_meeting.get('is_placeholder'))),
+        'tutorial_list': tutorial_list,
+        'attendance_list': attendance_list,
+        'latest_attendance': {
+            'meeting_date': current_attendance_date.strftime("%B %d, %Y"),
+            'meeting_date_iso': current_attendance_date.isoformat(),
+            'status': get_attendance_status(current_week.get('attendance_count') or 0,
+                                            current_week.get('member_total') or 0)
+        }
+    }
+
+def build_dashboard_data(leader_id, next_meeting_date, current_attendance_date):
+    """Build dashboard template data with individual queries (used when the bundle RPC is unavailable)"""
     # Initialize default tutorial card data
     tutorial_card_data = {
         'upcoming_date': 'No date',
         'has_tutorials': False,
         'meeting_date_iso': None
     }
+    member_count = 0
+    tutorial_list = []
+    attendance_list = []
     
-    if 'user' in session:
-        # Get leader ID - use user ID directly
-        leader_id = session['user']['id']
+    # Member count and next meeting tutorials don't depend on anything: start them first
+    queries = QueryFanOut()
+    queries.submit('member_count', lambda: len(fetch(supabase.table('cell_members').select('id').eq('leader_id', leader_id))))
+    queries.submit('next_tutorials', tutorial_cache.get, supabase, next_meeting_date)
+    
+    # Get the last 4 meetings from the calendar, filtered by user's creation date
+    recent_meetings = []
+    try:
+        # Get user's created date to filter meetings
+        user_created_date = get_leader_created_date(supabase)
+        recent_meetings = meetings_calendar.meetings_since(supabase, user_created_date, limit=4)
+    except Exception as e:
+        logger.error(f"Error fetching recent meetings: {e}")
+    recent_meeting_dates = [meeting.date for meeting in recent_meetings]
+    
+    # Quick Access tutorials and attendance for those meetings, alongside the first two
+    if recent_meetings:
+        queries.submit('tutorials_by_date', tutorial_cache.get_many, supabase, recent_meeting_dates)
+    # Only members created on or before each meeting date are counted
+    queries.submit('attendance_summary', summarize_attendance, supabase, leader_id,
+                   [current_attendance_date] + recent_meeting_dates)
+    
+    try:
+        member_count = queries.result('member_count')
         
+        # Check if there are any tutorials for the next meeting
         try:
-            # Initialize default values
-            member_count = 0
-            next_meeting_date = get_tutorial_meeting_date_corrected()
-            current_attendance_date = get_attendance_meeting_date_corrected()
-            members_result = supabase.table('cell_members').select('id').eq('leader_id', leader_id).execute()
-            member_count = len(members_result.data) if members_result.data else 0
-            # Use next meeting date for tutorial card
-            next_meeting_formatted = next_meeting_date.strftime('%B %d, %Y')
-            
-            # Check if there are any tutorials for the next meeting
-            try:
-                # First, let's see what columns exist in the tutorials table
-                print(f"Checking tutorials table structure...")
-                test_query = supabase.table('tutorials').select('*').limit(1).execute()
-                print(f"Tutorials table sample data: {test_query.data}")
-                
-                # Try querying without leader_id filter first
-                tutorials_result = supabase.table('tutorials')\
-                    .select('*')\
-                    .eq('meeting_date', next_meeting_date.isoformat())\
-                    .execute()
-                
-                has_tutorials = len(tutorials_result.data) > 0 if tutorials_result.data else False
-                
-            except Exception as e:
-                print(f"Error checking tutorials: {e}")
-                has_tutorials = False
+            # Query by meeting_date only (tutorials table has no leader_id)
+            next_tutorials = queries.result('next_tutorials')
             
-            # Check if the tutorial is a placeholder (by checking tutorial name)
-            is_placeholder = False
-            if has_tutorials and tutorials_result.data:
-                tutorial_record = tutorials_result.data[0]
-                is_placeholder = tutorial_record.get('tutorial_name') == 'No Tutorial Uploaded'
-            
-            # Update tutorial card data with status
-            tutorial_status = 'updated' if has_tutorials and not is_placeholder else 'not_updated'
-            tutorial_card_data.update({
-                'upcoming_date': next_meeting_formatted,
-                'has_tutorials': has_tutorials,
-                'is_placeholder': is_placeholder,
-                'meeting_date_iso': next_meeting_date.isoformat(),
-                'status': tutorial_status
-            })
+            has_tutorials = len(next_tutorials) > 0
             
-            # Get tutorial list for Quick Access - only from meetings table
-            tutorial_list = []
-            try:
-                # Get user's created date to filter meetings
-                user_created_date = get_user_created_date(leader_id)
+        except Exception as e:
+            logger.error(f"Error checking tutorials: {e}")
+            next_tutorials = []
+            has_tutorials = False
+        
+        # Check if the tutorial is a placeholder (by checking tutorial name)
+        is_placeholder = False
+        if has_tutorials:
+            is_placeholder = next_tutorials[0].get('tutorial_name') == 'No Tutorial Uploaded'
+        
+        # Update tutorial card data with status
+        tutorial_card_data = tutorial_card(next_meeting_date, has_tutorials, is_placeholder)
+        
+        # Get tutorial list for Quick Access - only from meetings table
+        try:
+            if recent_meetings:
+                today = datetime.now().date()
                 
-                # Get meetings from meetings table, filtered by user's creation date
-                query = supabase.table('meetings').select('*')
-                if user_created_date:
-                    query = query.gte('meeting_date', user_created_date.isoformat())
-                meetings_result = query\
-                    .order('meeting_date', desc=True)\
-                    .limit(4)\
-                    .execute()
+                # Tutorials for all listed meetings, fetched at once
+                tutorials_by_date = queries.result('tutorials_by_date')
                 
-                if meetings_result.data:
-                    today = datetime.now().date()
-                    
-                    for meeting in meetings_result.data:
-                        meeting_date = meeting.get('meeting_date')
-                        if not meeting_date:
-                            continue
-                        
-                        try:
-                            # Parse meeting date
-                            if isinstance(meeting_date, str):
-                                try:
-                                    parsed_date = datetime.strptime(meeting_date, "%Y-%m-%d").date()
-                                except ValueError:
-                                    try:
-                                        parsed_date = datetime.strptime(meeting_date, "%Y-%m-%dT%H:%M:%S").date()
-                                    except ValueError:
-                                        parsed_date = datetime.strptime(meeting_date.split('T')[0], "%Y-%m-%d").date()
-                            else:
-                                parsed_date = meeting_date
-                            
-                            # Additional safety check: skip meetings before user creation
-                            if user_created_date and parsed_date < user_created_date:
-                                continue
-                            
-                            meeting_date_iso = parsed_date.isoformat()
-                            
-                            # Check for tutorial for this meeting date
-                            tutorial_result = supabase.table('tutorials')\
-                                .select('*')\
-                                .eq('meeting_date', meeting_date_iso)\
-                                .execute()
-                            
-                            has_tutorial = len(tutorial_result.data) > 0 if tutorial_result.data else False
-                            is_placeholder_tutorial = False
-                            tutorial_record = None
-                            
-                            if has_tutorial and tutorial_result.data:
-                                tutorial_record = tutorial_result.data[0]
-                                # Check if it's a placeholder (check title field)
-                                is_placeholder_tutorial = tutorial_record.get('title') == 'No Tutorial Uploaded' or tutorial_record.get('title') == ''
-                            
-                            # Determine if this is upcoming or past
-                            is_upcoming = parsed_date > today
-                            
-                            tutorial_list.append({
-                                'date': parsed_date.strftime("%B %d, %Y"),
-                                'date_iso': meeting_date_iso,
-                                'has_tutorial': has_tutorial,
-                                'is_placeholder': is_placeholder_tutorial,
-                                'is_upcoming': is_upcoming,
-                                'status': 'updated' if has_tutorial and not is_placeholder_tutorial else 'not_updated',
-                                'tutorial_name': tutorial_record.get('title', 'No Tutorial') if has_tutorial else None,
-                                'description': tutorial_record.get('description', '') if has_tutorial else None,
-                                'sort_date': parsed_date
-                            })
-                        except Exception as date_error:
-                            print(f"Error parsing meeting date {meeting_date}: {date_error}")
-                            continue
+                for meeting in recent_meetings:
+                    # Check for tutorial for this meeting date
+                    tutorial_rows = tutorials_by_date.get(meeting.date.isoformat(), [])
+                    tutorial_record = tutorial_rows[0] if tutorial_rows else None
                     
-                    # Sort tutorials: upcoming first, then past tutorials (most recent first)
-                    tutorial_list.sort(key=lambda x: (not x['is_upcoming'], -x['sort_date'].toordinal()))
-            except Exception as e:
-                print(f"Error fetching tutorial list: {e}")
-                tutorial_list = []
+                    tutorial_list.append(tutorial_list_item(meeting.date, tutorial_record, today))
+                
+                # Sort tutorials: upcoming first, then past tutorials (most recent first)
+                tutorial_list.sort(key=lambda x: (not x['is_upcoming'], -x['sort_date'].toordinal()))
         except Exception as e:
-            print(f"Error fetching dashboard data: {e}")
-            member_count = 0
-            latest_tutorial = None
-            next_meeting_date = get_tutorial_meeting_date_corrected()
+            logger.error(f"Error fetching tutorial list: {e}")
             tutorial_list = []
-            attendance_list = []
-            latest_attendance = None
-        past_tuesdays = get_past_tuesdays()
-        today = datetime.now()
+    except Exception as e:
+        logger.error(f"Error fetching dashboard data: {e}")
+        member_count = 0
+        tutorial_list = []
+    
+    # Get attendance status for current week (using attendance-specific date logic)
+    try:
+        current_tuesday_str = current_attendance_date.strftime("%B %d, %Y")
         
-        # Get attendance status for current week (using attendance-specific date logic)
-        attendance_status = 'incomplete'
-        latest_attendance = None
+        # The current week and the Quick Access meetings, aggregated in one pass
+        attendance_summary = queries.result('attendance_summary')
         
-        try:
-            # Get current week's Tuesday date using corrected attendance logic
-            current_attendance_date = get_attendance_meeting_date_corrected()
-            current_tuesday_str = current_attendance_date.strftime("%B %d, %Y")
-            
-            # Get members for this leader, filtered by created_at <= current_attendance_date
-            # Only count members who existed on or before this meeting date
-            query = supabase.table('cell_members').select('id').eq('leader_id', leader_id)
-            query = query.lte('created_at', current_attendance_date.isoformat())
-            members_result = query.execute()
-            total_members = len(members_result.data) if members_result.data else 0
-            
-            if total_members > 0:
-                # Get attendance records for current week
-                member_ids = [member['id'] for member in members_result.data]
-                attendance_result = supabase.table('attendance')\
-                    .select('member_id')\
-                    .eq('leader_id', leader_id)\
-                    .eq('meeting_date', current_attendance_date.isoformat())\
-                    .in_('member_id', member_ids)\
-                    .execute()
-                
-                # Count how many members have attendance records
-                attendance_count = len(attendance_result.data) if attendance_result.data else 0
-                
-                # Determine status based on completion
-                if attendance_count == total_members:
-                    attendance_status = 'complete'
-                elif attendance_count > 0:
-                    attendance_status = 'partial'
-                else:
-                    attendance_status = 'incomplete'
-            else:
-                # No members found, set default status
-                attendance_status = 'incomplete'
-            
-            # Set latest attendance data for display using current attendance date
-            latest_attendance = {
-                'meeting_date': current_tuesday_str,
-                'meeting_date_iso': current_attendance_date.isoformat(),
-                'status': attendance_status
-            }
-            
-            # Get attendance reminder info for current week
-            attendance_reminder = None
-            if current_attendance_date:
-                attendance_reminder = get_attendance_reminder_info(current_attendance_date)
-            
-            # Get attendance list for Quick Access - only from meetings table
-            attendance_list = []
+        # Set latest attendance data for display using current attendance date
+        latest_attendance = {
+            'meeting_date': current_tuesday_str,
+            'meeting_date_iso': current_attendance_date.isoformat(),
+            'status': attendance_summary[current_attendance_date.isoformat()]['status']
+        }
+        
+        # Build attendance list for Quick Access
+        for meeting_date in recent_meeting_dates:
+            meeting_summary = attendance_summary[meeting_date.isoformat()]
+            attendance_list.append({
+                'date': meeting_date.strftime("%B %d, %Y"),
+                'date_iso': meeting_date.isoformat(),
+                'status': meeting_summary['status'],
+                'count': meeting_summary['count'],
+                'total': meeting_summary['total']
+            })
+    except Exception as e:
+        logger.error(f"Error fetching attendance data: {e}")
+        attendance_list = []
+        latest_attendance = {
+            'meeting_date': 'Error loading data',
+            'meeting_date_iso': None,
+            'status': 'incomplete'
+        }
+    
+    return {
+        'member_count': member_count,
+        'tutorial_card': tutorial_card_data,
+        'tutorial_list': tutorial_list,
+        'attendance_list': attendance_list,
+        'latest_attendance': latest_attendance
+    }
+
+@main_bp.route('/')
+def index():
+    if 'user' in session:
+        # Get leader ID - use user ID directly
+        leader_id = session['user']['id']
+        
+        next_meeting_date = get_tutorial_meeting_date_corrected()
+        current_attendance_date = get_attendance_meeting_date_corrected()
+        
+        # The bundle and the recent-activity feed are independent: load them at once
+        queries = QueryFanOut()
+        use_bundle = 'get_dashboard_bundle' not in missing_rpcs
+        if use_bundle:
+            queries.submit('bundle', load_dashboard_bundle, leader_id, next_meeting_date, current_attendance_date)
+        # Served from this worker's ring buffer; no query unless the leader's buffer is stale
+        queries.submit('recent_activities', get_recent_activity_feed, leader_id)
+        
+        # One round trip when the bundle function is installed, individual queries otherwise
+        bundle = None
+        if use_bundle:
             try:
-                # Get user's created date to filter meetings
-                user_created_date = get_user_created_date(leader_id)
-                
-                # Get meetings from meetings table, filtered by user's creation date
-                query = supabase.table('meetings').select('*')
-                if user_created_date:
-                    query = query.gte('meeting_date', user_created_date.isoformat())
-                meetings_result = query\
-                    .order('meeting_date', desc=True)\
-                    .limit(4)\
-                    .execute()
-                
-                if meetings_result.data:
-                    for meeting in meetings_result.data:
-                        meeting_date = meeting.get('meeting_date')
-                        if not meeting_date:
-                            continue
-                        
-                        try:
-                            # Parse meeting date
-                            if isinstance(meeting_date, str):
-                                try:
-                                    parsed_date = datetime.strptime(meeting_date, "%Y-%m-%d").date()
-                                except ValueError:
-                                    try:
-                                        parsed_date = datetime.strptime(meeting_date, "%Y-%m-%dT%H:%M:%S").date()
-                                    except ValueError:
-                                        parsed_date = datetime.strptime(meeting_date.split('T')[0], "%Y-%m-%d").date()
-                            else:
-                                parsed_date = meeting_date
-                            
-                            # Additional safety check: skip meetings before user creation
-                            if user_created_date and parsed_date < user_created_date:
-                                continue
-                            
-                            meeting_date_str = parsed_date.strftime("%B %d, %Y")
-                            meeting_date_iso = parsed_date.isoformat()
-                            
-                            # Get members for this meeting date (only those created on or before this meeting)
-                            meeting_members_query = supabase.table('cell_members').select('id').eq('leader_id', leader_id)
-                            meeting_members_query = meeting_members_query.lte('created_at', meeting_date_iso)
-                            meeting_members_result = meeting_members_query.execute()
-                            meeting_member_ids = [member['id'] for member in meeting_members_result.data] if meeting_members_result.data else []
-                            meeting_total_members = len(meeting_member_ids)
-                            
-                            # Get attendance records for this meeting date (only for members who existed then)
-                            if meeting_member_ids:
-                                week_attendance_result = supabase.table('attendance')\
-                                    .select('member_id')\
-                                    .eq('leader_id', leader_id)\
-                                    .eq('meeting_date', meeting_date_iso)\
-                                    .in_('member_id', meeting_member_ids)\
-                                    .execute()
-                                
-                                week_attendance_count = len(week_attendance_result.data) if week_attendance_result.data else 0
-                            else:
-                                week_attendance_count = 0
-                            
-                            # Determine status for this meeting
-                            if meeting_total_members > 0 and week_attendance_count == meeting_total_members:
-                                week_status = 'complete'
-                            elif week_attendance_count > 0:
-                                week_status = 'partial'
-                            else:
-                                week_status = 'incomplete'
-                            
-                            attendance_list.append({
-                                'date': meeting_date_str,
-                                'date_iso': meeting_date_iso,
-                                'status': week_status,
-                                'count': week_attendance_count,
-                                'total': meeting_total_members
-                            })
-                        except Exception as date_error:
-                            print(f"Error parsing meeting date {meeting_date}: {date_error}")
-                            continue
+                bundle = queries.result('bundle')
+            except Exception as e:
+                logger.warning(f"Dashboard bundle not loaded: {str(e)}")
+        dashboard = None
+        if bundle is not None:
+            try:
+                dashboard = build_dashboard_from_bundle(bundle, next_meeting_date, current_attendance_date)
             except Exception as e:
-                print(f"Error fetching attendance list: {e}")
-                attendance_list = []
+                logger.error(f"Invalid dashboard bundle: {str(e)}")
+        if dashboard is None:
+            dashboard = build_dashboard_data(leader_id, next_meeting_date, current_attendance_date)
+        
+        past_tuesdays = get_past_tuesdays()
+        today = datetime.now()
+        
+        try:
+            recent_activities = queries.result('recent_activities')
         except Exception as e:
-            print(f"Error fetching attendance data: {e}")
-            attendance_status = 'incomplete'
-            latest_attendance = {
-                'meeting_date': 'Error loading data',
-                'meeting_date_iso': None,
-                'status': 'incomplete'
-            }
+            logger.warning(f"Recent activity feed not loaded: {str(e)}")
+            recent_activities = []
         
         try:
             # Get attendance reminder info for dashboard
@@ -611,20 +560,21 @@ def index():
                                  next_meeting_date_obj=next_meeting_date,
                                  current_attendance_date=current_attendance_date.strftime("%B %d, %Y"),
                                  current_attendance_date_obj=current_attendance_date,
-                                 member_count=member_count,
-                                 tutorial_card=tutorial_card_data,
-                                 tutorial_list=tutorial_list,
-                                 attendance_list=attendance_list,
+                                 member_count=dashboard['member_count'],
+                                 tutorial_card=dashboard['tutorial_card'],
+                                 tutorial_list=dashboard['tutorial_list'],
+                                 attendance_list=dashboard['attendance_list'],
                                  current_week_date=next_meeting_date.strftime("%B %d, %Y"),
                                  week_1_date=past_tuesdays[0],
                                  week_2_date=past_tuesdays[1],
                                  week_3_date=past_tuesdays[2],
                                  week_4_date=past_tuesdays[3],
-                                 latest_attendance=latest_attendance,
+                                 latest_attendance=dashboard['latest_attendance'],
                                  attendance_reminder=attendance_reminder,
+                                 recent_activities=recent_activities,
                                  today=today)
         except Exception as e:
-            print(f"Error rendering dashboard template: {e}")
+            logger.error(f"Error rendering dashboard template: {e}")
             flash('Error loading dashboard', 'error')
             return redirect(url_for('auth.login'))
     return redirect(url_for('auth.login'))
@@ -643,145 +593,84 @@ def meeting_dates():
         leader_id = session['user']['id']
         
         # Get user's created date to filter meetings
-        user_created_date = get_user_created_date(leader_id)
+        user_created_date = get_leader_created_date(supabase)
         
         # Query meetings from database
         # Filter meetings to only show those created after the user was created
         meetings = []
-        print(f"DEBUG: Fetching meetings from database...")
+        logger.debug("Fetching meetings from database...")
         
         try:
             # Query meetings from meetings table, filtered by user's creation date
-            print("DEBUG: Querying meetings table...")
-            try:
-                # Build query
-                query = supabase.table('meetings').select('*')
-                
-                # Filter by meeting_date >= user_created_date if user_created_date exists
-                if user_created_date:
-                    query = query.gte('meeting_date', user_created_date.isoformat())
-                    print(f"DEBUG: Filtering meetings where meeting_date >= {user_created_date.isoformat()}")
-                
-                meetings_result = query\
-                    .order('meeting_date', desc=True)\
-                    .limit(20)\
-                    .execute()
-                
-                print(f"DEBUG: Meetings found: {len(meetings_result.data) if meetings_result.data else 0}")
-            except Exception as order_error:
-                print(f"DEBUG: Error with order clause, trying without order: {order_error}")
-                # Try without order clause, but still apply date filter
-                query = supabase.table('meetings').select('*')
-                if user_created_date:
-                    query = query.gte('meeting_date', user_created_date.isoformat())
-                meetings_result = query.limit(20).execute()
-                print(f"DEBUG: Meetings found (no order): {len(meetings_result.data) if meetings_result.data else 0}")
+            logger.debug("Querying meetings table...")
+            # Filter by meeting_date >= user_created_date if user_created_date exists
+            if user_created_date:
+                logger.debug("Filtering meetings where meeting_date >= %s", user_created_date.isoformat())
+            meetings_rows = meetings_calendar.meetings_since(supabase, user_created_date, limit=20)
+            logger.debug("Meetings found: %s", len(meetings_rows))
             
-            if meetings_result.data:
-                print(f"DEBUG: Processing {len(meetings_result.data)} meetings...")
+            if meetings_rows:
+                logger.debug("Processing %s meetings...", len(meetings_rows))
                 # Process meetings from meetings table
-                for meeting in meetings_result.data:
-                    meeting_date = meeting.get('meeting_date')
-                    meeting_name = meeting.get('meeting_name', 'Cell Meeting')
-                    meeting_number = meeting.get('meeting_number')
-                    print(f"DEBUG: Processing meeting - ID: {meeting.get('id')}, Date: {meeting_date}, Name: {meeting_name}, Number: {meeting_number}")
+                for meeting in meetings_rows:
+                    meeting_name = meeting.meeting_name or 'Cell Meeting'
+                    meeting_number = meeting.meeting_number
+                    logger.debug("Processing meeting - ID: %s, Date: %s, Name: %s, Number: %s", meeting.id, meeting.meeting_date, meeting_name, meeting_number)
                     
-                    if meeting_date:
-                        # Additional safety check: filter by user_created_date if available
-                        if user_created_date:
-                            try:
-                                # Parse meeting date for comparison
-                                if isinstance(meeting_date, str):
-                                    try:
-                                        meeting_date_parsed = datetime.strptime(meeting_date, "%Y-%m-%d").date()
-                                    except ValueError:
-                                        try:
-                                            meeting_date_parsed = datetime.strptime(meeting_date, "%Y-%m-%dT%H:%M:%S").date()
-                                        except ValueError:
-                                            meeting_date_parsed = datetime.strptime(meeting_date.split('T')[0], "%Y-%m-%d").date()
-                                else:
-                                    meeting_date_parsed = meeting_date
-                                
-                                # Skip meetings before user creation
-                                if meeting_date_parsed < user_created_date:
-                                    print(f"DEBUG: Skipping meeting {meeting_date} (before user creation {user_created_date})")
-                                    continue
-                            except Exception as date_check_error:
-                                print(f"DEBUG: Error checking meeting date: {date_check_error}, including meeting anyway")
+                    # The calendar only holds meetings with a valid date, already filtered by user creation
+                    parsed_date = meeting.date
+                    if parsed_date:
                         try:
-                            # Parse date if it's a string
-                            if isinstance(meeting_date, str):
-                                # Try different date formats
-                                try:
-                                    parsed_date = datetime.strptime(meeting_date, "%Y-%m-%d").date()
-                                except ValueError:
-                                    try:
-                                        parsed_date = datetime.strptime(meeting_date, "%Y-%m-%dT%H:%M:%S").date()
-                                    except ValueError:
-                                        parsed_date = datetime.strptime(meeting_date.split('T')[0], "%Y-%m-%d").date()
-                            else:
-                                parsed_date = meeting_date
-                            
                             meetings.append({
                                 'date': parsed_date.strftime("%B %d, %Y"),
                                 'date_iso': parsed_date.isoformat(),
                                 'date_obj': parsed_date,  # Store date object for sorting
                                 'meeting_type': meeting_name,  # Use meeting_name from database
                                 'description': f"Meeting #{meeting_number}" if meeting_number else '',  # Use meeting_number as description
-                                'id': meeting.get('id'),
+                                'id': meeting.id,
                                 'meeting_number': meeting_number,
                                 'is_upcoming': False  # Will be set later
                             })
-                            print(f"DEBUG: Successfully added meeting: {parsed_date.strftime('%B %d, %Y')} - {meeting_name}")
+                            logger.debug("Successfully added meeting: %s - %s", parsed_date, meeting_name)
                         except Exception as e:
-                            print(f"Error parsing meeting date: {e}, meeting_date value: {meeting_date}, type: {type(meeting_date)}")
+                            logger.error(f"Error parsing meeting date: {e}, meeting_date value: {meeting.meeting_date}, type: {type(meeting.meeting_date)}")
                             continue
                     else:
-                        print(f"DEBUG: Meeting {meeting.get('id')} has no meeting_date field")
+                        logger.debug("Meeting %s has no meeting_date field", meeting.id)
             else:
-                print("DEBUG: No meetings data returned from query")
+                logger.debug("No meetings data returned from query")
         except Exception as e:
-            print(f"Error querying meetings table: {e}")
+            logger.error(f"Error querying meetings table: {e}")
             import traceback
             traceback.print_exc()
             # Fallback: Get unique meeting dates from attendance table
             try:
-                attendance_result = supabase.table('attendance')\
+                attendance_rows = fetch(supabase.table('attendance')\
                     .select('meeting_date')\
                     .eq('leader_id', leader_id)\
-                    .order('meeting_date', desc=True)\
-                    .execute()
+                    .order('meeting_date', desc=True))
                 
-                if attendance_result.data:
-                    # Get unique meeting dates
-                    unique_dates = set()
-                    for record in attendance_result.data:
-                        meeting_date = record.get('meeting_date')
-                        if meeting_date:
-                            unique_dates.add(meeting_date)
+                if attendance_rows:
+                    # Get unique meeting dates (parsed once by the model)
+                    unique_dates = {record.date for record in Attendance.from_rows(attendance_rows) if record.date}
                     
                     # Convert to list and sort
-                    for date_str in sorted(unique_dates, reverse=True)[:20]:
-                        try:
-                            parsed_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-                            meetings.append({
-                                'date': parsed_date.strftime("%B %d, %Y"),
-                                'date_iso': parsed_date.isoformat(),
-                                'date_obj': parsed_date,  # Store date object for sorting
-                                'meeting_type': 'Cell Meeting',
-                                'description': '',
-                                'id': None,
-                                'is_upcoming': False  # Will be set later
-                            })
-                        except Exception as e:
-                            print(f"Error parsing attendance date: {e}")
-                            continue
+                    for parsed_date in sorted(unique_dates, reverse=True)[:20]:
+                        meetings.append({
+                            'date': parsed_date.strftime("%B %d, %Y"),
+                            'date_iso': parsed_date.isoformat(),
+                            'date_obj': parsed_date,  # Store date object for sorting
+                            'meeting_type': 'Cell Meeting',
+                            'description': '',
+                            'id': None,
+                            'is_upcoming': False  # Will be set later
+                        })
             except Exception as e2:
-                print(f"Error querying attendance table: {e2}")
+                logger.error(f"Error querying attendance table: {e2}")
         
         # If no meetings found, use fallback to past Tuesdays
         if not meetings:
-            print("No meetings found in database, using calculated Tuesdays as fallback")
+            logger.info("No meetings found in database, using calculated Tuesdays as fallback")
             past_tuesdays = get_past_tuesdays()
             for date_str in past_tuesdays:
                 try:
@@ -794,7 +683,7 @@ def meeting_dates():
                         'id': None
                     })
                 except Exception as e:
-                    print(f"Error parsing fallback date: {e}")
+                    logger.error(f"Error parsing fallback date: {e}")
         
         # Identify upcoming meeting (latest date) and mark others as recent
         if meetings:
@@ -803,22 +692,23 @@ def meeting_dates():
             # Mark the first one (latest) as upcoming
             if len(meetings) > 0:
                 meetings[0]['is_upcoming'] = True
-                print(f"DEBUG: Upcoming meeting: {meetings[0]['date']}")
+                logger.debug("Upcoming meeting: %s", meetings[0]['date'])
             # Mark others as recent
             for meeting in meetings[1:]:
                 meeting['is_upcoming'] = False
         
-        print(f"DEBUG: Final meetings count: {len(meetings)}")
-        for i, meeting in enumerate(meetings, 1):
-            status = "UPCOMING" if meeting.get('is_upcoming') else "RECENT"
-            print(f"DEBUG: Meeting {i}: {meeting['date']} - {meeting['meeting_type']} ({status})")
+        logger.debug("Final meetings count: %s", len(meetings))
+        if logger.isEnabledFor(logging.DEBUG):
+            for i, meeting in enumerate(meetings, 1):
+                status = "UPCOMING" if meeting.get('is_upcoming') else "RECENT"
+                logger.debug("Meeting %s: %s - %s (%s)", i, meeting['date'], meeting['meeting_type'], status)
         
         template_name = f'main/meeting_dates{get_template_suffix()}.html'
         return render_template(template_name, 
                              user=session['user'],
                              meetings=meetings)
     except Exception as e:
-        print(f"Error fetching meeting dates: {e}")
+        logger.error(f"Error fetching meeting dates: {e}")
         import traceback
         traceback.print_exc()
         flash('Error loading meeting dates', 'error')
@@ -838,7 +728,7 @@ def meeting_dates():
                     'is_upcoming': False  # Will be set later
                 })
             except Exception as e:
-                print(f"Error parsing fallback date: {e}")
+                logger.error(f"Error parsing fallback date: {e}")
         
         # Identify upcoming meeting (latest date) and mark others as recent
         if meetings:
@@ -886,40 +776,18 @@ def attendance_detail(meeting_date):
         # Filter members created on or before the meeting date
         if parsed_date:
             query = query.lte('created_at', meeting_date_formatted)
-            print(f"DEBUG: Filtering members where created_at <= {meeting_date_formatted}")
+            logger.debug("Filtering members where created_at <= %s", meeting_date_formatted)
         
-        members_result = query.execute()
-        members = members_result.data if members_result.data else []
+        members = Member.from_rows(fetch(query))
         
         # Additional safety check: filter out members created after meeting date
+        # (members with no or unparseable created_at are kept for backward compatibility)
         if parsed_date and members:
             filtered_members = []
             for member in members:
-                member_created_at = member.get('created_at')
-                if member_created_at:
-                    try:
-                        # Parse member's created_at
-                        if isinstance(member_created_at, str):
-                            try:
-                                member_created = datetime.fromisoformat(member_created_at.replace('Z', '+00:00')).date()
-                            except ValueError:
-                                try:
-                                    member_created = datetime.strptime(member_created_at, "%Y-%m-%dT%H:%M:%S.%f").date()
-                                except ValueError:
-                                    member_created = datetime.strptime(member_created_at.split('T')[0], "%Y-%m-%d").date()
-                        else:
-                            member_created = member_created_at.date() if hasattr(member_created_at, 'date') else member_created_at
-                        
-                        # Only include members created on or before meeting date
-                        if member_created <= parsed_date:
-                            filtered_members.append(member)
-                        else:
-                            print(f"DEBUG: Skipping member {member.get('id')} - created {member_created} after meeting {parsed_date}")
-                    except Exception as e:
-                        print(f"Error parsing member created_at: {e}, including member anyway")
-                        filtered_members.append(member)
+                if member.created_after(parsed_date):
+                    logger.debug("Skipping member %s - created %s after meeting %s", member.id, member.created_date, parsed_date)
                 else:
-                    # If member has no created_at, include it for backward compatibility
                     filtered_members.append(member)
             members = filtered_members
         
@@ -928,7 +796,7 @@ def attendance_detail(meeting_date):
         if members:
             try:
                 member_ids = [member['id'] for member in members]
-                attendance_result = supabase.table('attendance').select('*').eq('leader_id', leader_id).eq('meeting_date', meeting_date_formatted).in_('member_id', member_ids).execute()
+                attendance_rows = fetch(supabase.table('attendance').select('*').eq('leader_id', leader_id).eq('meeting_date', meeting_date_formatted).in_('member_id', member_ids))
                 
                 # Initialize all members as incomplete
                 for member in members:
@@ -939,17 +807,14 @@ def attendance_detail(meeting_date):
                     }
                 
                 # Update with actual attendance data
-                if attendance_result.data:
-                    for record in attendance_result.data:
-                        member_id = record['member_id']
-                        status = record['status']
-                        attendance_data[member_id] = {
-                            'present': status == 'present',
-                            'absent': status == 'absent',
-                            'incomplete': False
-                        }
+                for record in Attendance.from_rows(attendance_rows):
+                    attendance_data[record.member_id] = {
+                        'present': record.status == 'present',
+                        'absent': record.status == 'absent',
+                        'incomplete': False
+                    }
             except Exception as e:
-                print(f"Error fetching attendance data: {e}")
+                logger.error(f"Error fetching attendance data: {e}")
                 # Initialize all as incomplete if error
                 for member in members:
                     attendance_data[member['id']] = {
@@ -975,10 +840,69 @@ def attendance_detail(meeting_date):
                              can_mark_attendance=can_mark,
                              reminder_info=reminder_info)
     except Exception as e:
-        print(f"Error in attendance_detail: {e}")
+        logger.error(f"Error in attendance_detail: {e}")
         flash('Error loading attendance page', 'error')
         return redirect(url_for('main.meeting_dates'))
 
+def mark_attendance_rpc(leader_id, member_id, meeting_date, status):
+    """
+    Check ownership and eligibility, then upsert or clear one attendance record in a
+    single database call. See database/migrations/create_mark_attendance_function.sql
+    
+    Args:
+        leader_id: UUID of the leader
+        member_id: UUID of the member
+        meeting_date: datetime.date of the meeting
+        status: 'present', 'absent' or 'clear'
+    
+    Returns:
+        dict: {'code': ..., 'member_name': ...}, or None if the function is unavailable
+    """
+    if 'mark_attendance' in missing_rpcs:
+        return None
+    try:
+        result = supabase.rpc('mark_attendance', {
+            'p_leader_id': leader_id,
+            'p_member_id': member_id,
+            'p_meeting_date': meeting_date.isoformat(),
+            'p_status': status
+        }).execute()
+    except Exception as e:
+        if rpc_function_missing(e):
+            missing_rpcs.add('mark_attendance')
+            logger.warning("mark_attendance is not installed, using individual queries from now on")
+        else:
+            logger.warning(f"mark_attendance RPC unavailable, falling back to queries: {str(e)}")
+        return None
+    invalidate('attendance')
+    data = result.data
+    if isinstance(data, list):
+        data = data[0] if data else None
+    return data if isinstance(data, dict) else None
+
+def log_attendance_change(leader_id, member_id, member_name, status, meeting_date, meeting_date_formatted):
+    """Log an attendance_marked activity for a single member"""
+    if status == 'clear':
+        description = f'Cleared attendance for {member_name} for {meeting_date}'
+        details = {'member_id': member_id, 'meeting_date': meeting_date_formatted}
+    else:
+        description = f'Marked {member_name} as {status} for {meeting_date}'
+        details = {'member_id': member_id, 'meeting_date': meeting_date_formatted, 'status': status}
+    try:
+        log_activity(
+            leader_id=leader_id,
+            user_id=leader_id,
+            activity_type='attendance_marked',
+            description=description,
+            user_role='leader',
+            user_name=session['user'].get('name', 'Leader'),
+            source='cell_app',
+            platform='web',
+            details=details
+        )
+    except Exception as log_error:
+        logger.error(f"Error logging activity: {log_error}")
+
 @main_bp.route('/update_attendance/<meeting_date>', methods=['POST'])
 @login_required
 def update_attendance(meeting_date):
@@ -994,12 +918,6 @@ def update_attendance(meeting_date):
         # Get leader ID - use user ID directly
         leader_id = session['user']['id']
         
-        # AUTHORIZATION CHECK: Verify member belongs to this leader
-        member_check = validate_ownership(supabase, 'cell_members', member_id, 'leader_id')
-        if not member_check:
-            logger.warning(f"Unauthorized attendance update: user={leader_id}, member={member_id}")
-            return jsonify({'success': False, 'message': 'Unauthorized access'}), 403
-        
         # Convert meeting_date string to proper date format
         from datetime import datetime
         try:
@@ -1024,48 +942,59 @@ def update_attendance(meeting_date):
                     'message': f'Attendance can only be marked until {deadline_str}. This week\'s attendance is now closed.'
                 }), 403
         
+        # Ownership, eligibility and the write in one round trip
+        if parsed_date:
+            rpc_result = mark_attendance_rpc(leader_id, member_id, parsed_date, status)
+            if rpc_result is not None:
+                code = rpc_result.get('code')
+                member_name = rpc_result.get('member_name') or 'Unknown'
+                if code == 'ok':
+                    log_attendance_change(leader_id, member_id, member_name, status, meeting_date, meeting_date_formatted)
+                    if status == 'clear':
+                        return jsonify({'success': True, 'message': f'Attendance cleared for {member_name}'})
+                    return jsonify({'success': True, 'message': f'{member_name} marked as {status}'})
+                if code == 'not_found':
+                    logger.warning(f"Unauthorized attendance update: user={leader_id}, member={member_id}")
+                    return jsonify({'success': False, 'message': 'Unauthorized access'}), 403
+                if code == 'created_after':
+                    return jsonify({'success': False, 'message': f'Cannot mark attendance: This member was created after the meeting date ({meeting_date})'}), 403
+                if code == 'no_record':
+                    return jsonify({'success': False, 'message': 'No attendance record to clear'}), 400
+                if code == 'no_meeting':
+                    return jsonify({'success': False, 'message': 'Meeting not found. Cannot mark attendance.'}), 400
+                return jsonify({'success': False, 'message': 'Missing or invalid data'}), 400
+        
+        # AUTHORIZATION CHECK: Verify member belongs to this leader
+        member_check = validate_ownership(supabase, 'cell_members', member_id, 'leader_id')
+        if not member_check:
+            logger.warning(f"Unauthorized attendance update: user={leader_id}, member={member_id}")
+            return jsonify({'success': False, 'message': 'Unauthorized access'}), 403
+        
         # Get member info and validate it was created on or before meeting date
         try:
-            member_result = supabase.table('cell_members').select('name, created_at').eq('id', member_id).eq('leader_id', leader_id).execute()
-            if not member_result.data or len(member_result.data) == 0:
+            # Reuse the row loaded by the ownership check when it is already known
+            member = get_data_context().get('cell_members', member_id, ('name', 'created_at'))
+            if member is None:
+                member = fetch_one(supabase.table('cell_members').select('name, created_at').eq('id', member_id).eq('leader_id', leader_id))
+            if not member:
                 return jsonify({'success': False, 'message': 'Member not found'}), 404
             
-            member = member_result.data[0]
-            member_name = member.get('name', 'Unknown')
-            member_created_at = member.get('created_at')
+            member = Member.from_row(member)
+            member_name = member.get('name') or 'Unknown'
             
             # Validate member was created on or before meeting date
-            if parsed_date and member_created_at:
-                try:
-                    # Parse member's created_at
-                    if isinstance(member_created_at, str):
-                        try:
-                            member_created = datetime.fromisoformat(member_created_at.replace('Z', '+00:00')).date()
-                        except ValueError:
-                            try:
-                                member_created = datetime.strptime(member_created_at, "%Y-%m-%dT%H:%M:%S.%f").date()
-                            except ValueError:
-                                member_created = datetime.strptime(member_created_at.split('T')[0], "%Y-%m-%d").date()
-                    else:
-                        member_created = member_created_at.date() if hasattr(member_created_at, 'date') else member_created_at
-                    
-                    # Check if member was created after meeting date
-                    if member_created > parsed_date:
-                        return jsonify({'success': False, 'message': f'Cannot mark attendance: This member was created after the meeting date ({meeting_date})'}), 403
-                except Exception as date_error:
-                    print(f"Error validating member created_at: {date_error}, allowing update")
+            if member.created_after(parsed_date):
+                return jsonify({'success': False, 'message': f'Cannot mark attendance: This member was created after the meeting date ({meeting_date})'}), 403
         except Exception as e:
-            print(f"Error fetching member info: {e}")
+            logger.error(f"Error fetching member info: {e}")
             return jsonify({'success': False, 'message': 'Error fetching member information'}), 500
         
         # Get meeting_number from meetings table based on meeting_date
         meeting_number = None
         try:
-            meeting_result = supabase.table('meetings').select('meeting_number').eq('meeting_date', meeting_date_formatted).limit(1).execute()
-            if meeting_result.data and len(meeting_result.data) > 0:
-                meeting_number = meeting_result.data[0].get('meeting_number')
+            meeting_number = meetings_calendar.get_meeting_number(supabase, meeting_date_formatted)
         except Exception as e:
-            print(f"Error fetching meeting_number: {e}")
+            logger.error(f"Error fetching meeting_number: {e}")
             # If meeting not found, try to get the latest meeting number or use a default
             # For now, we'll let it fail if meeting_number is required
         
@@ -1073,32 +1002,19 @@ def update_attendance(meeting_date):
         if status == 'clear':
             # Delete existing attendance record
             try:
-                existing_result = supabase.table('attendance').select('id').eq('leader_id', leader_id).eq('member_id', member_id).eq('meeting_date', meeting_date_formatted).execute()
-                if existing_result.data and len(existing_result.data) > 0:
-                    result = supabase.table('attendance').delete().eq('id', existing_result.data[0]['id']).execute()
+                existing_row = fetch_one(supabase.table('attendance').select('id').eq('leader_id', leader_id).eq('member_id', member_id).eq('meeting_date', meeting_date_formatted))
+                if existing_row:
+                    result = supabase.table('attendance').delete().eq('id', existing_row['id']).execute()
+                    invalidate('attendance')
                     # Delete operations in Supabase return the deleted record or empty list
                     # If no error was raised, the delete was successful
-                    # Log activity
-                    try:
-                        log_activity(
-                            leader_id=leader_id,
-                            user_id=leader_id,
-                            activity_type='attendance_marked',
-                            description=f'Cleared attendance for {member_name} for {meeting_date}',
-                            user_role='leader',
-                            user_name=session['user'].get('name', 'Leader'),
-                            source='cell_app',
-                            platform='web',
-                            details={'member_id': member_id, 'meeting_date': meeting_date_formatted}
-                        )
-                    except Exception as log_error:
-                        print(f"Error logging activity: {log_error}")
+                    log_attendance_change(leader_id, member_id, member_name, status, meeting_date, meeting_date_formatted)
                     
                     return jsonify({'success': True, 'message': f'Attendance cleared for {member_name}'})
                 else:
                     return jsonify({'success': False, 'message': 'No attendance record to clear'}), 400
             except Exception as delete_error:
-                print(f"Error deleting attendance: {delete_error}")
+                logger.error(f"Error deleting attendance: {delete_error}")
                 return jsonify({'success': False, 'message': 'Error clearing attendance'}), 500
         else:
             # Insert or update attendance record
@@ -1115,46 +1031,86 @@ def update_attendance(meeting_date):
             }
             
             # Check if record exists
-            existing_result = supabase.table('attendance').select('id').eq('leader_id', leader_id).eq('member_id', member_id).eq('meeting_date', meeting_date_formatted).execute()
+            existing_row = fetch_one(supabase.table('attendance').select('id').eq('leader_id', leader_id).eq('member_id', member_id).eq('meeting_date', meeting_date_formatted))
             
-            if existing_result.data and len(existing_result.data) > 0:
+            if existing_row:
                 # Update existing record
                 result = supabase.table('attendance').update({
                     'status': status,
                     'meeting_number': meeting_number  # Update meeting_number in case it changed
-                }).eq('id', existing_result.data[0]['id']).execute()
+                }).eq('id', existing_row['id']).execute()
             else:
                 # Insert new record
                 result = supabase.table('attendance').insert(attendance_data).execute()
+            invalidate('attendance')
             
             if result.data and len(result.data) > 0:
-                # Log activity
-                try:
-                    log_activity(
-                        leader_id=leader_id,
-                        user_id=leader_id,
-                        activity_type='attendance_marked',
-                        description=f'Marked {member_name} as {status} for {meeting_date}',
-                        user_role='leader',
-                        user_name=session['user'].get('name', 'Leader'),
-                        source='cell_app',
-                        platform='web',
-                        details={'member_id': member_id, 'meeting_date': meeting_date_formatted, 'status': status}
-                    )
-                except Exception as log_error:
-                    print(f"Error logging activity: {log_error}")
+                log_attendance_change(leader_id, member_id, member_name, status, meeting_date, meeting_date_formatted)
                 
                 return jsonify({'success': True, 'message': f'{member_name} marked as {status}'})
             else:
-                print(f"Error: No data returned from attendance insert/update. Result: {result}")
+                logger.error(f"Error: No data returned from attendance insert/update. Result: {result}")
                 return jsonify({'success': False, 'message': 'Error saving attendance. Please try again.'}), 500
         
     except Exception as e:
-        print(f"Error updating attendance: {e}")
+        logger.error(f"Error updating attendance: {e}")
         import traceback
         traceback.print_exc()
         return jsonify({'success': False, 'message': f'Error updating attendance: {str(e)}'}), 500
 
+def write_attendance_rows(leader_id, meeting_date_formatted, rows):
+    """
+    Write attendance rows for one meeting date, batched
+    
+    Uses a single upsert on (leader_id, member_id, meeting_date) when
+    database/migrations/add_attendance_unique_constraint.sql is installed,
+    otherwise one select of the existing records, one insert for the new ones
+    and one update per status for the rest
+    
+    Returns:
+        set: member_ids whose record was written
+    """
+    if ATTENDANCE_CONFLICT_TARGET not in missing_conflict_targets:
+        try:
+            result = supabase.table('attendance')\
+                .upsert(rows, on_conflict=ATTENDANCE_CONFLICT_TARGET)\
+                .execute()
+            return {str(row.get('member_id')) for row in (result.data or [])}
+        except Exception as e:
+            if not conflict_target_missing(e):
+                raise
+            missing_conflict_targets.add(ATTENDANCE_CONFLICT_TARGET)
+            logger.warning("attendance has no unique constraint on (leader_id, member_id, meeting_date), "
+                           "using select + insert/update from now on")
+    
+    existing = fetch(supabase.table('attendance')
+                     .select('id, member_id')
+                     .eq('leader_id', leader_id)
+                     .eq('meeting_date', meeting_date_formatted)
+                     .in_('member_id', [row['member_id'] for row in rows]))
+    existing_ids = {}
+    for record in Attendance.from_rows(existing):
+        existing_ids.setdefault(str(record.member_id), []).append(record.id)
+    
+    written = set()
+    new_rows = [row for row in rows if row['member_id'] not in existing_ids]
+    if new_rows:
+        result = supabase.table('attendance').insert(new_rows).execute()
+        written.update(str(row.get('member_id')) for row in (result.data or []))
+    
+    # Existing records grouped by the values they are set to
+    updates = {}
+    for row in rows:
+        if row['member_id'] in existing_ids:
+            updates.setdefault((row['status'], row['meeting_number']), []).extend(existing_ids[row['member_id']])
+    for (status, meeting_number), record_ids in updates.items():
+        result = supabase.table('attendance').update({
+            'status': status,
+            'meeting_number': meeting_number
+        }).in_('id', record_ids).execute()
+        written.update(str(row.get('member_id')) for row in (result.data or []))
+    return written
+
 @main_bp.route('/bulk_update_attendance/<meeting_date>', methods=['POST'])
 def bulk_update_attendance(meeting_date):
     """Bulk update attendance for multiple members at once"""
@@ -1198,86 +1154,73 @@ def bulk_update_attendance(meeting_date):
         # Get meeting_number from meetings table
         meeting_number = None
         try:
-            meeting_result = supabase.table('meetings').select('meeting_number').eq('meeting_date', meeting_date_formatted).limit(1).execute()
-            if meeting_result.data and len(meeting_result.data) > 0:
-                meeting_number = meeting_result.data[0].get('meeting_number')
+            meeting_number = meetings_calendar.get_meeting_number(supabase, meeting_date_formatted)
         except Exception as e:
-            print(f"Error fetching meeting_number: {e}")
+            logger.error(f"Error fetching meeting_number: {e}")
         
         if meeting_number is None:
             return jsonify({'success': False, 'message': 'Meeting not found. Cannot mark attendance.'}), 400
         
-        # Process each attendance record
+        # Process the whole payload with one roster fetch and set operations
         success_count = 0
         error_count = 0
         errors = []
         
+        # Member id -> created_at for this leader's roster
+        roster = fetch_all(lambda: supabase.table('cell_members')
+                           .select('id, created_at')
+                           .eq('leader_id', leader_id)
+                           .order('id'))
+        roster_members = {str(member.id): member for member in Member.from_rows(roster)}
+        
+        # Last status wins if a member appears more than once in the payload
+        requested = {}
         for attendance_item in attendance_list:
             member_id = attendance_item.get('member_id')
-            status = attendance_item.get('status')  # 'present' or 'absent'
+            status = validate_status(attendance_item.get('status'), ['present', 'absent'])
             
             if not member_id or not status:
                 error_count += 1
                 continue
+            requested[str(member_id)] = status
+        
+        # Members that don't belong to this leader
+        for member_id in requested.keys() - roster_members.keys():
+            error_count += 1
+            errors.append(f"Member {member_id}: Not found")
+        
+        rows_to_write = []
+        for member_id in sorted(requested.keys() & roster_members.keys()):
+            # Skip members created after meeting date
+            if roster_members[member_id].created_after(parsed_date):
+                error_count += 1
+                errors.append(f"Member {member_id}: Created after meeting date")
+                continue
             
-            # Validate member was created on or before meeting date
-            if parsed_date:
-                try:
-                    member_result = supabase.table('cell_members').select('created_at').eq('id', member_id).eq('leader_id', leader_id).execute()
-                    if member_result.data and len(member_result.data) > 0:
-                        member_created_at = member_result.data[0].get('created_at')
-                        if member_created_at:
-                            # Parse member's created_at
-                            if isinstance(member_created_at, str):
-                                try:
-                                    member_created = datetime.fromisoformat(member_created_at.replace('Z', '+00:00')).date()
-                                except ValueError:
-                                    try:
-                                        member_created = datetime.strptime(member_created_at, "%Y-%m-%dT%H:%M:%S.%f").date()
-                                    except ValueError:
-                                        member_created = datetime.strptime(member_created_at.split('T')[0], "%Y-%m-%d").date()
-                            else:
-                                member_created = member_created_at.date() if hasattr(member_created_at, 'date') else member_created_at
-                            
-                            # Skip members created after meeting date
-                            if member_created > parsed_date:
-                                error_count += 1
-                                errors.append(f"Member {member_id}: Created after meeting date")
-                                continue
-                except Exception as validation_error:
-                    print(f"Error validating member {member_id}: {validation_error}, allowing update")
-            
+            rows_to_write.append({
+                'leader_id': leader_id,
+                'member_id': member_id,
+                'meeting_date': meeting_date_formatted,
+                'meeting_number': meeting_number,
+                'status': requested[member_id]
+            })
+        
+        if rows_to_write:
             try:
-                # Check if record exists
-                existing_result = supabase.table('attendance').select('id').eq('leader_id', leader_id).eq('member_id', member_id).eq('meeting_date', meeting_date_formatted).execute()
-                
-                attendance_data = {
-                    'leader_id': leader_id,
-                    'member_id': member_id,
-                    'meeting_date': meeting_date_formatted,
-                    'meeting_number': meeting_number,
-                    'status': status
-                }
-                
-                if existing_result.data and len(existing_result.data) > 0:
-                    # Update existing record
-                    result = supabase.table('attendance').update({
-                        'status': status,
-                        'meeting_number': meeting_number
-                    }).eq('id', existing_result.data[0]['id']).execute()
-                else:
-                    # Insert new record
-                    result = supabase.table('attendance').insert(attendance_data).execute()
-                
-                if result.data and len(result.data) > 0:
-                    success_count += 1
-                else:
-                    error_count += 1
-                    errors.append(f"Member {member_id}")
+                written = write_attendance_rows(leader_id, meeting_date_formatted, rows_to_write)
+                for row in rows_to_write:
+                    if row['member_id'] in written:
+                        success_count += 1
+                    else:
+                        error_count += 1
+                        errors.append(f"Member {row['member_id']}")
             except Exception as e:
-                error_count += 1
-                errors.append(f"Member {member_id}: {str(e)}")
-                print(f"Error updating attendance for member {member_id}: {e}")
+                logger.error(f"Error bulk upserting attendance: {e}")
+                for row in rows_to_write:
+                    error_count += 1
+                    errors.append(f"Member {row['member_id']}: {str(e)}")
+        
+        invalidate('attendance')
         
         # Log activity
         try:
@@ -1293,7 +1236,7 @@ def bulk_update_attendance(meeting_date):
                 details={'meeting_date': meeting_date_formatted, 'success_count': success_count, 'error_count': error_count}
             )
         except Exception as log_error:
-            print(f"Error logging activity: {log_error}")
+            logger.error(f"Error logging activity: {log_error}")
         
         if error_count == 0:
             return jsonify({'success': True, 'message': f'Successfully updated attendance for {success_count} members'})
@@ -1305,7 +1248,7 @@ def bulk_update_attendance(meeting_date):
             })
         
     except Exception as e:
-        print(f"Error in bulk_update_attendance: {e}")
+        logger.error(f"Error in bulk_update_attendance: {e}")
         import traceback
         traceback.print_exc()
         return jsonify({'success': False, 'message': f'Error updating attendance: {str(e)}'}), 500
@@ -1320,14 +1263,13 @@ def members():
         leader_id = session['user']['id']
         
         # Get members for this specific leader
-        result = supabase.table('cell_members').select('*').eq('leader_id', leader_id).execute()
-        members = result.data if result.data else []
+        members = Member.from_rows(fetch(supabase.table('cell_members').select('*').eq('leader_id', leader_id)))
         
         template_name = f'main/members{get_template_suffix()}.html'
         return render_template(template_name, members=members, user=session['user'])
     except Exception as e:
         error_msg = str(e)
-        print(f"Error in members route: {error_msg}")  # Enhanced logging
+        logger.error(f"Error in members route: {error_msg}")  # Enhanced logging
         
         if "relation" in error_msg.lower() and "does not exist" in error_msg.lower():
             flash('Database table not found. Please run the database migration first.', 'error')
@@ -1346,30 +1288,20 @@ def member_form():
     if 'user' not in session:
         return redirect(url_for('auth.login'))
     
-    # Get leader's branch_id and country for autofill
+    # Get leader's branch_id and country for autofill (fresh: they can change in the portal)
     leader_id = session['user']['id']
-    leader_branch_id = None
-    leader_country = None
-    
-    try:
-        # Fetch leader's branch_id and country from users table
-        user_result = supabase.table('users').select('branch_id, country').eq('id', leader_id).execute()
-        if user_result.data and len(user_result.data) > 0:
-            leader_branch_id = user_result.data[0].get('branch_id')
-            leader_country = user_result.data[0].get('country')
-    except Exception as e:
-        print(f"Error fetching leader's branch_id and country: {e}")
+    leader = refresh_leader_context(supabase) or {}
+    leader_branch_id = leader.get('branch_id')
+    leader_country = leader.get('country')
     
     # Check if editing an existing member
     member_id = request.args.get('edit')
     member = None
     if member_id:
         try:
-            result = supabase.table('cell_members').select('*').eq('id', member_id).eq('leader_id', leader_id).execute()
-            if result.data:
-                member = result.data[0]
+            member = fetch_one(supabase.table('cell_members').select('*').eq('id', member_id).eq('leader_id', leader_id))
         except Exception as e:
-            print(f"Error loading member for edit: {e}")
+            logger.error(f"Error loading member for edit: {e}")
     
     template_name = f'main/member_form{get_template_suffix()}.html'
     return render_template(template_name, 
@@ -1389,17 +1321,16 @@ def member_details(member_id):
         leader_id = session['user']['id']
         
         # Get member with leader filter
-        result = supabase.table('cell_members').select('*').eq('id', member_id).eq('leader_id', leader_id).execute()
+        member = Member.from_row(fetch_one(supabase.table('cell_members').select('*').eq('id', member_id).eq('leader_id', leader_id)))
         
-        if result.data:
-            member = result.data[0]
+        if member:
             template_name = f'main/member_details{get_template_suffix()}.html'
             return render_template(template_name, member=member, user=session['user'])
         else:
             flash('Member not found', 'error')
             return redirect(url_for('main.members'))
     except Exception as e:
-        print(f"Error loading member details: {e}")
+        logger.error(f"Error loading member details: {e}")
         flash(f'Error loading member details: {str(e)}', 'error')
         return redirect(url_for('main.members'))
 @main_bp.route('/add_member', methods=['POST'])
@@ -1428,15 +1359,9 @@ def add_member():
     # If there are validation errors, return to form with errors
     if form_errors:
         leader_id = session['user']['id']
-        leader_branch_id = None
-        leader_country = None
-        try:
-            user_result = supabase.table('users').select('branch_id, country').eq('id', leader_id).execute()
-            if user_result.data and len(user_result.data) > 0:
-                leader_branch_id = user_result.data[0].get('branch_id')
-                leader_country = user_result.data[0].get('country')
-        except Exception as e:
-            logger.error(f"Error fetching leader info: {str(e)}")
+        leader = get_leader_context(supabase) or {}
+        leader_branch_id = leader.get('branch_id')
+        leader_country = leader.get('country')
         
         template_name = f'main/member_form{get_template_suffix()}.html'
         return render_template(template_name, 
@@ -1449,15 +1374,9 @@ def add_member():
         leader_id = session['user']['id']
         
         # Get leader's branch_id and country for autofill
-        leader_branch_id = None
-        leader_country = None
-        try:
-            user_result = supabase.table('users').select('branch_id, country').eq('id', leader_id).execute()
-            if user_result.data and len(user_result.data) > 0:
-                leader_branch_id = user_result.data[0].get('branch_id')
-                leader_country = user_result.data[0].get('country')
-        except Exception as e:
-            logger.error(f"Error fetching leader info: {str(e)}")
+        leader = refresh_leader_context(supabase) or {}
+        leader_branch_id = leader.get('branch_id')
+        leader_country = leader.get('country')
         
         # Get form values or use leader's values for autofill
         country = request.form.get('country') or leader_country
@@ -1481,6 +1400,7 @@ def add_member():
         
         # Insert into database
         result = supabase.table('cell_members').insert(member_data).execute()
+        invalidate('cell_members')
         
         if result.data:
             # Log activity
@@ -1512,15 +1432,9 @@ def add_member():
         flash('An error occurred while adding the member', 'error')
         error_msg = str(e)
         leader_id = session['user']['id']
-        leader_branch_id = None
-        leader_country = None
-        try:
-            user_result = supabase.table('users').select('branch_id, country').eq('id', leader_id).execute()
-            if user_result.data and len(user_result.data) > 0:
-                leader_branch_id = user_result.data[0].get('branch_id')
-                leader_country = user_result.data[0].get('country')
-        except Exception as e:
-            logger.error(f"Error fetching leader info: {str(e)}")
+        leader = get_leader_context(supabase) or {}
+        leader_branch_id = leader.get('branch_id')
+        leader_country = leader.get('country')
         
         template_name = f'main/member_form{get_template_suffix()}.html'
         return render_template(template_name, 
@@ -1551,15 +1465,9 @@ def update_member(member_id):
         phone_number = validate_phone_number(request.form.get('phone_number')) if request.form.get('phone_number') else None
         
         # Get leader's branch_id and country for autofill
-        leader_branch_id = None
-        leader_country = None
-        try:
-            user_result = supabase.table('users').select('branch_id, country').eq('id', leader_id).execute()
-            if user_result.data and len(user_result.data) > 0:
-                leader_branch_id = user_result.data[0].get('branch_id')
-                leader_country = user_result.data[0].get('country')
-        except Exception as e:
-            logger.error(f"Error fetching leader info: {str(e)}")
+        leader = refresh_leader_context(supabase) or {}
+        leader_branch_id = leader.get('branch_id')
+        leader_country = leader.get('country')
         
         # Get form values or use leader's values for autofill
         country = request.form.get('country') or leader_country
@@ -1581,6 +1489,7 @@ def update_member(member_id):
         
         # UPDATE with ownership check
         result = supabase.table('cell_members').update(member_data).eq('id', member_id).eq('leader_id', leader_id).execute()
+        invalidate('cell_members')
         
         if result.data:
             log_activity(
@@ -1621,6 +1530,7 @@ def delete_member(member_id):
         
         # DELETE with ownership check
         result = supabase.table('cell_members').delete().eq('id', member_id).eq('leader_id', leader_id).execute()
+        invalidate('cell_members')
         
         if result.data:
             log_activity(
@@ -1665,12 +1575,7 @@ def meeting_tutorials(meeting_date):
         
         # Look for tutorial for this specific meeting date
         # Note: tutorials table doesn't have leader_id column, so we query by meeting_date only
-        tutorial_result = supabase.table('tutorials')\
-            .select('*')\
-            .eq('meeting_date', meeting_date_formatted)\
-            .execute()
-        
-        tutorials = tutorial_result.data if tutorial_result.data else []
+        tutorials = tutorial_cache.get(supabase, meeting_date_formatted)
         
         # Check if this is the next meeting date (use corrected tutorial logic)
         next_meeting_date = get_tutorial_meeting_date_corrected()
@@ -1685,7 +1590,7 @@ def meeting_tutorials(meeting_date):
                              no_tutorial_uploaded=len(tutorials) == 0)
                                  
     except Exception as e:
-        print(f"Error fetching tutorials: {e}")
+        logger.error(f"Error fetching tutorials: {e}")
         flash('Error loading tutorials', 'error')
         return redirect(url_for('main.index'))
 @main_bp.route('/upload-tutorial/<meeting_date>', methods=['POST'])
@@ -1717,6 +1622,8 @@ def upload_tutorial(meeting_date):
             'uploaded_at': datetime.now().isoformat()
         }
         result = supabase.table('tutorials').insert(tutorial_data).execute()
+        invalidate('tutorials')
+        tutorial_cache.invalidate(meeting_date_formatted)
         if result.data:
             # Log tutorial upload activity
             log_activity(
@@ -1739,7 +1646,7 @@ def upload_tutorial(meeting_date):
             flash('Error uploading tutorial', 'error')
         return redirect(url_for('main.meeting_tutorials', meeting_date=meeting_date))
     except Exception as e:
-        print(f"Error uploading tutorial: {e}")
+        logger.error(f"Error uploading tutorial: {e}")
         flash('Error uploading tutorial', 'error')
         return redirect(url_for('main.meeting_tutorials', meeting_date=meeting_date))
 
@@ -1761,18 +1668,13 @@ def tutorials_list():
         tutorial_list = []
         try:
             # Get user's created date to filter meetings
-            user_created_date = get_user_created_date(leader_id)
+            user_created_date = get_leader_created_date(supabase)
             
-            # Get ALL meetings from meetings table (no limit yet), filtered by user's creation date
-            query = supabase.table('meetings').select('*')
-            if user_created_date:
-                query = query.gte('meeting_date', user_created_date.isoformat())
-            meetings_result = query\
-                .order('meeting_date', desc=True)\
-                .execute()
+            # Get ALL meetings from the calendar (no limit yet), filtered by user's creation date
+            meetings_rows = meetings_calendar.meetings_since(supabase, user_created_date)
             
-            if not meetings_result.data:
-                print("No meetings found in database for tutorials")
+            if not meetings_rows:
+                logger.info("No meetings found in database for tutorials")
                 template_name = f'main/tutorials_list{get_template_suffix()}.html'
                 return render_template(template_name,
                                      tutorial_list=[],
@@ -1780,43 +1682,26 @@ def tutorials_list():
             
             today = datetime.now().date()
             
+            # Fetch tutorials for every listed meeting in one batched query
+            tutorials_by_date = tutorial_cache.get_many(supabase, (meeting.date for meeting in meetings_rows))
+            
             # Process each meeting from the meetings table
-            for meeting in meetings_result.data:
-                meeting_date = meeting.get('meeting_date')
-                if not meeting_date:
-                    continue
+            for meeting in meetings_rows:
+                meeting_date = meeting.meeting_date
+                parsed_date = meeting.date
                 
-                # Parse meeting date
                 try:
-                    if isinstance(meeting_date, str):
-                        try:
-                            parsed_date = datetime.strptime(meeting_date, "%Y-%m-%d").date()
-                        except ValueError:
-                            try:
-                                parsed_date = datetime.strptime(meeting_date, "%Y-%m-%dT%H:%M:%S").date()
-                            except ValueError:
-                                parsed_date = datetime.strptime(meeting_date.split('T')[0], "%Y-%m-%d").date()
-                    else:
-                        parsed_date = meeting_date
-                    
-                    # Additional safety check: skip meetings before user creation
-                    if user_created_date and parsed_date < user_created_date:
-                        continue
-                    
                     meeting_date_iso = parsed_date.isoformat()
                     
                     # Check for tutorial for this meeting date
-                    tutorial_result = supabase.table('tutorials')\
-                        .select('*')\
-                        .eq('meeting_date', meeting_date_iso)\
-                        .execute()
+                    tutorial_rows = tutorials_by_date.get(meeting_date_iso, [])
                     
-                    has_tutorial = len(tutorial_result.data) > 0 if tutorial_result.data else False
+                    has_tutorial = len(tutorial_rows) > 0
                     is_placeholder_tutorial = False
                     tutorial_record = None
                     
-                    if has_tutorial and tutorial_result.data:
-                        tutorial_record = tutorial_result.data[0]
+                    if has_tutorial:
+                        tutorial_record = tutorial_rows[0]
                         # Check if it's a placeholder (check title field instead of tutorial_name)
                         is_placeholder_tutorial = tutorial_record.get('title') == 'No Tutorial Uploaded' or tutorial_record.get('title') == ''
                     
@@ -1835,14 +1720,14 @@ def tutorials_list():
                         'sort_date': parsed_date  # Add sort_date for sorting
                     })
                 except Exception as date_error:
-                    print(f"Error parsing meeting date {meeting_date}: {date_error}")
+                    logger.error(f"Error parsing meeting date {meeting_date}: {date_error}")
                     continue
             
             # Sort tutorials: upcoming first, then past tutorials (most recent first)
             tutorial_list.sort(key=lambda x: (not x['is_upcoming'], -x['sort_date'].toordinal()))
             
         except Exception as e:
-            print(f"Error fetching tutorial list: {e}")
+            logger.error(f"Error fetching tutorial list: {e}")
             import traceback
             traceback.print_exc()
             tutorial_list = []
@@ -1870,7 +1755,7 @@ def tutorials_list():
                              total_tutorials=total_tutorials,
                              user=session['user'])
     except Exception as e:
-        print(f"Error fetching tutorials list: {e}")
+        logger.error(f"Error fetching tutorials list: {e}")
         import traceback
         traceback.print_exc()
         flash('Error loading tutorials list', 'error')
@@ -1891,109 +1776,48 @@ def attendance_list():
         leader_id = session['user']['id']
         
         # Get user's created date to filter meetings
-        user_created_date = get_user_created_date(leader_id)
+        user_created_date = get_leader_created_date(supabase)
         
-        # Get ALL meetings from meetings table, filtered by user's creation date
-        query = supabase.table('meetings').select('*')
-        if user_created_date:
-            query = query.gte('meeting_date', user_created_date.isoformat())
+        # The calendar (if stale), the roster and the attendance since the leader's
+        # creation don't depend on each other: load all three at once
+        queries = QueryFanOut()
+        queries.submit('calendar', meetings_calendar.preload, supabase)
+        submit_attendance_queries(queries, supabase, leader_id, user_created_date)
         
-        meetings_result = query\
-            .order('meeting_date', desc=True)\
-            .execute()
+        # Get ALL meetings from the calendar, filtered by user's creation date
+        queries.result('calendar')
+        meetings_rows = meetings_calendar.meetings_since(supabase, user_created_date)
+        
+        # Meeting dates are parsed once by the calendar
+        meeting_dates_list = [meeting.date for meeting in meetings_rows]
+        
+        # Aggregate attendance for every meeting from the roster and attendance reads above
+        # Only members created on or before each meeting date are counted
+        attendance_summary = summarize_attendance(supabase, leader_id, meeting_dates_list, queries)
         
         unmarked_list = []
         marked_list = []
-        
-        if meetings_result.data:
-            for meeting in meetings_result.data:
-                meeting_date = meeting.get('meeting_date')
-                if not meeting_date:
-                    continue
-                
-                try:
-                    # Parse meeting date
-                    if isinstance(meeting_date, str):
-                        try:
-                            parsed_date = datetime.strptime(meeting_date, "%Y-%m-%d").date()
-                        except ValueError:
-                            try:
-                                parsed_date = datetime.strptime(meeting_date, "%Y-%m-%dT%H:%M:%S").date()
-                            except ValueError:
-                                parsed_date = datetime.strptime(meeting_date.split('T')[0], "%Y-%m-%d").date()
-                    else:
-                        parsed_date = meeting_date
-                    
-                    # Skip meetings before user creation
-                    if user_created_date and parsed_date < user_created_date:
-                        continue
-                    
-                    meeting_date_str = parsed_date.strftime("%B %d, %Y")
-                    meeting_date_iso = parsed_date.isoformat()
-                    
-                    # Get members for this meeting date (only those created on or before this meeting)
-                    meeting_members_query = supabase.table('cell_members').select('id').eq('leader_id', leader_id)
-                    meeting_members_query = meeting_members_query.lte('created_at', meeting_date_iso)
-                    meeting_members_result = meeting_members_query.execute()
-                    meeting_member_ids = [member['id'] for member in meeting_members_result.data] if meeting_members_result.data else []
-                    meeting_total_members = len(meeting_member_ids)
-                    
-                    # Get attendance records for this meeting
-                    week_attendance_count = 0
-                    present_count = 0
-                    absent_count = 0
-                    
-                    if meeting_member_ids:
-                        week_attendance_result = supabase.table('attendance')\
-                            .select('*')\
-                            .eq('leader_id', leader_id)\
-                            .eq('meeting_date', meeting_date_iso)\
-                            .in_('member_id', meeting_member_ids)\
-                            .execute()
-                        
-                        week_attendance_count = len(week_attendance_result.data) if week_attendance_result.data else 0
-                        
-                        # Count present/absent
-                        if week_attendance_result.data:
-                            for record in week_attendance_result.data:
-                                if record.get('status') == 'present':
-                                    present_count += 1
-                                elif record.get('status') == 'absent':
-                                    absent_count += 1
-                    
-                    # Determine status for this meeting
-                    if meeting_total_members > 0 and week_attendance_count == meeting_total_members:
-                        week_status = 'complete'
-                    elif week_attendance_count > 0:
-                        week_status = 'partial'
-                    else:
-                        week_status = 'incomplete'
-                    
-                    # Check if this is an upcoming meeting
-                    today = datetime.now().date()
-                    is_upcoming = parsed_date > today
-                    
-                    attendance_item = {
-                        'date': meeting_date_str,
-                        'date_iso': meeting_date_iso,
-                        'date_obj': parsed_date,
-                        'status': week_status,
-                        'count': week_attendance_count,
-                        'total': meeting_total_members,
-                        'present_count': present_count,
-                        'absent_count': absent_count,
-                        'is_upcoming': is_upcoming
-                    }
-                    
-                    # Separate into marked (complete) and unmarked (incomplete/partial)
-                    if week_status == 'complete':
-                        marked_list.append(attendance_item)
-                    else:
-                        unmarked_list.append(attendance_item)
-                        
-                except Exception as date_error:
-                    print(f"Error parsing meeting date {meeting_date}: {date_error}")
-                    continue
+        today = datetime.now().date()
+        
+        for parsed_date in meeting_dates_list:
+            meeting_summary = attendance_summary[parsed_date.isoformat()]
+            attendance_item = {
+                'date': parsed_date.strftime("%B %d, %Y"),
+                'date_iso': parsed_date.isoformat(),
+                'date_obj': parsed_date,
+                'status': meeting_summary['status'],
+                'count': meeting_summary['count'],
+                'total': meeting_summary['total'],
+                'present_count': meeting_summary['present_count'],
+                'absent_count': meeting_summary['absent_count'],
+                'is_upcoming': parsed_date > today
+            }
+            
+            # Separate into marked (complete) and unmarked (incomplete/partial)
+            if meeting_summary['status'] == 'complete':
+                marked_list.append(attendance_item)
+            else:
+                unmarked_list.append(attendance_item)
         
         # Sort: unmarked by date (most recent first), marked by date (most recent first)
         unmarked_list.sort(key=lambda x: x.get('date_obj', datetime.now().date()), reverse=True)
@@ -2024,7 +1848,7 @@ def attendance_list():
                              total_marked=total_marked,
                              user=session['user'])
     except Exception as e:
-        print(f"Error fetching attendance list: {e}")
+        logger.error(f"Error fetching attendance list: {e}")
         import traceback
         traceback.print_exc()
         flash('Error loading attendance list', 'error')
@@ -2040,9 +1864,9 @@ def flag_member(member_id):
         leader_id = session['user']['id']
         
         # Verify member belongs to this leader
-        member_result = supabase.table('cell_members').select('*').eq('id', member_id).eq('leader_id', leader_id).execute()
+        member_row = fetch_one(supabase.table('cell_members').select('*').eq('id', member_id).eq('leader_id', leader_id))
         
-        if not member_result.data:
+        if not member_row:
             flash('Member not found or you do not have permission to flag this member', 'error')
             return redirect(url_for('main.member_details', member_id=member_id))
         
@@ -2074,20 +1898,20 @@ def flag_member(member_id):
                     leader_id=leader_id,
                     user_id=leader_id,
                     activity_type='member_flagged',
-                    description=f'Flagged issue for member: {member_result.data[0].get("name", "Unknown")}',
+                    description=f'Flagged issue for member: {member_row.get("name", "Unknown")}',
                     user_role='leader',
                     user_name=session['user'].get('name', 'Leader'),
                     source='cell_app',
                     platform='web',
                     details={
                         'member_id': member_id,
-                        'member_name': member_result.data[0].get('name', 'Unknown'),
+                        'member_name': member_row.get('name', 'Unknown'),
                         'issue_type': issue_type,
                         'flag_id': result.data[0]['id'] if result.data else None
                     }
                 )
             except Exception as e:
-                print(f"Error logging activity: {e}")
+                logger.error(f"Error logging activity: {e}")
             
             flash('Member flagged successfully!', 'success')
         else:
@@ -2096,7 +1920,7 @@ def flag_member(member_id):
         return redirect(url_for('main.member_details', member_id=member_id))
         
     except Exception as e:
-        print(f"Error flagging member: {e}")
+        logger.error(f"Error flagging member: {e}")
         import traceback
         traceback.print_exc()
         flash(f'Error flagging member: {str(e)}', 'error')
@@ -2112,9 +1936,9 @@ def toggle_potential_leader(member_id):
         leader_id = session['user']['id']
         
         # Get current member data to verify ownership
-        member_result = supabase.table('cell_members').select('potential_leader').eq('id', member_id).eq('leader_id', leader_id).execute()
+        member_row = fetch_one(supabase.table('cell_members').select('potential_leader').eq('id', member_id).eq('leader_id', leader_id))
         
-        if not member_result.data or len(member_result.data) == 0:
+        if not member_row:
             return jsonify({'success': False, 'message': 'Member not found or access denied'}), 404
         
         # Get the new potential_leader value from request
@@ -2125,6 +1949,7 @@ def toggle_potential_leader(member_id):
         result = supabase.table('cell_members').update({
             'potential_leader': bool(new_value)
         }).eq('id', member_id).eq('leader_id', leader_id).execute()
+        invalidate('cell_members')
         
         if result.data:
             # Log activity
@@ -2146,7 +1971,7 @@ def toggle_potential_leader(member_id):
                     }
                 )
             except Exception as e:
-                print(f"Error logging activity: {e}")
+                logger.error(f"Error logging activity: {e}")
             
             return jsonify({
                 'success': True,
@@ -2157,7 +1982,7 @@ def toggle_potential_leader(member_id):
             return jsonify({'success': False, 'message': 'Failed to update potential leader status'}), 500
             
     except Exception as e:
-        print(f"Error toggling potential leader: {e}")
+        logger.error(f"Error toggling potential leader: {e}")
         import traceback
         traceback.print_exc()
         return jsonify({'success': False, 'message': f'Error updating status: {str(e)}'}), 500
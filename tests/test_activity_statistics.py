@@ -0,0 +1,54 @@
+"""
+Activity statistics count events, not rows: roll-up counter rows and sampled
+rows must be weighted so enabling a view policy doesn't change the totals
+"""
+
+import itertools
+from datetime import date
+
+import utils.activity_logger as activity_logger
+import utils.attendance_engine as attendance_engine
+
+LEADER_ID = '00000000-0000-0000-0000-000000000001'
+
+
+def _log(activity_type, times):
+    for _ in range(times):
+        assert activity_logger.log_activity(LEADER_ID, LEADER_ID, activity_type, 'test event')
+
+
+def test_statistics_weight_rolled_up_and_sampled_rows(monkeypatch):
+    written = []
+    monkeypatch.setattr(activity_logger, 'supabase', object())
+    monkeypatch.setattr(activity_logger, 'ACTIVITY_LOG_ASYNC', False)
+    monkeypatch.setattr(activity_logger, '_insert_activities', lambda rows: written.extend(rows) or True)
+    monkeypatch.setattr(activity_logger.activity_writer, 'start', lambda: None)
+    monkeypatch.setattr(activity_logger, 'activity_rollup', activity_logger.ActivityRollup())
+    monkeypatch.setattr(activity_logger, '_activity_policies', {
+        'member_viewed': ('rollup', 1.0),
+        'meeting_viewed': ('sample', 0.25),
+    })
+    # One in four sampled events is kept
+    monkeypatch.setattr(activity_logger.random, 'random', itertools.cycle([0.1, 0.5, 0.9, 0.3]).__next__)
+
+    _log('member_viewed', 5)
+    _log('meeting_viewed', 8)
+    _log('member_added', 2)
+    written.extend(activity_logger.activity_rollup.drain())
+    assert len(written) == 1 + 2 + 2
+
+    monkeypatch.setattr(attendance_engine, 'fetch_all', lambda query_factory: written)
+    stats = activity_logger._activity_statistics_from_rows(LEADER_ID, None, None)
+
+    assert stats['total_activities'] == 15
+    assert stats['by_type'] == {'member_viewed': 5, 'meeting_viewed': 8, 'member_added': 2}
+    assert stats['by_date'] == {date.today().isoformat(): 15}
+    assert sum(stats['by_category'].values()) == 15
+
+
+def test_activity_weight():
+    assert activity_logger._activity_weight(None) == 1
+    assert activity_logger._activity_weight({}) == 1
+    assert activity_logger._activity_weight({'rollup': True, 'count': 7}) == 7
+    assert activity_logger._activity_weight({'sample_rate': 0.5}) == 2
+    assert activity_logger._activity_weight({'count': 'x'}) == 1
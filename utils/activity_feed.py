@@ -0,0 +1,119 @@
+"""
+Recent-activity feed per leader
+Each worker keeps the last few activities of recently active leaders in small
+ring buffers: log_activity() pushes new rows in, and a leader whose buffer is
+missing or stale is backfilled from the activities table once
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from flask import current_app, has_app_context
+
+logger = logging.getLogger(__name__)
+
+# Activities kept per leader
+FEED_SIZE = 10
+
+# Leaders kept per worker (least recently used are evicted)
+MAX_LEADERS = 1024
+
+# Default seconds before a buffer is backfilled again (picks up other workers' activities)
+DEFAULT_TTL = 300
+
+
+def _activity_key(activity):
+    """Identity of an activity that is stable before and after it is inserted"""
+    return (activity.get('activity_type'), activity.get('description'),
+            str(activity.get('activity_date')), str(activity.get('activity_time')))
+
+
+def _sort_key(activity):
+    return (str(activity.get('activity_date') or ''), str(activity.get('activity_time') or ''))
+
+
+class RecentActivityFeed:
+    """Bounded ring buffers of recent activities keyed by leader_id"""
+
+    def __init__(self, size=FEED_SIZE, max_leaders=MAX_LEADERS):
+        self.size = size
+        self.max_leaders = max_leaders
+        self._lock = threading.Lock()
+        self._buffers = OrderedDict()  # leader_id -> [loaded_at or None, deque of rows, newest first]
+
+    @staticmethod
+    def _ttl():
+        if has_app_context():
+            return current_app.config.get('RECENT_ACTIVITY_TTL', DEFAULT_TTL)
+        return DEFAULT_TTL
+
+    def _buffer(self, leader_id):
+        """Get or create a leader's buffer and mark it recently used (caller holds the lock)"""
+        entry = self._buffers.get(leader_id)
+        if entry is None:
+            entry = [None, deque(maxlen=self.size)]
+            self._buffers[leader_id] = entry
+            while len(self._buffers) > self.max_leaders:
+                self._buffers.popitem(last=False)
+        else:
+            self._buffers.move_to_end(leader_id)
+        return entry
+
+    def record(self, activity):
+        """Push a newly logged activity row onto its leader's buffer"""
+        leader_id = activity.get('leader_id')
+        if not leader_id:
+            return
+        with self._lock:
+            self._buffer(str(leader_id))[1].appendleft(activity)
+
+    def get(self, leader_id, load_rows):
+        """
+        Get a leader's most recent activities, newest first
+
+        Args:
+            leader_id: UUID of the leader
+            load_rows: Callable(leader_id, limit) returning the newest rows from the table,
+                called only when the buffer is missing or older than the TTL
+
+        Returns:
+            list: Up to FEED_SIZE activity rows
+        """
+        leader_id = str(leader_id)
+        with self._lock:
+            entry = self._buffers.get(leader_id)
+            if entry is not None and entry[0] is not None and time.monotonic() - entry[0] < self._ttl():
+                self._buffers.move_to_end(leader_id)
+                return list(entry[1])
+
+        try:
+            rows = load_rows(leader_id, self.size)
+        except Exception as e:
+            logger.error(f"Failed to backfill recent activities: {str(e)}")
+            with self._lock:
+                entry = self._buffers.get(leader_id)
+                return list(entry[1]) if entry is not None else []
+
+        with self._lock:
+            entry = self._buffer(leader_id)
+            # Keep rows logged here that the table doesn't have yet (still queued for the writer)
+            merged = {_activity_key(row): row for row in rows}
+            for row in entry[1]:
+                merged.setdefault(_activity_key(row), row)
+            newest = sorted(merged.values(), key=_sort_key, reverse=True)[:self.size]
+            entry[0] = time.monotonic()
+            entry[1] = deque(newest, maxlen=self.size)
+            return list(newest)
+
+    def invalidate(self, leader_id=None):
+        """Forget one leader's buffer, or all of them"""
+        with self._lock:
+            if leader_id is None:
+                self._buffers.clear()
+            else:
+                self._buffers.pop(str(leader_id), None)
+
+
+# Shared feed for this worker process
+recent_activity_feed = RecentActivityFeed()
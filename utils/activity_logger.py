@@ -2,21 +2,39 @@
 Comprehensive Activity Logging Utility
 Tracks all activities from Cell App and Cell Portal
 Supports date-wise, role-wise, and activity-wise tracking
+Activities are queued in-process and written in batches by a background thread;
+while Supabase is unavailable they are spooled to disk and replayed later
 """
 
-from supabase import create_client, Client
 import os
+import atexit
+import base64
+import copy
+import json
+import logging
+import queue
+import random
+import threading
+import time as monotonic_time
 from datetime import datetime, date, time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from dotenv import load_dotenv
+from utils.data_context import fetch, invalidate
+from postgrest.exceptions import APIError
+from utils.activity_spool import ActivitySpool, RejectedRows
+from utils.activity_feed import recent_activity_feed
+from utils.supabase_client import supabase, missing_rpcs, rpc_function_missing
 
 # Load environment variables
 load_dotenv()
 
-# Initialize Supabase client
-url = os.getenv("SUPABASE_URL")
-key = os.getenv("SUPABASE_ANON_KEY")
-supabase: Client = create_client(url, key) if url and key else None
+# Background writer settings
+ACTIVITY_LOG_ASYNC = os.getenv('ACTIVITY_LOG_ASYNC', 'true').lower() == 'true'
+ACTIVITY_QUEUE_SIZE = int(os.getenv('ACTIVITY_QUEUE_SIZE') or '10000')  # Max queued activities per worker
+ACTIVITY_BATCH_SIZE = int(os.getenv('ACTIVITY_BATCH_SIZE') or '100')  # Max rows per insert
+ACTIVITY_FLUSH_INTERVAL = float(os.getenv('ACTIVITY_FLUSH_INTERVAL') or '2.0')  # Max seconds an activity waits
+ACTIVITY_DRAIN_TIMEOUT = 10.0  # Seconds allowed for the final flush at shutdown
+ACTIVITY_BACKEND_BACKOFF = 30.0  # Seconds to spool instead of inserting after a failed insert
 
 # Activity category mapping
 ACTIVITY_CATEGORIES = {
@@ -73,6 +91,322 @@ ACTIVITY_CATEGORIES = {
     'analytics_viewed': 'portal',
 }
 
+# Logging policy per activity type (types not listed are kept):
+#   'keep'         write every event as its own row
+#   'sample:<r>'   write a random fraction r of events (details.sample_rate = r)
+#   'rollup'       count events per (leader, type, day) in memory and write periodic counter rows
+ACTIVITY_POLICIES = {
+    'member_viewed': 'rollup',
+    'tutorial_viewed': 'rollup',
+    'attendance_viewed': 'rollup',
+    'meeting_viewed': 'rollup',
+    'profile_viewed': 'rollup',
+    'dashboard_viewed': 'rollup',
+    'analytics_viewed': 'rollup',
+}
+
+# Seconds between counter row flushes, and max counters held before an early flush
+ACTIVITY_ROLLUP_INTERVAL = float(os.getenv('ACTIVITY_ROLLUP_INTERVAL') or '300')
+ACTIVITY_ROLLUP_MAX_KEYS = 10000
+
+def _parse_policy(policy: str) -> tuple:
+    """Parse a policy string into (mode, sample_rate)"""
+    policy = (policy or 'keep').strip().lower()
+    if policy.startswith('sample:'):
+        try:
+            rate = float(policy.split(':', 1)[1])
+        except ValueError:
+            rate = 1.0
+        return 'sample', min(max(rate, 0.0), 1.0)
+    if policy in ('keep', 'rollup'):
+        return policy, 1.0
+    return 'keep', 1.0
+
+def _load_policies() -> Dict[str, tuple]:
+    """Defaults from ACTIVITY_POLICIES, overridden by ACTIVITY_POLICY_OVERRIDES (type=policy,...)"""
+    policies = {activity_type: _parse_policy(policy) for activity_type, policy in ACTIVITY_POLICIES.items()}
+    for item in os.getenv('ACTIVITY_POLICY_OVERRIDES', '').split(','):
+        activity_type, sep, policy = item.partition('=')
+        if sep and activity_type.strip():
+            policies[activity_type.strip()] = _parse_policy(policy)
+    return policies
+
+_activity_policies = _load_policies()
+
+def get_activity_policy(activity_type: str) -> tuple:
+    """Get the (mode, sample_rate) policy for an activity type"""
+    return _activity_policies.get(activity_type, ('keep', 1.0))
+
+class ActivityRollup:
+    """In-memory view counters per (leader, type, day), turned into counter rows on flush"""
+    
+    def __init__(self, interval=ACTIVITY_ROLLUP_INTERVAL, max_keys=ACTIVITY_ROLLUP_MAX_KEYS):
+        self.interval = interval
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._counters = {}  # (leader_id, activity_type, activity_date_iso) -> counter dict
+        self._last_flush = monotonic_time.monotonic()
+    
+    def add(self, activity_data: Dict[str, Any]):
+        """Count one event (activity_data as built by log_activity)"""
+        key = (activity_data['leader_id'], activity_data['activity_type'], activity_data['activity_date'])
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                self._counters[key] = {
+                    'row': activity_data,
+                    'count': 1,
+                    'first_seen': activity_data['created_at'],
+                    'last_seen': activity_data['created_at']
+                }
+            else:
+                counter['count'] += 1
+                counter['last_seen'] = activity_data['created_at']
+    
+    def due(self) -> bool:
+        """True when the counters should be written (interval elapsed or too many keys)"""
+        with self._lock:
+            if not self._counters:
+                return False
+            return (len(self._counters) >= self.max_keys
+                    or monotonic_time.monotonic() - self._last_flush >= self.interval)
+    
+    def drain(self) -> List[Dict[str, Any]]:
+        """Take the current counters and return one activities row per (leader, type, day)"""
+        with self._lock:
+            counters, self._counters = self._counters, {}
+            self._last_flush = monotonic_time.monotonic()
+        
+        rows = []
+        for (leader_id, activity_type, activity_date), counter in counters.items():
+            row = dict(counter['row'])
+            row['description'] = f"{activity_type.replace('_', ' ').capitalize()} {counter['count']} time{'s' if counter['count'] != 1 else ''}"
+            row['created_at'] = counter['last_seen']
+            row['activity_time'] = datetime.fromisoformat(counter['last_seen']).time().isoformat()
+            row['details'] = {
+                'rollup': True,
+                'count': counter['count'],
+                'first_seen': counter['first_seen'],
+                'last_seen': counter['last_seen']
+            }
+            row['is_system'] = True
+            rows.append(row)
+        return rows
+
+# View counters for this worker process
+activity_rollup = ActivityRollup()
+
+def _spool_activities(rows: List[Dict[str, Any]]) -> bool:
+    """Keep activity rows on disk until the backend can take them"""
+    return activity_spool.append(rows)
+
+# SQLSTATE classes that retrying can't fix: data exceptions (22), integrity
+# violations (23), undefined/invalid objects (42); PGRST1xx/2xx are request and
+# schema errors from PostgREST itself
+PERMANENT_SQLSTATE_CLASSES = ('22', '23', '42')
+PERMANENT_POSTGREST_PREFIXES = ('PGRST1', 'PGRST2')
+
+def _is_permanent_insert_error(error: Exception) -> bool:
+    """True if an insert failed because of the rows themselves rather than the backend"""
+    if isinstance(error, TypeError):  # row can't be serialized
+        return True
+    if not isinstance(error, APIError):
+        return False  # network errors, timeouts
+    code = str(error.code or '')
+    if code.startswith(PERMANENT_POSTGREST_PREFIXES):
+        return True
+    if len(code) == 5:  # SQLSTATE
+        return code[:2] in PERMANENT_SQLSTATE_CLASSES
+    if code.isdigit():  # HTTP status when the error body wasn't JSON
+        return 400 <= int(code) < 500 and int(code) not in (408, 429)
+    return False
+
+def _insert_activities(rows: List[Dict[str, Any]]) -> bool:
+    """
+    Write activity rows with a single multi-row insert
+    
+    Returns:
+        bool: True if written, False on a transient failure (worth retrying)
+    
+    Raises:
+        RejectedRows: If the backend rejected the rows (constraint, bad column, ...)
+    """
+    if not supabase:
+        return False
+    try:
+        supabase.table('activities').insert(rows).execute()
+        return True
+    except Exception as e:
+        if _is_permanent_insert_error(e):
+            logging.getLogger(__name__).error(f"Backend rejected {len(rows)} activities: {str(e)}")
+            raise RejectedRows(str(e)) from e
+        logging.getLogger(__name__).error(f"Failed to write {len(rows)} activities: {str(e)}")
+        return False
+
+class ActivityWriter:
+    """
+    Bounded in-process queue of activity rows with a background flusher thread
+    
+    Rows are written when a batch fills up or when the oldest queued row has waited
+    ACTIVITY_FLUSH_INTERVAL seconds. Batches that fail to insert, batches written while
+    the backend is backing off, and activities arriving while the queue is full go to
+    the disk spool, so a slow database never grows worker memory or loses audit data.
+    """
+    
+    def __init__(self, max_queue=ACTIVITY_QUEUE_SIZE, batch_size=ACTIVITY_BATCH_SIZE,
+                 flush_interval=ACTIVITY_FLUSH_INTERVAL):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._max_queue = max_queue
+        self._lock = threading.Lock()
+        self._queue = None
+        self._thread = None
+        self._stopping = threading.Event()
+        self._pid = None
+        self._backend_down_until = 0.0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.spooled = 0
+    
+    def start(self):
+        """Start the flusher thread if it is not running"""
+        self._ensure_started()
+    
+    def _ensure_started(self):
+        """Start the flusher thread (again after a fork, since threads don't survive it)"""
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            if self._pid != os.getpid():
+                self._queue = queue.Queue(maxsize=self._max_queue)
+                self._stopping.clear()
+                self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='activity-writer', daemon=True)
+            self._thread.start()
+        # Replay anything a previous run left in the spool
+        if activity_spool.pending():
+            activity_spool.start()
+    
+    def submit(self, row: Dict[str, Any]) -> bool:
+        """Queue an activity row; returns False if it had to be dropped"""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            return self._spool([row])
+    
+    def _next_batch(self):
+        """Block until a batch is ready (full, timed out or shutting down) and return it"""
+        batch = []
+        deadline = None
+        while len(batch) < self.batch_size:
+            if self._stopping.is_set():
+                timeout = 0  # Shutting down: take what is queued without waiting
+            elif deadline is None:
+                timeout = 0.5  # Idle: wake up periodically to notice shutdown
+            else:
+                timeout = max(0.0, deadline - monotonic_time.monotonic())
+            try:
+                row = self._queue.get(timeout=timeout) if timeout else self._queue.get_nowait()
+            except queue.Empty:
+                # Idle wake-ups return an empty batch so the caller can flush counters
+                break
+            batch.append(row)
+            if deadline is None:
+                deadline = monotonic_time.monotonic() + self.flush_interval
+        return batch
+    
+    def _spool(self, rows) -> bool:
+        if _spool_activities(rows):
+            self.spooled += len(rows)
+            return True
+        self.dropped += len(rows)
+        if self.dropped == len(rows) or self.dropped % 1000 < len(rows):
+            logging.getLogger(__name__).warning(f"Activity spool unavailable, {self.dropped} activities dropped so far")
+        return False
+    
+    def _write(self, batch):
+        # Don't spend time on a backend that just failed; spool until the backoff expires
+        if monotonic_time.monotonic() < self._backend_down_until:
+            self._spool(batch)
+            return
+        try:
+            inserted = _insert_activities(batch)
+        except RejectedRows:
+            # The backend is up but refused something in this batch: the spool
+            # replays it row by row and quarantines the bad rows
+            self.failed += len(batch)
+            self._spool(batch)
+            activity_spool.wake()
+            return
+        if inserted:
+            self.written += len(batch)
+            if activity_spool.pending():
+                activity_spool.wake()
+        else:
+            self.failed += len(batch)
+            self._backend_down_until = monotonic_time.monotonic() + ACTIVITY_BACKEND_BACKOFF
+            self._spool(batch)
+    
+    def _flush_rollup(self):
+        rows = activity_rollup.drain()
+        for start in range(0, len(rows), self.batch_size):
+            self._write(rows[start:start + self.batch_size])
+    
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
+            if self._stopping.is_set() or activity_rollup.due():
+                self._flush_rollup()
+            if not batch and self._stopping.is_set():
+                return
+    
+    def drain(self, timeout: float = ACTIVITY_DRAIN_TIMEOUT):
+        """Flush everything still queued and stop the flusher (called at worker shutdown)"""
+        if self._pid != os.getpid() or self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            # Flusher is stuck on the backend: keep whatever is still queued on disk
+            leftover = []
+            while True:
+                try:
+                    leftover.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if leftover:
+                logging.getLogger(__name__).warning(f"Activity writer did not drain within {timeout}s, spooling {len(leftover)} activities")
+                self._spool(leftover)
+        activity_spool.close()
+    
+    def stats(self) -> Dict[str, int]:
+        """Counters for monitoring"""
+        return {
+            'queued': self._queue.qsize() if self._queue is not None else 0,
+            'written': self.written,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'spooled': self.spooled
+        }
+
+# Disk spool for activities the backend could not take (shared by all workers)
+activity_spool = ActivitySpool(
+    insert_rows=_insert_activities,
+    directory=os.getenv('ACTIVITY_SPOOL_DIR') or None,
+    fsync=os.getenv('ACTIVITY_SPOOL_FSYNC', 'true').lower() == 'true'
+)
+
+# Shared writer for this worker process
+activity_writer = ActivityWriter()
+atexit.register(activity_writer.drain)
+
 def log_activity(
     leader_id: str,
     user_id: str,
@@ -107,14 +441,8 @@ def log_activity(
         is_system: Mark as system-generated activity
     
     Returns:
-        bool: True if successful, False otherwise
+        bool: True if the activity was queued, written, counted or sampled out, False otherwise
     """
-    if not supabase:
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.warning("Supabase client not initialized, activity not logged")
-        return False
-    
     # Get activity category
     activity_category = ACTIVITY_CATEGORIES.get(activity_type, 'system')
     
@@ -143,8 +471,36 @@ def log_activity(
             'is_system': is_system
         }
         
-        result = supabase.table('activities').insert(activity_data).execute()
-        return True
+        mode, sample_rate = get_activity_policy(activity_type)
+        if mode == 'rollup':
+            # Counted in memory; the writer thread writes one counter row per (leader, type, day)
+            activity_rollup.add(activity_data)
+            activity_writer.start()
+            return True
+        if mode == 'sample':
+            if random.random() >= sample_rate:
+                return True
+            activity_data['details'] = dict(activity_data['details'], sample_rate=sample_rate)
+        
+        # Shown on this worker's dashboard feed right away, before the writer inserts it
+        recent_activity_feed.record(activity_data)
+        
+        if not supabase:
+            import logging
+            logger = logging.getLogger(__name__)
+            logger.warning("Supabase client not initialized, activity spooled to disk")
+            return _spool_activities([activity_data])
+        
+        if ACTIVITY_LOG_ASYNC:
+            queued = activity_writer.submit(activity_data)
+        else:
+            try:
+                queued = _insert_activities([activity_data]) or _spool_activities([activity_data])
+            except RejectedRows:
+                # Quarantined by the spool's replay so it can be inspected
+                queued = _spool_activities([activity_data])
+        invalidate('activities')
+        return queued
         
     except Exception as e:
         # Log error securely without exposing stack trace
@@ -153,6 +509,12 @@ def log_activity(
         logger.error(f"Failed to log activity: {str(e)}")
         return False
 
+# Columns returned by activity reads (everything except the search_vector tsvector)
+ACTIVITY_COLUMNS = (
+    'id, leader_id, user_id, user_role, user_name, activity_type, activity_category, description, '
+    'source, platform, activity_date, activity_time, created_at, details, metadata, is_important, is_system'
+)
+
 def get_recent_activities(
     leader_id: str,
     limit: int = 10,
@@ -180,7 +542,7 @@ def get_recent_activities(
     
     try:
         query = supabase.table('activities')\
-            .select('*')\
+            .select(ACTIVITY_COLUMNS)\
             .eq('leader_id', leader_id)
         
         if activity_type:
@@ -192,8 +554,7 @@ def get_recent_activities(
         if source:
             query = query.eq('source', source)
         
-        result = query.order('created_at', desc=True).limit(limit).execute()
-        return result.data if result.data else []
+        return fetch(query.order('created_at', desc=True).limit(limit))
         
     except Exception as e:
         import logging
@@ -201,6 +562,311 @@ def get_recent_activities(
         logger.error(f"Error fetching activities: {str(e)}")
         return []
 
+def _load_recent_activities(leader_id: str, limit: int) -> list:
+    """Newest activities straight from the table (errors propagate to the feed)"""
+    if not supabase:
+        return []
+    return fetch(supabase.table('activities')\
+        .select(ACTIVITY_COLUMNS)\
+        .eq('leader_id', leader_id)\
+        .order('created_at', desc=True)\
+        .limit(limit))
+
+def get_recent_activity_feed(leader_id: str) -> list:
+    """
+    Get the leader's recent-activity feed for the dashboard
+    Served from the worker's ring buffer; the table is only read when the
+    leader's buffer is missing or older than RECENT_ACTIVITY_TTL
+    
+    Args:
+        leader_id: UUID of the leader
+    
+    Returns:
+        list: Up to 10 activities, newest first
+    """
+    return recent_activity_feed.get(leader_id, _load_recent_activities)
+
+# Maximum page size for keyset-paginated activity reads
+ACTIVITY_PAGE_MAX = 200
+
+# Rows per keyset query when streaming an export
+ACTIVITY_EXPORT_PAGE_SIZE = 1000
+
+def _encode_cursor(values: list) -> str:
+    raw = json.dumps(values, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def _decode_cursor(cursor: str) -> list:
+    padded = cursor + '=' * (-len(cursor) % 4)
+    values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    if not isinstance(values, list):
+        raise ValueError('Invalid cursor')
+    return values
+
+def encode_activity_cursor(activity: Dict[str, Any]) -> str:
+    """Build an opaque cursor pointing just after an activity in (created_at, id) order"""
+    return _encode_cursor([activity.get('created_at'), str(activity.get('id'))])
+
+def decode_activity_cursor(cursor: str) -> tuple:
+    """
+    Decode a cursor from encode_activity_cursor
+    
+    Returns:
+        tuple: (created_at, id)
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        created_at, activity_id = _decode_cursor(cursor)
+        datetime.fromisoformat(str(created_at).replace('Z', '+00:00'))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if not created_at or not activity_id:
+        raise ValueError('Invalid cursor')
+    return str(created_at), str(activity_id)
+
+def _quote_filter_value(value: str) -> str:
+    """Quote a value for use inside a PostgREST or=() filter"""
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+def _after_cursor(query, created_at: str, activity_id: str):
+    """Restrict a (created_at DESC, id DESC) query to rows strictly after the cursor"""
+    ts = _quote_filter_value(created_at)
+    key = _quote_filter_value(activity_id)
+    condition = f"created_at.lt.{ts},and(created_at.eq.{ts},id.lt.{key})"
+    if hasattr(query, 'or_'):
+        return query.or_(condition)
+    # Older postgrest-py has no or_(): add the filter parameter directly
+    query.params = query.params.add('or', f"({condition})")
+    return query
+
+def _order_newest_first(query):
+    """Order by (created_at DESC, id DESC) as a single order parameter"""
+    # Repeated order() calls don't combine in every postgrest-py version
+    query.params = query.params.add('order', 'created_at.desc,id.desc')
+    return query
+
+def _filtered_activities_query(
+    leader_id: str,
+    activity_type: Optional[str] = None,
+    activity_category: Optional[str] = None,
+    user_role: Optional[str] = None,
+    source: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+):
+    """Build a select on a leader's activities with the optional feed filters applied"""
+    query = supabase.table('activities')\
+        .select(ACTIVITY_COLUMNS)\
+        .eq('leader_id', leader_id)
+    
+    if activity_type:
+        query = query.eq('activity_type', activity_type)
+    if activity_category:
+        query = query.eq('activity_category', activity_category)
+    if user_role:
+        query = query.eq('user_role', user_role)
+    if source:
+        query = query.eq('source', source)
+    if start_date:
+        query = query.gte('activity_date', start_date.isoformat())
+    if end_date:
+        query = query.lte('activity_date', end_date.isoformat())
+    return query
+
+def get_activities_page(
+    leader_id: str,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    activity_type: Optional[str] = None,
+    activity_category: Optional[str] = None,
+    user_role: Optional[str] = None,
+    source: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> Dict[str, Any]:
+    """
+    Get one page of activities, newest first, using (created_at, id) keyset pagination
+    Each page costs an index range scan on idx_activities_leader_created_id, however deep it is
+    
+    Args:
+        leader_id: UUID of the leader
+        limit: Page size (capped at ACTIVITY_PAGE_MAX)
+        cursor: next_cursor from the previous page (None for the first page)
+        activity_type: Filter by activity type
+        activity_category: Filter by activity category
+        user_role: Filter by user role
+        source: Filter by source (cell_app or cell_portal)
+        start_date: Optional start date filter
+        end_date: Optional end date filter
+    
+    Returns:
+        dict: {'activities': [...], 'next_cursor': str or None}
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    limit = max(1, min(int(limit), ACTIVITY_PAGE_MAX))
+    after = decode_activity_cursor(cursor) if cursor else None
+    
+    if not supabase:
+        return {'activities': [], 'next_cursor': None}
+    
+    try:
+        query = _filtered_activities_query(
+            leader_id, activity_type, activity_category, user_role, source, start_date, end_date
+        )
+        if after:
+            query = _after_cursor(query, *after)
+        
+        # One extra row tells us whether there is a next page
+        rows = fetch(_order_newest_first(query).limit(limit + 1))
+        
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return {
+            'activities': rows,
+            'next_cursor': encode_activity_cursor(rows[-1]) if has_more and rows else None
+        }
+        
+    except Exception as e:
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.error(f"Error fetching activities page: {str(e)}")
+        return {'activities': [], 'next_cursor': None}
+
+def iter_activities(
+    leader_id: str,
+    activity_type: Optional[str] = None,
+    activity_category: Optional[str] = None,
+    user_role: Optional[str] = None,
+    source: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    page_size: int = ACTIVITY_EXPORT_PAGE_SIZE
+):
+    """
+    Yield every matching activity, newest first, one keyset page at a time
+    Only one page is held in memory; pages bypass the per-request data context
+    so a long export does not accumulate rows
+    
+    Args:
+        leader_id: UUID of the leader
+        activity_type: Filter by activity type
+        activity_category: Filter by activity category
+        user_role: Filter by user role
+        source: Filter by source (cell_app or cell_portal)
+        start_date: Optional start date filter
+        end_date: Optional end date filter
+        page_size: Rows fetched per query
+    
+    Yields:
+        dict: Activity rows
+    
+    Raises:
+        Exception: If a page query fails (the caller decides how to end the stream)
+    """
+    if not supabase:
+        return
+    
+    after = None
+    while True:
+        query = _filtered_activities_query(
+            leader_id, activity_type, activity_category, user_role, source, start_date, end_date
+        )
+        if after:
+            query = _after_cursor(query, *after)
+        rows = _order_newest_first(query).limit(page_size).execute().data or []
+        yield from rows
+        if len(rows) < page_size:
+            return
+        after = (rows[-1]['created_at'], str(rows[-1]['id']))
+
+def encode_search_cursor(activity: Dict[str, Any], rank: float) -> str:
+    """Build an opaque cursor pointing just after a search hit in (rank, created_at, id) order"""
+    return _encode_cursor([rank, activity.get('created_at'), str(activity.get('id'))])
+
+def decode_search_cursor(cursor: str) -> tuple:
+    """
+    Decode a cursor from encode_search_cursor
+    
+    Returns:
+        tuple: (rank, created_at, id)
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        rank, created_at, activity_id = _decode_cursor(cursor)
+        rank = float(rank)
+        datetime.fromisoformat(str(created_at).replace('Z', '+00:00'))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if not created_at or not activity_id:
+        raise ValueError('Invalid cursor')
+    return rank, str(created_at), str(activity_id)
+
+def search_activities(
+    leader_id: str,
+    query: str,
+    limit: int = 50,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Full-text search over a leader's activity descriptions, best matches first
+    Runs the search_activities RPC (GIN index on activities.search_vector); the
+    query uses web search syntax: words, "quoted phrases", OR and -excluded words
+    
+    Args:
+        leader_id: UUID of the leader
+        query: Search text
+        limit: Page size (capped at ACTIVITY_PAGE_MAX)
+        cursor: next_cursor from the previous page (None for the first page)
+    
+    Returns:
+        dict: {'activities': [...], 'next_cursor': str or None}; each activity has a 'rank'
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    limit = max(1, min(int(limit), ACTIVITY_PAGE_MAX))
+    after = decode_search_cursor(cursor) if cursor else (None, None, None)
+    query = (query or '').strip()
+    
+    if not supabase or not query:
+        return {'activities': [], 'next_cursor': None}
+    
+    try:
+        # One extra row tells us whether there is a next page
+        response = supabase.rpc('search_activities', {
+            'p_leader_id': leader_id,
+            'p_query': query,
+            'p_limit': limit + 1,
+            'p_cursor_rank': after[0],
+            'p_cursor_created_at': after[1],
+            'p_cursor_id': after[2]
+        }).execute()
+        
+        hits = response.data or []
+        has_more = len(hits) > limit
+        activities = []
+        for hit in hits[:limit]:
+            activity = dict(hit['activity'])
+            activity['rank'] = hit['rank']
+            activities.append(activity)
+        
+        next_cursor = None
+        if has_more and activities:
+            next_cursor = encode_search_cursor(activities[-1], activities[-1]['rank'])
+        return {'activities': activities, 'next_cursor': next_cursor}
+        
+    except Exception as e:
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.error(f"Error searching activities: {str(e)}")
+        return {'activities': [], 'next_cursor': None}
+
 def get_activities_by_date(
     leader_id: str,
     activity_date: date,
@@ -224,7 +890,7 @@ def get_activities_by_date(
     
     try:
         query = supabase.table('activities')\
-            .select('*')\
+            .select(ACTIVITY_COLUMNS)\
             .eq('leader_id', leader_id)\
             .eq('activity_date', activity_date.isoformat())
         
@@ -233,8 +899,7 @@ def get_activities_by_date(
         if user_role:
             query = query.eq('user_role', user_role)
         
-        result = query.order('activity_time', desc=True).execute()
-        return result.data if result.data else []
+        return fetch(query.order('activity_time', desc=True))
         
     except Exception as e:
         import logging
@@ -267,7 +932,7 @@ def get_activities_by_role(
     
     try:
         query = supabase.table('activities')\
-            .select('*')\
+            .select(ACTIVITY_COLUMNS)\
             .eq('leader_id', leader_id)\
             .eq('user_role', user_role)
         
@@ -276,8 +941,7 @@ def get_activities_by_role(
         if end_date:
             query = query.lte('activity_date', end_date.isoformat())
         
-        result = query.order('created_at', desc=True).limit(limit).execute()
-        return result.data if result.data else []
+        return fetch(query.order('created_at', desc=True).limit(limit))
         
     except Exception as e:
         import logging
@@ -310,7 +974,7 @@ def get_activities_by_type(
     
     try:
         query = supabase.table('activities')\
-            .select('*')\
+            .select(ACTIVITY_COLUMNS)\
             .eq('leader_id', leader_id)\
             .eq('activity_type', activity_type)
         
@@ -319,8 +983,7 @@ def get_activities_by_type(
         if end_date:
             query = query.lte('activity_date', end_date.isoformat())
         
-        result = query.order('created_at', desc=True).limit(limit).execute()
-        return result.data if result.data else []
+        return fetch(query.order('created_at', desc=True).limit(limit))
         
     except Exception as e:
         import logging
@@ -353,7 +1016,7 @@ def get_activities_by_category(
     
     try:
         query = supabase.table('activities')\
-            .select('*')\
+            .select(ACTIVITY_COLUMNS)\
             .eq('leader_id', leader_id)\
             .eq('activity_category', activity_category)
         
@@ -362,8 +1025,7 @@ def get_activities_by_category(
         if end_date:
             query = query.lte('activity_date', end_date.isoformat())
         
-        result = query.order('created_at', desc=True).limit(limit).execute()
-        return result.data if result.data else []
+        return fetch(query.order('created_at', desc=True).limit(limit))
         
     except Exception as e:
         import logging
@@ -384,6 +1046,103 @@ def get_todays_activities(leader_id: str) -> list:
     today = date.today()
     return get_activities_by_date(leader_id, today)
 
+# Seconds an activity statistics result is reused for the same leader and range
+ACTIVITY_STATS_CACHE_TTL = 60
+ACTIVITY_STATS_CACHE_SIZE = 1024
+
+_stats_cache: Dict[tuple, tuple] = {}  # (leader_id, start, end) -> (expires_at, stats)
+_stats_cache_lock = threading.Lock()
+
+def _empty_statistics() -> Dict[str, Any]:
+    return {
+        'total_activities': 0,
+        'by_type': {},
+        'by_category': {},
+        'by_role': {},
+        'by_source': {},
+        'by_date': {}
+    }
+
+def _activity_statistics_rpc(leader_id: str, start_date: Optional[date], end_date: Optional[date]) -> Optional[Dict[str, Any]]:
+    """
+    Count activities in Postgres with the get_activity_statistics RPC
+    See database/migrations/create_activity_statistics_function.sql
+    
+    Returns:
+        dict: Statistics dictionary, or None if the function is unavailable
+    """
+    if 'get_activity_statistics' in missing_rpcs:
+        return None
+    try:
+        result = supabase.rpc('get_activity_statistics', {
+            'p_leader_id': leader_id,
+            'p_start_date': start_date.isoformat() if start_date else None,
+            'p_end_date': end_date.isoformat() if end_date else None
+        }).execute()
+        data = result.data
+        if isinstance(data, list):
+            data = data[0] if data else None
+        if not isinstance(data, dict):
+            return None
+        stats = _empty_statistics()
+        stats['total_activities'] = data.get('total_activities') or 0
+        for key in ('by_type', 'by_category', 'by_role', 'by_source', 'by_date'):
+            stats[key] = data.get(key) or {}
+        return stats
+    except Exception as e:
+        if rpc_function_missing(e):
+            missing_rpcs.add('get_activity_statistics')
+            logging.getLogger(__name__).warning("get_activity_statistics is not installed, counting in Python from now on")
+        else:
+            logging.getLogger(__name__).warning(f"Activity statistics RPC unavailable, counting in Python: {str(e)}")
+        return None
+
+def _activity_weight(details: Any) -> float:
+    """Number of events an activities row stands for (roll-up count / sample rate)"""
+    if not isinstance(details, dict):
+        return 1
+    try:
+        count = float(details.get('count') or 1)
+        sample_rate = float(details.get('sample_rate') or 1)
+    except (TypeError, ValueError):
+        return 1
+    return count / sample_rate if sample_rate > 0 else count
+
+def _activity_statistics_from_rows(leader_id: str, start_date: Optional[date], end_date: Optional[date]) -> Dict[str, Any]:
+    """Count activities in Python (fallback when the RPC is not installed)"""
+    from utils.attendance_engine import fetch_all
+    
+    def query():
+        query = supabase.table('activities')\
+            .select('activity_type, activity_category, user_role, source, activity_date, details')\
+            .eq('leader_id', leader_id)
+        if start_date:
+            query = query.gte('activity_date', start_date.isoformat())
+        if end_date:
+            query = query.lte('activity_date', end_date.isoformat())
+        return query.order('id')
+    
+    # Paged so the counts are not silently truncated at the PostgREST row cap
+    activities = fetch_all(query)
+    
+    # Weighted: roll-up and sampled rows stand for more than one event
+    totals = {key: {} for key in ('by_type', 'by_category', 'by_role', 'by_source', 'by_date')}
+    total = 0
+    for activity in activities:
+        weight = _activity_weight(activity.get('details'))
+        total += weight
+        for key, column in (('by_type', 'activity_type'), ('by_category', 'activity_category'),
+                            ('by_role', 'user_role'), ('by_source', 'source'), ('by_date', 'activity_date')):
+            group = activity.get(column) or 'unknown'
+            totals[key][group] = totals[key].get(group, 0) + weight
+    
+    stats = _empty_statistics()
+    stats['total_activities'] = round(total)
+    for key, counts in totals.items():
+        stats[key] = {group: round(count) for group, count in counts.items()}
+    
+    return stats
+
 def get_activity_statistics(
     leader_id: str,
     start_date: Optional[date] = None,
@@ -391,6 +1150,7 @@ def get_activity_statistics(
 ) -> Dict[str, Any]:
     """
     Get activity statistics (counts by type, category, role, etc.)
+    Counted in Postgres and cached for ACTIVITY_STATS_CACHE_TTL seconds per leader and range
     
     Args:
         leader_id: UUID of the leader
@@ -403,54 +1163,26 @@ def get_activity_statistics(
     if not supabase:
         return {}
     
+    cache_key = (leader_id, start_date, end_date)
+    now = monotonic_time.monotonic()
+    with _stats_cache_lock:
+        cached = _stats_cache.get(cache_key)
+    if cached and cached[0] > now:
+        return copy.deepcopy(cached[1])
+    
     try:
-        query = supabase.table('activities')\
-            .select('activity_type, activity_category, user_role, source, activity_date')\
-            .eq('leader_id', leader_id)
-        
-        if start_date:
-            query = query.gte('activity_date', start_date.isoformat())
-        if end_date:
-            query = query.lte('activity_date', end_date.isoformat())
+        stats = _activity_statistics_rpc(leader_id, start_date, end_date)
+        if stats is None:
+            stats = _activity_statistics_from_rows(leader_id, start_date, end_date)
         
-        result = query.execute()
-        activities = result.data if result.data else []
-        
-        stats = {
-            'total_activities': len(activities),
-            'by_type': {},
-            'by_category': {},
-            'by_role': {},
-            'by_source': {},
-            'by_date': {}
-        }
-        
-        for activity in activities:
-            # Count by type
-            activity_type = activity.get('activity_type', 'unknown')
-            stats['by_type'][activity_type] = stats['by_type'].get(activity_type, 0) + 1
-            
-            # Count by category
-            category = activity.get('activity_category', 'unknown')
-            stats['by_category'][category] = stats['by_category'].get(category, 0) + 1
-            
-            # Count by role
-            role = activity.get('user_role', 'unknown')
-            stats['by_role'][role] = stats['by_role'].get(role, 0) + 1
-            
-            # Count by source
-            source = activity.get('source', 'unknown')
-            stats['by_source'][source] = stats['by_source'].get(source, 0) + 1
-            
-            # Count by date
-            act_date = activity.get('activity_date', 'unknown')
-            stats['by_date'][act_date] = stats['by_date'].get(act_date, 0) + 1
-        
-        return stats
+        with _stats_cache_lock:
+            if len(_stats_cache) >= ACTIVITY_STATS_CACHE_SIZE:
+                _stats_cache.clear()
+            _stats_cache[cache_key] = (now + ACTIVITY_STATS_CACHE_TTL, stats)
+        return copy.deepcopy(stats)
         
     except Exception as e:
         import logging
         logger = logging.getLogger(__name__)
         logger.error(f"Error fetching activity statistics: {str(e)}")
         return {}
-
@@ -0,0 +1,352 @@
+"""
+Durable on-disk spool for activity records
+When Supabase is unavailable or slow, activity rows are appended to local
+segment files (one JSON record per line, prefixed with a CRC32 checksum) and
+replayed in batches by a background thread once the backend recovers
+
+Segment lifecycle (file names are <created_ms>-<pid>-<seq>.<state>):
+    .open       being appended to by the worker with that pid
+    .ready      sealed (size/age rotation, or its worker died), waiting for replay
+    .replaying  claimed by one worker; progress is kept in a .offset sidecar so
+                a failed replay resumes where it stopped instead of re-inserting
+    .bad        records the backend rejected outright (constraint violation, bad
+                column, ...); kept for inspection and never replayed
+
+A batch the backend rejects is retried row by row so one bad record is
+quarantined instead of blocking its segment (and every later one) forever;
+transient failures (network, timeouts, 5xx) put the segment back for later
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Default spool location (override with ACTIVITY_SPOOL_DIR)
+DEFAULT_SPOOL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'activity_spool')
+
+# Rotation limits for the open segment
+SEGMENT_MAX_BYTES = 1024 * 1024
+SEGMENT_MAX_AGE = 30.0  # seconds
+
+# Seconds between replay passes
+REPLAY_INTERVAL = 15.0
+
+# Rows per insert when replaying
+REPLAY_BATCH_SIZE = 100
+
+OPEN_SUFFIX = '.open'
+READY_SUFFIX = '.ready'
+REPLAYING_SUFFIX = '.replaying'
+OFFSET_SUFFIX = '.offset'
+BAD_SUFFIX = '.bad'
+
+
+class RejectedRows(Exception):
+    """Raised by insert_rows when the backend rejected the rows and retrying won't help"""
+
+
+def encode_record(row: Dict[str, Any]) -> bytes:
+    """Encode a row as one spool line: <crc32 hex>\\t<json>\\n"""
+    payload = json.dumps(row, separators=(',', ':'), default=str).encode('utf-8')
+    return b'%08x\t%s\n' % (zlib.crc32(payload), payload)
+
+
+def decode_record(line: bytes) -> Optional[Dict[str, Any]]:
+    """Decode one spool line, or None if it is torn or fails its checksum"""
+    if not line.endswith(b'\n'):
+        return None
+    checksum, sep, payload = line.rstrip(b'\n').partition(b'\t')
+    if not sep or len(checksum) != 8:
+        return None
+    try:
+        if int(checksum, 16) != zlib.crc32(payload):
+            return None
+        return json.loads(payload)
+    except ValueError:
+        return None
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class ActivitySpool:
+    """Append-only segmented spool with checksummed records and background replay"""
+
+    def __init__(self, insert_rows: Callable[[List[Dict[str, Any]]], bool], directory: Optional[str] = None,
+                 fsync: bool = True):
+        """
+        Args:
+            insert_rows: Callable writing a list of rows to the backend, returning True on success
+                and False on a transient failure; raises RejectedRows if the rows can never be written
+            directory: Spool directory (created on first use)
+            fsync: fsync after every append so records survive a machine crash
+        """
+        self.insert_rows = insert_rows
+        self.directory = directory or DEFAULT_SPOOL_DIR
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._file = None
+        self._file_path = None
+        self._file_opened_at = 0.0
+        self._seq = 0
+        self._pid = None
+        self._replay_thread = None
+        self._wakeup = threading.Event()
+        self.spooled = 0
+        self.replayed = 0
+        self.corrupt = 0
+        self.quarantined = 0
+
+    # ---- writing ----
+
+    def _check_fork(self):
+        """Forget the parent's open segment and replay thread after a fork"""
+        if self._pid != os.getpid():
+            self._file = None
+            self._file_path = None
+            self._replay_thread = None
+            self._pid = os.getpid()
+
+    def _open_segment(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._seq += 1
+        name = f"{int(time.time() * 1000)}-{os.getpid()}-{self._seq}{OPEN_SUFFIX}"
+        self._file_path = os.path.join(self.directory, name)
+        self._file = open(self._file_path, 'ab')
+        self._file_opened_at = time.monotonic()
+
+    def _seal_segment(self):
+        """Close the open segment and mark it ready for replay (caller holds the lock)"""
+        if self._file is None:
+            return
+        path = self._file_path
+        self._file.close()
+        self._file = None
+        self._file_path = None
+        if os.path.getsize(path) == 0:
+            os.remove(path)
+        else:
+            os.replace(path, path[:-len(OPEN_SUFFIX)] + READY_SUFFIX)
+
+    def append(self, rows: List[Dict[str, Any]]) -> bool:
+        """
+        Append rows to the open segment (rotating it when it is too big or too old)
+
+        Returns:
+            bool: True if the rows are on disk
+        """
+        if not rows:
+            return True
+        data = b''.join(encode_record(row) for row in rows)
+        try:
+            with self._lock:
+                self._check_fork()
+                if self._file is not None and (
+                        self._file.tell() >= SEGMENT_MAX_BYTES
+                        or time.monotonic() - self._file_opened_at >= SEGMENT_MAX_AGE):
+                    self._seal_segment()
+                if self._file is None:
+                    self._open_segment()
+                self._file.write(data)
+                self._file.flush()
+                if self.fsync:
+                    os.fsync(self._file.fileno())
+                self.spooled += len(rows)
+        except OSError as e:
+            logger.error(f"Failed to spool {len(rows)} activities: {str(e)}")
+            return False
+        self.start()
+        return True
+
+    # ---- replay ----
+
+    def _seal_stale_segments(self):
+        """Seal our own segment once it is old enough, and segments left by dead workers"""
+        with self._lock:
+            self._check_fork()
+            if self._file is not None and time.monotonic() - self._file_opened_at >= SEGMENT_MAX_AGE:
+                self._seal_segment()
+        for name in os.listdir(self.directory):
+            if not name.endswith(OPEN_SUFFIX) and not name.endswith(REPLAYING_SUFFIX):
+                continue
+            try:
+                pid = int(name.split('-')[1].split('.')[0])
+            except (IndexError, ValueError):
+                continue
+            if name.endswith(REPLAYING_SUFFIX):
+                owner = name[:-len(REPLAYING_SUFFIX)].rsplit('@', 1)[-1]
+                pid = int(owner) if owner.isdigit() else pid
+            if pid == os.getpid() or _pid_alive(pid):
+                continue
+            base = name.split('@')[0] if name.endswith(REPLAYING_SUFFIX) else name[:-len(OPEN_SUFFIX)]
+            try:
+                os.replace(os.path.join(self.directory, name), os.path.join(self.directory, base + READY_SUFFIX))
+            except OSError:
+                continue
+
+    def _claim(self, name: str) -> Optional[str]:
+        """Atomically claim a ready segment for this worker (None if another worker got it)"""
+        base = name[:-len(READY_SUFFIX)]
+        claimed = os.path.join(self.directory, f"{base}@{os.getpid()}{REPLAYING_SUFFIX}")
+        try:
+            os.replace(os.path.join(self.directory, name), claimed)
+        except OSError:
+            return None
+        return claimed
+
+    def _quarantine(self, base: str, row: Dict[str, Any], error: Exception):
+        """Move a record the backend rejected into the segment's .bad file"""
+        bad_path = os.path.join(self.directory, base + BAD_SUFFIX)
+        with open(bad_path, 'ab') as f:
+            f.write(encode_record(row))
+        self.quarantined += 1
+        logger.error(f"Quarantined rejected activity record in {os.path.basename(bad_path)}: {str(error)}")
+
+    def _replay_rows(self, base: str, batch, offset_path: str) -> bool:
+        """Insert a rejected batch one row at a time; returns False on a transient failure"""
+        for row, end in batch:
+            try:
+                if not self.insert_rows([row]):
+                    return False
+                self.replayed += 1
+            except RejectedRows as e:
+                self._quarantine(base, row, e)
+            with open(offset_path, 'w') as offset_file:
+                offset_file.write(str(end))
+        return True
+
+    def _replay_segment(self, path: str, base: str) -> bool:
+        """Insert a claimed segment's records in batches; returns False if the backend failed"""
+        offset_path = os.path.join(self.directory, base + OFFSET_SUFFIX)
+        offset = 0
+        try:
+            with open(offset_path) as f:
+                offset = int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            offset = 0
+
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            while True:
+                batch = []  # (row, offset just past its line)
+                end = offset
+                for line in f:
+                    end += len(line)
+                    row = decode_record(line)
+                    if row is None:
+                        self.corrupt += 1
+                        logger.warning(f"Skipping corrupt activity record in {os.path.basename(path)} at byte {end - len(line)}")
+                        continue
+                    batch.append((row, end))
+                    if len(batch) >= REPLAY_BATCH_SIZE:
+                        break
+                if not batch:
+                    break
+                try:
+                    inserted = self.insert_rows([row for row, _ in batch])
+                    if inserted:
+                        self.replayed += len(batch)
+                except RejectedRows:
+                    # Find the bad rows: good ones go in, rejected ones to the .bad file
+                    inserted = self._replay_rows(base, batch, offset_path)
+                if not inserted:
+                    # Put it back for a later pass, resuming after the last good batch (or row)
+                    os.replace(path, os.path.join(self.directory, base + READY_SUFFIX))
+                    return False
+                offset = end
+                with open(offset_path, 'w') as offset_file:
+                    offset_file.write(str(offset))
+
+        os.remove(path)
+        if os.path.exists(offset_path):
+            os.remove(offset_path)
+        return True
+
+    def replay(self) -> int:
+        """
+        Replay every sealed segment (oldest first)
+
+        Returns:
+            int: Number of records replayed in this pass
+        """
+        if not os.path.isdir(self.directory):
+            return 0
+        before = self.replayed
+        self._seal_stale_segments()
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(READY_SUFFIX):
+                continue
+            claimed = self._claim(name)
+            if claimed is None:
+                continue
+            try:
+                if not self._replay_segment(claimed, name[:-len(READY_SUFFIX)]):
+                    break
+            except OSError as e:
+                logger.error(f"Failed to replay activity spool segment {name}: {str(e)}")
+                # Hand it back so the next pass retries it (the .offset sidecar keeps progress)
+                try:
+                    os.replace(claimed, os.path.join(self.directory, name))
+                except OSError:
+                    pass
+                break
+        replayed = self.replayed - before
+        if replayed:
+            logger.info(f"Replayed {replayed} spooled activities")
+        return replayed
+
+    def pending(self) -> bool:
+        """True if there are spooled segments waiting (or being written)"""
+        try:
+            return any(not name.endswith((OFFSET_SUFFIX, BAD_SUFFIX)) for name in os.listdir(self.directory))
+        except OSError:
+            return False
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(REPLAY_INTERVAL)
+            self._wakeup.clear()
+            try:
+                if self.pending():
+                    self.replay()
+            except Exception as e:
+                logger.error(f"Activity spool replay failed: {str(e)}")
+
+    def wake(self):
+        """Run a replay pass now (e.g. after the backend answered again)"""
+        self._wakeup.set()
+
+    def start(self):
+        """Start the background replay thread for this process (no-op if running)"""
+        if self._replay_thread is not None and self._replay_thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            self._check_fork()
+            if self._replay_thread is not None and self._replay_thread.is_alive():
+                return
+            self._replay_thread = threading.Thread(target=self._run, name='activity-spool-replay', daemon=True)
+            self._replay_thread.start()
+
+    def close(self):
+        """Seal the open segment so another worker (or the next start) can replay it"""
+        with self._lock:
+            if self._pid == os.getpid():
+                self._seal_segment()
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for monitoring"""
+        return {'spooled': self.spooled, 'replayed': self.replayed, 'corrupt': self.corrupt,
+                'quarantined': self.quarantined}
@@ -0,0 +1,153 @@
+"""
+Attendance aggregation engine
+Computes per-meeting eligibility, present/absent counts and completion status
+for a leader from one roster fetch and one attendance fetch (run concurrently)
+"""
+
+import logging
+from datetime import datetime, time, timezone
+from utils.data_context import fetch
+from utils.concurrent_queries import QueryFanOut
+from utils.models import Attendance, parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+# PostgREST caps responses (1000 rows on Supabase by default), so reads are paged
+PAGE_SIZE = 1000
+
+
+def fetch_all(query_factory, page_size=PAGE_SIZE):
+    """
+    Fetch every row of a query by paging with limit()/offset()
+    (range() is end-exclusive in some postgrest-py versions and inclusive in others)
+
+    Args:
+        query_factory: Callable returning a fresh, ordered PostgREST query builder
+        page_size: Rows per page
+
+    Returns:
+        list: All rows
+    """
+    rows = []
+    start = 0
+    while True:
+        page = fetch(query_factory().limit(page_size).offset(start))
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        start += page_size
+
+
+def _meeting_cutoff(meeting_date, aware):
+    """
+    Cutoff timestamp matching PostgREST's `created_at <= 'YYYY-MM-DD'` filter
+    (midnight at the start of the meeting date)
+    """
+    cutoff = datetime.combine(meeting_date, time.min)
+    return cutoff.replace(tzinfo=timezone.utc) if aware else cutoff
+
+
+def get_attendance_status(count, total):
+    """Get completion status ('complete', 'partial' or 'incomplete') for a meeting"""
+    if total > 0 and count == total:
+        return 'complete'
+    if count > 0:
+        return 'partial'
+    return 'incomplete'
+
+
+def submit_attendance_queries(queries, supabase, leader_id, start_date=None, end_date=None):
+    """
+    Submit the roster and attendance reads summarize_attendance needs to a fan-out,
+    so a route can run them alongside its own independent queries
+
+    Args:
+        queries: QueryFanOut to submit 'roster' and 'records' to
+        supabase: Supabase client
+        leader_id: UUID of the leader
+        start_date: Optional datetime.date lower bound of the meeting dates
+        end_date: Optional datetime.date upper bound of the meeting dates
+    """
+    # Roster once: member id -> created_at
+    queries.submit('roster', fetch_all, lambda: supabase.table('cell_members')
+                   .select('id, created_at')
+                   .eq('leader_id', leader_id)
+                   .order('id'))
+
+    # Attendance once for the whole date span
+    def records_query():
+        query = supabase.table('attendance')\
+            .select('id, member_id, meeting_date, status')\
+            .eq('leader_id', leader_id)
+        if start_date:
+            query = query.gte('meeting_date', start_date.isoformat())
+        if end_date:
+            query = query.lte('meeting_date', end_date.isoformat())
+        return query.order('id')
+    queries.submit('records', fetch_all, records_query)
+
+
+def summarize_attendance(supabase, leader_id, meeting_dates, queries=None):
+    """
+    Aggregate attendance for several meetings of one leader
+
+    Args:
+        supabase: Supabase client
+        leader_id: UUID of the leader
+        meeting_dates: Iterable of datetime.date meeting dates
+        queries: Optional QueryFanOut already given submit_attendance_queries for a
+            range covering meeting_dates (otherwise the reads are made here)
+
+    Returns:
+        dict: {meeting_date_iso: {
+            'total': eligible members,
+            'count': attendance records for eligible members,
+            'present_count': int,
+            'absent_count': int,
+            'status': 'complete' | 'partial' | 'incomplete'
+        }}
+    """
+    dates = sorted({d for d in meeting_dates if d})
+    summary = {
+        d.isoformat(): {'total': 0, 'count': 0, 'present_count': 0, 'absent_count': 0, 'status': 'incomplete'}
+        for d in dates
+    }
+    if not dates:
+        return summary
+
+    if queries is None:
+        # Roster and attendance don't depend on each other: fetch both at once
+        queries = QueryFanOut()
+        submit_attendance_queries(queries, supabase, leader_id, dates[0], dates[-1])
+
+    roster = queries.result('roster')
+    member_created = {}
+    for member in roster:
+        created_at = parse_timestamp(member.get('created_at'))
+        if created_at is not None:  # NULL created_at never passes the lte filter
+            member_created[member['id']] = created_at
+
+    # Eligible member ids per meeting
+    eligible = {}
+    for meeting_date in dates:
+        eligible[meeting_date.isoformat()] = {
+            member_id for member_id, created_at in member_created.items()
+            if created_at <= _meeting_cutoff(meeting_date, created_at.tzinfo is not None)
+        }
+
+    records = Attendance.from_rows(queries.result('records'))
+    for record in records:
+        meeting = summary.get(record.date.isoformat()) if record.date else None
+        if meeting is None or record.member_id not in eligible[record.date.isoformat()]:
+            continue
+        meeting['count'] += 1
+        if record.status == 'present':
+            meeting['present_count'] += 1
+        elif record.status == 'absent':
+            meeting['absent_count'] += 1
+
+    for date_iso, meeting in summary.items():
+        meeting['total'] = len(eligible[date_iso])
+        meeting['status'] = get_attendance_status(meeting['count'], meeting['total'])
+
+    return summary
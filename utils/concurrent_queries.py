@@ -0,0 +1,140 @@
+"""
+Concurrent fan-out for independent Supabase reads
+A route submits the reads that don't depend on each other and then collects
+them; they run at once on a small per-process pool, so the route waits about
+as long as its slowest read instead of the sum of all of them. Each call runs
+in a copy of the caller's context (Flask app/request context, g, session) and
+shares the request's DataContext. When every pool thread is busy a call runs
+in the caller's thread instead of queueing, so nested fan-outs can't deadlock
+
+    queries = QueryFanOut()
+    queries.submit('members', fetch, supabase.table('cell_members').select('id').eq('leader_id', leader_id))
+    queries.submit('tutorials', tutorial_cache.get, supabase, next_meeting_date)
+    member_rows = queries.result('members')  # re-raises the call's exception
+"""
+
+import contextvars
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from flask import current_app, has_app_context
+from utils.data_context import get_data_context
+
+logger = logging.getLogger(__name__)
+
+# Defaults (overridable in config.py)
+DEFAULT_MAX_WORKERS = 8  # Pool threads per worker process
+DEFAULT_TIMEOUT = 10.0  # Seconds from the start of a fan-out until its results are given up on
+
+
+class QueryTimeout(Exception):
+    """Raised when a fanned-out call misses the fan-out deadline"""
+
+
+def _config(name, default):
+    if has_app_context():
+        return current_app.config.get(name, default)
+    return default
+
+
+class QueryPool:
+    """Bounded per-process thread pool that never queues work"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self._slots = None
+        self.submitted = 0
+        self.inline = 0
+
+    def _ensure_executor(self):
+        """Create the pool for this process (pools don't survive a fork)"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                max_workers = _config('QUERY_FANOUT_WORKERS', DEFAULT_MAX_WORKERS)
+                self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='query-fanout')
+                self._slots = threading.BoundedSemaphore(max_workers)
+                self._pid = os.getpid()
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Run fn on a free pool thread in a copy of the caller's context
+
+        Returns:
+            Future: The call's future, or None if every pool thread is busy
+        """
+        self._ensure_executor()
+        if not self._slots.acquire(blocking=False):
+            self.inline += 1
+            return None
+
+        context = contextvars.copy_context()
+
+        def task():
+            try:
+                return context.run(fn, *args, **kwargs)
+            finally:
+                self._slots.release()
+
+        try:
+            future = self._executor.submit(task)
+        except Exception:
+            self._slots.release()
+            raise
+        self.submitted += 1
+        return future
+
+    def stats(self):
+        return {'submitted': self.submitted, 'inline': self.inline}
+
+
+# Shared pool for this worker process
+query_pool = QueryPool()
+
+
+class QueryFanOut:
+    """A set of named concurrent calls joined against one deadline"""
+
+    def __init__(self, timeout=None):
+        """
+        Args:
+            timeout: Seconds from now until results are given up on
+                (defaults to QUERY_FANOUT_TIMEOUT)
+        """
+        self.timeout = _config('QUERY_FANOUT_TIMEOUT', DEFAULT_TIMEOUT) if timeout is None else timeout
+        self.deadline = time.monotonic() + self.timeout
+        self._futures = {}
+        # Create the request's DataContext here so every call shares the same one
+        get_data_context()
+
+    def submit(self, name, fn, *args, **kwargs):
+        """Start fn(*args, **kwargs) under a name (runs inline if the pool is busy)"""
+        future = query_pool.submit(fn, *args, **kwargs)
+        if future is None:
+            future = Future()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+        self._futures[name] = future
+        return future
+
+    def result(self, name):
+        """
+        Wait for a call's result until the fan-out deadline
+
+        Raises:
+            QueryTimeout: If the call is still running at the deadline
+            Exception: Whatever the call raised
+        """
+        future = self._futures[name]
+        try:
+            return future.result(timeout=max(0.0, self.deadline - time.monotonic()))
+        except FutureTimeoutError:
+            logger.warning(f"Query '{name}' missed the {self.timeout:.1f}s fan-out deadline")
+            raise QueryTimeout(f"Query '{name}' did not finish within {self.timeout:.1f}s")
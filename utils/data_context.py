@@ -0,0 +1,149 @@
+"""
+Request-scoped data context for Supabase reads
+Memoizes identical PostgREST queries and keeps fetched rows keyed by table and id
+so a single request never asks the database the same question twice. Safe to
+share between the threads of a query fan-out (utils/concurrent_queries.py)
+"""
+
+import logging
+import threading
+from flask import g, has_app_context
+
+logger = logging.getLogger(__name__)
+
+# HTTP methods that are safe to memoize (PostgREST reads)
+READ_METHODS = ('GET', 'HEAD')
+
+
+class DataContext:
+    """Per-request query memo and identity map (stored on flask.g)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()  # queries run outside it, so fanned-out reads still overlap
+        self._results = {}  # (method, path, params) -> list of rows
+        self._rows = {}     # table -> {row_id: row}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _table_name(query):
+        """Get the table name from a PostgREST request builder path"""
+        path = getattr(query, 'path', '') or ''
+        return path.strip('/')
+
+    @staticmethod
+    def _query_key(query):
+        """Build a hashable key for a read query, or None if it can't be memoized"""
+        method = getattr(query, 'http_method', None)
+        if method not in READ_METHODS:
+            return None
+        params = getattr(query, 'params', None)
+        try:
+            params_key = tuple(params.multi_items()) if params is not None else ()
+        except AttributeError:
+            return None
+        return (method, getattr(query, 'path', None), params_key)
+
+    def _remember(self, table, rows):
+        """Merge fetched rows into the identity map"""
+        table_rows = self._rows.setdefault(table, {})
+        for row in rows:
+            if isinstance(row, dict) and row.get('id') is not None:
+                row_id = str(row['id'])
+                existing = table_rows.get(row_id)
+                if existing is None:
+                    table_rows[row_id] = dict(row)
+                else:
+                    existing.update(row)
+
+    def fetch(self, query):
+        """
+        Execute a read query once per request and return its rows
+
+        Args:
+            query: PostgREST request builder (before .execute())
+
+        Returns:
+            list: Rows returned by the query (shared between identical calls)
+        """
+        key = self._query_key(query)
+        if key is not None:
+            with self._lock:
+                if key in self._results:
+                    self.hits += 1
+                    return self._results[key]
+
+        result = query.execute()
+        rows = result.data if result.data else []
+
+        with self._lock:
+            self.misses += 1
+            if key is not None:
+                self._results[key] = rows
+                self._remember(self._table_name(query), rows)
+        return rows
+
+    def fetch_one(self, query):
+        """Execute a read query and return the first row or None"""
+        rows = self.fetch(query)
+        return rows[0] if rows else None
+
+    def get(self, table, row_id, columns=None):
+        """
+        Get a row already fetched during this request
+
+        Args:
+            table: Table name
+            row_id: Primary key of the row
+            columns: Optional iterable of columns the caller needs
+
+        Returns:
+            dict: Row if it is known and has all requested columns, otherwise None
+        """
+        with self._lock:
+            row = self._rows.get(table, {}).get(str(row_id))
+        if row is None:
+            return None
+        if columns and any(column not in row for column in columns):
+            return None
+        return row
+
+    def invalidate(self, table):
+        """Forget memoized queries and rows for a table after a write"""
+        with self._lock:
+            self._rows.pop(table, None)
+            for key in [k for k in self._results if k[1] and k[1].strip('/') == table]:
+                del self._results[key]
+
+
+def get_data_context():
+    """Get the data context for the current request (None outside a request)"""
+    if not has_app_context():
+        return None
+    ctx = g.get('_data_context')
+    if ctx is None:
+        ctx = DataContext()
+        g._data_context = ctx
+    return ctx
+
+
+def fetch(query):
+    """Execute a read query through the request data context when available"""
+    ctx = get_data_context()
+    if ctx is None:
+        result = query.execute()
+        return result.data if result.data else []
+    return ctx.fetch(query)
+
+
+def fetch_one(query):
+    """Execute a read query and return its first row or None"""
+    rows = fetch(query)
+    return rows[0] if rows else None
+
+
+def invalidate(table):
+    """Invalidate cached reads for a table in the current request, if any"""
+    ctx = get_data_context()
+    if ctx is not None:
+        ctx.invalidate(table)
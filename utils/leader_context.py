@@ -0,0 +1,109 @@
+"""
+Leader context kept with the session
+The leader's creation date, branch and country are captured from the user row
+at login so routes can read them without querying the users table
+"""
+
+import logging
+import time
+from flask import current_app, has_app_context, session
+from utils.data_context import fetch_one
+from utils.models import parse_date
+
+logger = logging.getLogger(__name__)
+
+# Session key holding the leader context
+SESSION_KEY = 'leader'
+
+# Seconds before the context is reloaded (overridable in config.py)
+DEFAULT_TTL = 300
+
+# Columns of the users table the context is built from
+LEADER_COLUMNS = 'id, created_at, branch_id, country'
+
+
+def build_leader_context(user_row):
+    """
+    Build the session leader context from a users row
+
+    Args:
+        user_row: Row from the users table (at least the LEADER_COLUMNS)
+
+    Returns:
+        dict: JSON-serializable context with id, created_at, branch_id and country
+    """
+    created_at = user_row.get('created_at')
+    return {
+        'id': user_row.get('id'),
+        'created_at': created_at if isinstance(created_at, str) or created_at is None else created_at.isoformat(),
+        'branch_id': user_row.get('branch_id'),
+        'country': user_row.get('country')
+    }
+
+
+def store_leader_context(user_row):
+    """Store the leader context for a users row in the session and return it"""
+    context = build_leader_context(user_row)
+    context['loaded_at'] = time.time()
+    session[SESSION_KEY] = context
+    return context
+
+
+def _ttl():
+    if has_app_context():
+        return current_app.config.get('LEADER_CONTEXT_TTL', DEFAULT_TTL)
+    return DEFAULT_TTL
+
+
+def refresh_leader_context(supabase):
+    """
+    Reload the leader context from the users table now (e.g. before using the
+    branch and country for a member write; they can be changed in the portal)
+
+    Args:
+        supabase: Supabase client
+
+    Returns:
+        dict: Refreshed context; the stored one if the reload fails; None if no user is logged in
+    """
+    leader_id = session.get('user', {}).get('id')
+    if not leader_id:
+        return None
+    context = session.get(SESSION_KEY)
+    stored = context if context and context.get('id') == leader_id else None
+    try:
+        user_row = fetch_one(supabase.table('users').select(LEADER_COLUMNS).eq('id', leader_id))
+    except Exception as e:
+        logger.error(f"Error loading leader context: {str(e)}")
+        return stored
+    if not user_row:
+        return stored
+    return store_leader_context(user_row)
+
+
+def get_leader_context(supabase):
+    """
+    Get the current leader context, reloading it if the session has none
+    (sessions created before the context existed, or a different user) or
+    it is older than LEADER_CONTEXT_TTL seconds
+
+    Args:
+        supabase: Supabase client used only when the context must be (re)loaded
+
+    Returns:
+        dict: Leader context, or None if no user is logged in
+    """
+    context = session.get(SESSION_KEY)
+    leader_id = session.get('user', {}).get('id')
+    if not leader_id:
+        return None
+    if (context and context.get('id') == leader_id
+            and time.time() - (context.get('loaded_at') or 0) < _ttl()):
+        return context
+    return refresh_leader_context(supabase)
+
+
+def get_leader_created_date(supabase):
+    """Get the leader's creation date as a datetime.date (None if unknown)"""
+    context = get_leader_context(supabase)
+    return parse_date(context.get('created_at')) if context else None
@@ -0,0 +1,159 @@
+"""
+Process-wide meetings calendar cache
+The meetings table is global and changes about once a week, so it is loaded
+once per worker, kept sorted by date and refreshed after a TTL, on demand, or
+as soon as the get_meetings_version fingerprint changes (checked every few seconds)
+"""
+
+import bisect
+import logging
+import threading
+import time
+from flask import current_app, has_app_context
+from utils.attendance_engine import fetch_all
+from utils.models import Meeting
+from utils.supabase_client import missing_rpcs, rpc_function_missing
+
+logger = logging.getLogger(__name__)
+
+# Default time-to-live for the cached calendar (seconds)
+DEFAULT_TTL = 300
+
+# Minimum age before a lookup miss triggers a reload (seconds)
+MISS_REFRESH_INTERVAL = 30
+
+# Seconds between meetings-version checks (see create_meetings_version_function.sql)
+DEFAULT_VERSION_CHECK_INTERVAL = 15
+
+
+class MeetingsCalendar:
+    """Meetings sorted by date with O(1) date -> meeting lookup"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (rows sorted by meeting_date ascending, parallel list of dates for bisect,
+        #  {meeting_date_iso: row}) - replaced as a whole so readers never see a mix
+        self._snapshot = ([], [], {})
+        self._loaded_at = None
+        self._version = None
+        self._checked_at = None
+
+    @staticmethod
+    def _ttl():
+        if has_app_context():
+            return current_app.config.get('MEETINGS_CACHE_TTL', DEFAULT_TTL)
+        return DEFAULT_TTL
+
+    @staticmethod
+    def _version_check_interval():
+        if has_app_context():
+            return current_app.config.get('MEETINGS_VERSION_CHECK_INTERVAL', DEFAULT_VERSION_CHECK_INTERVAL)
+        return DEFAULT_VERSION_CHECK_INTERVAL
+
+    @staticmethod
+    def _fetch_version(supabase):
+        """Fingerprint of the meetings table, or None if the function is unavailable"""
+        if 'get_meetings_version' in missing_rpcs:
+            return None
+        try:
+            version = supabase.rpc('get_meetings_version', {}).execute().data
+        except Exception as e:
+            if rpc_function_missing(e):
+                missing_rpcs.add('get_meetings_version')
+                logger.info("get_meetings_version is not installed, meetings calendar refreshes on its TTL only")
+            else:
+                logger.warning(f"Meetings version check failed: {str(e)}")
+            return None
+        return version if isinstance(version, str) else None
+
+    def _changed(self, supabase):
+        """True if the meetings table changed since the load (checked at most every few seconds)"""
+        if 'get_meetings_version' in missing_rpcs:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self._version_check_interval():
+                return False
+            self._checked_at = now
+        version = self._fetch_version(supabase)
+        return version is not None and version != self._version
+
+    def _age(self):
+        return None if self._loaded_at is None else time.monotonic() - self._loaded_at
+
+    def _load(self, supabase):
+        """Load every meeting from the database and rebuild the indexes"""
+        # Version first: a change made during the load shows up on the next check
+        version = self._fetch_version(supabase)
+        rows = fetch_all(lambda: supabase.table('meetings').select('*').order('meeting_date'))
+        meetings = [meeting for meeting in Meeting.from_rows(rows) if meeting.date]
+        meetings.sort(key=lambda meeting: meeting.date)
+
+        self._snapshot = (
+            meetings,
+            [meeting.date for meeting in meetings],
+            {meeting.date.isoformat(): meeting for meeting in meetings}
+        )
+        self._version = version
+        self._loaded_at = self._checked_at = time.monotonic()
+        logger.info(f"Meetings calendar loaded: {len(meetings)} meetings")
+
+    def _ensure_loaded(self, supabase, max_age=None):
+        """Reload the calendar if it is empty, older than max_age (defaults to the TTL) or out of date"""
+        max_age = self._ttl() if max_age is None else max_age
+        age = self._age()
+        if age is not None and age < max_age:
+            if not self._changed(supabase):
+                return
+            self.invalidate()
+        with self._lock:
+            age = self._age()
+            if age is None or age >= max_age:
+                self._load(supabase)
+
+    def preload(self, supabase):
+        """Load the calendar now if it is stale (lets a route overlap the load with other queries)"""
+        self._ensure_loaded(supabase)
+
+    def invalidate(self):
+        """Drop the cached calendar so the next lookup reloads it"""
+        with self._lock:
+            self._loaded_at = None
+
+    def meetings_since(self, supabase, start_date=None, limit=None):
+        """
+        Get meetings on or after a date, most recent first
+
+        Args:
+            supabase: Supabase client
+            start_date: Optional datetime.date lower bound (e.g. the leader's creation date)
+            limit: Optional maximum number of meetings
+
+        Returns:
+            list: Meeting models ordered by meeting_date descending
+        """
+        self._ensure_loaded(supabase)
+        rows, dates, _ = self._snapshot
+        start = bisect.bisect_left(dates, start_date) if start_date else 0
+        selected = rows[start:][::-1]
+        return selected[:limit] if limit is not None else selected
+
+    def get_meeting(self, supabase, meeting_date):
+        """Get the Meeting for a date (datetime.date or YYYY-MM-DD), or None"""
+        self._ensure_loaded(supabase)
+        date_iso = meeting_date.isoformat() if hasattr(meeting_date, 'isoformat') else str(meeting_date)[:10]
+        meeting = self._snapshot[2].get(date_iso)
+        if meeting is None:
+            # The meeting may have been added since the last load
+            self._ensure_loaded(supabase, max_age=MISS_REFRESH_INTERVAL)
+            meeting = self._snapshot[2].get(date_iso)
+        return meeting
+
+    def get_meeting_number(self, supabase, meeting_date):
+        """Get the meeting_number for a date, or None if there is no meeting"""
+        meeting = self.get_meeting(supabase, meeting_date)
+        return meeting.meeting_number if meeting else None
+
+
+# Shared calendar for this worker process
+meetings_calendar = MeetingsCalendar()
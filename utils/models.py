@@ -0,0 +1,182 @@
+"""
+Compact row models for Supabase rows
+Each model keeps the columns it knows in __slots__ and parses its dates once
+when the row is built; dict-style access (row['name'], row.get('name')) keeps
+working so routes and templates can use models and plain rows interchangeably
+"""
+
+from datetime import date, datetime, time
+from functools import lru_cache
+
+# Date formats accepted besides ISO 8601 (as produced by PostgREST)
+FALLBACK_DATE_FORMATS = ("%Y-%m-%dT%H:%M:%S.%f", "%B %d, %Y")
+
+
+@lru_cache(maxsize=4096)
+def _parse_datetime_string(value):
+    """Parse a date or timestamp string to a datetime (cached per distinct string)"""
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        pass
+    for date_format in FALLBACK_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+    try:
+        return datetime.strptime(value.split('T')[0], "%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+def parse_timestamp(value):
+    """
+    Parse a created_at value into a datetime, keeping its time and timezone
+
+    Args:
+        value: Timestamp or date string (same formats as parse_date), date, datetime or None
+
+    Returns:
+        datetime: Parsed timestamp (midnight for plain dates), or None if the value is empty or invalid
+    """
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, time.min)
+    return _parse_datetime_string(str(value).strip())
+
+
+def parse_date(value):
+    """
+    Parse a meeting_date / created_at value into a datetime.date
+
+    Args:
+        value: Date string (YYYY-MM-DD, ISO timestamp or "Month DD, YYYY"), date, datetime or None
+
+    Returns:
+        date: Parsed date, or None if the value is empty or invalid
+    """
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    parsed = _parse_datetime_string(str(value).strip())
+    return parsed.date() if parsed else None
+
+
+class Model:
+    """Base class: known columns live in slots, anything else in `extra`"""
+
+    __slots__ = ('extra',)
+    FIELDS = ()
+    _field_set = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._field_set = frozenset(cls.FIELDS)
+
+    def __init__(self, row):
+        get = row.get
+        for name in self.FIELDS:
+            setattr(self, name, get(name))
+        extra = {key: value for key, value in row.items() if key not in self._field_set}
+        self.extra = extra or None
+        self._parse()
+
+    def _parse(self):
+        """Compute derived fields (overridden by subclasses)"""
+
+    @classmethod
+    def from_row(cls, row):
+        """Build a model from a row (None stays None, models are returned as is)"""
+        if row is None or isinstance(row, cls):
+            return row
+        return cls(row)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build models for a list of rows"""
+        return [cls.from_row(row) for row in rows]
+
+    def __getattr__(self, name):
+        # Only called for names that are not slots, i.e. columns outside FIELDS
+        if name != 'extra' and self.extra and name in self.extra:
+            return self.extra[name]
+        raise AttributeError(f"{type(self).__name__} has no field '{name}'")
+
+    def __getitem__(self, key):
+        if key in self._field_set:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self._field_set or bool(self.extra and key in self.extra)
+
+    def get(self, key, default=None):
+        """Like dict.get: the default is only used for unknown columns, a NULL column gives None"""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self):
+        """Return the row as a plain dict (raw column values only)"""
+        row = {name: getattr(self, name) for name in self.FIELDS}
+        if self.extra:
+            row.update(self.extra)
+        return row
+
+    def __repr__(self):
+        return f"{type(self).__name__}(id={getattr(self, 'id', None)!r})"
+
+
+class Member(Model):
+    """Row of the cell_members table"""
+
+    FIELDS = ('id', 'leader_id', 'name', 'age', 'gender', 'phone_number', 'email', 'zone', 'ministry',
+              'country', 'branch_id', 'cell_category', 'church', 'potential_leader', 'created_at')
+    __slots__ = FIELDS + ('created_date',)
+
+    def _parse(self):
+        self.created_date = parse_date(self.created_at)
+
+    def created_after(self, meeting_date):
+        """True if the member was created after the given meeting date (unknown dates never are)"""
+        return bool(self.created_date and meeting_date and self.created_date > meeting_date)
+
+
+class Meeting(Model):
+    """Row of the meetings table"""
+
+    FIELDS = ('id', 'meeting_date', 'meeting_number', 'meeting_name')
+    __slots__ = FIELDS + ('date',)
+
+    def _parse(self):
+        self.date = parse_date(self.meeting_date)
+
+
+class Attendance(Model):
+    """Row of the attendance table"""
+
+    FIELDS = ('id', 'leader_id', 'member_id', 'meeting_date', 'meeting_number', 'status')
+    __slots__ = FIELDS + ('date',)
+
+    def _parse(self):
+        self.date = parse_date(self.meeting_date)
+
+
+class Tutorial(Model):
+    """Row of the tutorials table"""
+
+    FIELDS = ('id', 'meeting_date', 'tutorial_name', 'title', 'description', 'file_url', 'uploaded_at')
+    __slots__ = FIELDS + ('date',)
+
+    def _parse(self):
+        self.date = parse_date(self.meeting_date)
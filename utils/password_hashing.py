@@ -0,0 +1,214 @@
+"""
+Bounded bcrypt executor
+Password checks are CPU-bound, so they run on a small per-worker pool with a
+cap on waiting checks: a login storm queues (or is turned away) instead of
+starving page requests on the same cores. Hashes stored at a cost other than
+BCRYPT_ROUNDS are rehashed on the next successful login
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import bcrypt
+from flask import current_app, has_app_context
+from utils.timing import get_dummy_hash
+
+logger = logging.getLogger(__name__)
+
+# Defaults (overridable in config.py)
+DEFAULT_ROUNDS = 12
+DEFAULT_MAX_CONCURRENCY = max(1, min(4, os.cpu_count() or 1))  # bcrypt threads per worker
+DEFAULT_MAX_QUEUE = 32  # Checks allowed to wait for a thread before new ones are refused
+DEFAULT_WAIT_TIMEOUT = 10.0  # Seconds a caller waits for its check before giving up
+
+# Queue waits above this are logged
+SLOW_QUEUE_WAIT = 1.0
+
+# Seconds between metrics log lines (0 disables them)
+DEFAULT_STATS_LOG_INTERVAL = 300
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many password checks are already waiting"""
+
+
+def _config(name, default):
+    if has_app_context():
+        return current_app.config.get(name, default)
+    return default
+
+
+def _executor_class():
+    """Real OS threads also under gevent (its patched ThreadPoolExecutor would run bcrypt on the hub)"""
+    try:
+        from gevent import monkey
+        if monkey.is_module_patched('threading'):
+            from gevent.threadpool import ThreadPoolExecutor as GeventThreadPoolExecutor
+            return GeventThreadPoolExecutor
+    except ImportError:
+        pass
+    return ThreadPoolExecutor
+
+
+def get_hash_rounds(hashed):
+    """Cost factor of a bcrypt hash ($2b$<cost>$...), or None if it isn't one"""
+    if isinstance(hashed, bytes):
+        hashed = hashed.decode('ascii', 'replace')
+    parts = (hashed or '').split('$')
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+class PasswordHasher:
+    """Runs bcrypt on a bounded per-process pool and keeps queue-time metrics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self._slots = None
+        self.checks = 0
+        self.hashes = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+        self.run_time_total = 0.0
+        self._stats_logged_at = time.monotonic()
+
+    @property
+    def rounds(self):
+        return _config('BCRYPT_ROUNDS', DEFAULT_ROUNDS)
+
+    def _ensure_executor(self):
+        """Create the pool for this process (pools don't survive a fork)"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                max_workers = _config('BCRYPT_MAX_CONCURRENCY', DEFAULT_MAX_CONCURRENCY)
+                max_queue = _config('BCRYPT_MAX_QUEUE', DEFAULT_MAX_QUEUE)
+                self._executor = _executor_class()(max_workers=max_workers)
+                self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+                self._pid = os.getpid()
+                # Build the dummy hash now rather than during the first unknown-account login
+                self._executor.submit(get_dummy_hash, self.rounds)
+
+    def _log_stats(self):
+        """Log the metrics every BCRYPT_STATS_LOG_INTERVAL seconds, for tuning the pool and cost"""
+        interval = _config('BCRYPT_STATS_LOG_INTERVAL', DEFAULT_STATS_LOG_INTERVAL)
+        now = time.monotonic()
+        with self._lock:
+            if not interval or now - self._stats_logged_at < interval:
+                return
+            self._stats_logged_at = now
+        stats = self.stats()
+        logger.info(
+            f"Password hashing since start (pid {os.getpid()}, cost {self.rounds}, "
+            f"{_config('BCRYPT_MAX_CONCURRENCY', DEFAULT_MAX_CONCURRENCY)} threads): "
+            f"{stats['checks']} checks, {stats['hashes']} hashes, {stats['rejected']} refused, "
+            f"{stats['timeouts']} timed out; queue avg {stats['queue_time_avg'] * 1000:.0f}ms "
+            f"max {stats['queue_time_max'] * 1000:.0f}ms; bcrypt avg {stats['run_time_avg'] * 1000:.0f}ms"
+        )
+
+    def _run(self, fn, *args):
+        """Run fn on the pool and wait for it; raises PasswordHasherBusy if the pool is saturated"""
+        self._ensure_executor()
+        self._log_stats()
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise PasswordHasherBusy('Too many password checks waiting')
+
+        submitted = time.monotonic()
+
+        def task():
+            started = time.monotonic()
+            try:
+                return fn(*args), started - submitted, time.monotonic() - started
+            finally:
+                self._slots.release()
+
+        try:
+            future = self._executor.submit(task)
+        except Exception:
+            self._slots.release()
+            raise
+        try:
+            result, queue_time, run_time = future.result(timeout=_config('BCRYPT_WAIT_TIMEOUT', DEFAULT_WAIT_TIMEOUT))
+        except FutureTimeoutError:
+            self.timeouts += 1
+            raise PasswordHasherBusy('Password check timed out waiting for the pool')
+
+        self.queue_time_total += queue_time
+        self.queue_time_max = max(self.queue_time_max, queue_time)
+        self.run_time_total += run_time
+        if queue_time > SLOW_QUEUE_WAIT:
+            logger.warning(f"Password check waited {queue_time:.2f}s for a bcrypt thread")
+        return result
+
+    def check(self, password, hashed):
+        """
+        Check a password against a stored bcrypt hash
+
+        Args:
+            password: Plain-text password (str)
+            hashed: Stored hash (str or bytes); when empty a dummy hash is checked
+                so the call costs the same either way
+
+        Returns:
+            bool: True if the password matches
+
+        Raises:
+            PasswordHasherBusy: If the pool is saturated
+        """
+        if isinstance(hashed, str):
+            hashed = hashed.encode('utf-8')
+        password = password.encode('utf-8')
+        rounds = self.rounds  # read here: pool threads have no app context
+        if not hashed:
+            self._run(bcrypt.checkpw, password, get_dummy_hash(rounds))
+            self.checks += 1
+            return False
+
+        def checkpw(password, hashed):
+            try:
+                return bcrypt.checkpw(password, hashed)
+            except ValueError:
+                # Malformed stored hash: do the dummy work so timing still matches
+                bcrypt.checkpw(password, get_dummy_hash(rounds))
+                return False
+
+        matched = self._run(checkpw, password, hashed)
+        self.checks += 1
+        return matched
+
+    def hash(self, password):
+        """Hash a password at BCRYPT_ROUNDS (returns str)"""
+        hashed = self._run(bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt(self.rounds))
+        self.hashes += 1
+        return hashed.decode('utf-8')
+
+    def needs_rehash(self, hashed):
+        """True if a stored hash uses a different cost than BCRYPT_ROUNDS"""
+        rounds = get_hash_rounds(hashed)
+        return rounds is not None and rounds != self.rounds
+
+    def stats(self):
+        """Counters for monitoring (queue/run times in seconds)"""
+        completed = self.checks + self.hashes
+        return {
+            'checks': self.checks,
+            'hashes': self.hashes,
+            'rejected': self.rejected,
+            'timeouts': self.timeouts,
+            'queue_time_avg': self.queue_time_total / completed if completed else 0.0,
+            'queue_time_max': self.queue_time_max,
+            'run_time_avg': self.run_time_total / completed if completed else 0.0
+        }
+
+
+# Shared hasher for this worker process
+password_hasher = PasswordHasher()
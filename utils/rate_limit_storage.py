@@ -0,0 +1,153 @@
+"""
+SQLite storage backend for Flask-Limiter
+Counters live in one SQLite file shared by every gunicorn worker on the host,
+so a limit like "50 per hour" is enforced once instead of once per worker,
+and expired windows are purged from the file rather than kept in each
+worker's memory. Importing this module registers the sqlite:// scheme:
+
+    RATELIMIT_STORAGE_URI=sqlite:////var/www/cellapp/rate_limits.sqlite3
+
+Supports the fixed-window strategy (Flask-Limiter's default)
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from limits.storage import Storage
+
+logger = logging.getLogger(__name__)
+
+# Default database file (next to the app, like the activity spool)
+DEFAULT_RATE_LIMIT_DB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'rate_limits.sqlite3')
+
+# Seconds between sweeps of expired counters (per worker)
+PURGE_INTERVAL = 60.0
+
+# Seconds a writer waits for another worker's lock before failing
+BUSY_TIMEOUT = 5.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_limits (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+)
+"""
+
+# One statement, so the read-modify-write is atomic across workers; an expired
+# window starts over at `amount` with a new expiry
+INCR_SQL = """
+INSERT INTO rate_limits (key, value, expires_at) VALUES (?, ?, ?)
+ON CONFLICT(key) DO UPDATE SET
+    value = CASE WHEN rate_limits.expires_at <= ? THEN excluded.value ELSE rate_limits.value + excluded.value END,
+    expires_at = CASE WHEN rate_limits.expires_at <= ? OR ? THEN excluded.expires_at ELSE rate_limits.expires_at END
+"""
+
+
+def storage_path_from_uri(uri):
+    """
+    Database path from a sqlite:// URI (SQLAlchemy style)
+
+    sqlite:///rate_limits.sqlite3   relative to the working directory
+    sqlite:////var/x/rate.sqlite3   absolute path
+    sqlite://                       DEFAULT_RATE_LIMIT_DB
+    """
+    path = uri.split('://', 1)[1] if '://' in uri else ''
+    if path.startswith('/'):
+        path = path[1:]
+    return path or DEFAULT_RATE_LIMIT_DB
+
+
+class SQLiteStorage(Storage):
+    """Fixed-window rate limit counters in a SQLite file shared across processes"""
+
+    STORAGE_SCHEME = ['sqlite']
+
+    def __init__(self, uri=None, wrap_exceptions=False, **options):
+        self.path = storage_path_from_uri(uri or 'sqlite://')
+        self._local = threading.local()
+        self._last_purge = 0.0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _connection(self):
+        """One connection per thread and process (sqlite3 connections must not cross either)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(SCHEMA)
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _purge_expired(self, conn, now):
+        """Drop expired windows so the file only holds live counters"""
+        if now - self._last_purge < PURGE_INTERVAL:
+            return
+        self._last_purge = now
+        deleted = conn.execute('DELETE FROM rate_limits WHERE expires_at <= ?', (now,)).rowcount
+        if deleted:
+            logger.debug(f"Purged {deleted} expired rate limit counters")
+
+    def incr(self, key, expiry, elastic_expiry=False, amount=1):
+        """
+        Increment the counter for a rate limit key
+
+        Args:
+            key: Rate limit key
+            expiry: Seconds until the window expires (set when the window starts)
+            elastic_expiry: Push the expiry out on every hit (older limits API)
+            amount: Amount to add
+
+        Returns:
+            int: Counter value after the increment
+        """
+        conn = self._connection()
+        now = time.time()
+        self._purge_expired(conn, now)
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(INCR_SQL, (key, amount, now + expiry, now, now, bool(elastic_expiry)))
+            row = conn.execute('SELECT value FROM rate_limits WHERE key = ?', (key,)).fetchone()
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return row[0] if row else amount
+
+    def get(self, key):
+        row = self._connection().execute(
+            'SELECT value FROM rate_limits WHERE key = ? AND expires_at > ?', (key, time.time())
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key):
+        now = time.time()
+        row = self._connection().execute(
+            'SELECT expires_at FROM rate_limits WHERE key = ? AND expires_at > ?', (key, now)
+        ).fetchone()
+        return row[0] if row else now
+
+    def check(self):
+        try:
+            self._connection().execute('SELECT 1').fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self):
+        return self._connection().execute('DELETE FROM rate_limits').rowcount
+
+    def clear(self, key):
+        self._connection().execute('DELETE FROM rate_limits WHERE key = ?', (key,))
@@ -0,0 +1,139 @@
+"""
+Shared Supabase client
+One client per worker process, created on first use (after gunicorn forks),
+with a bounded keep-alive connection pool and explicit timeouts. Modules use
+the `supabase` handle exactly like a supabase.Client:
+
+    from utils.supabase_client import supabase
+    rows = supabase.table('cell_members').select('*').execute()
+"""
+
+import logging
+import os
+import threading
+import httpx
+from dotenv import load_dotenv
+from postgrest.utils import SyncClient
+from supabase import Client, create_client
+from supabase.lib.client_options import ClientOptions
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Connection pool per worker process
+SUPABASE_POOL_SIZE = int(os.getenv('SUPABASE_POOL_SIZE') or '20')  # Max open connections (request threads + fan-out threads)
+SUPABASE_POOL_KEEPALIVE = int(os.getenv('SUPABASE_POOL_KEEPALIVE') or '10')  # Max idle connections kept open
+SUPABASE_KEEPALIVE_EXPIRY = float(os.getenv('SUPABASE_KEEPALIVE_EXPIRY') or '60')  # Seconds an idle connection is kept
+
+# Timeouts (seconds)
+SUPABASE_CONNECT_TIMEOUT = float(os.getenv('SUPABASE_CONNECT_TIMEOUT') or '5')
+SUPABASE_READ_TIMEOUT = float(os.getenv('SUPABASE_READ_TIMEOUT') or '15')
+SUPABASE_POOL_TIMEOUT = float(os.getenv('SUPABASE_POOL_TIMEOUT') or '5')  # Wait for a free pooled connection
+
+_lock = threading.Lock()
+_client = None
+_client_pid = None
+
+
+def _timeout():
+    return httpx.Timeout(
+        connect=SUPABASE_CONNECT_TIMEOUT,
+        read=SUPABASE_READ_TIMEOUT,
+        write=SUPABASE_READ_TIMEOUT,
+        pool=SUPABASE_POOL_TIMEOUT
+    )
+
+
+def _limits():
+    return httpx.Limits(
+        max_connections=SUPABASE_POOL_SIZE,
+        max_keepalive_connections=SUPABASE_POOL_KEEPALIVE,
+        keepalive_expiry=SUPABASE_KEEPALIVE_EXPIRY
+    )
+
+
+def _create_client(url, key):
+    """Create a client whose PostgREST session uses the configured pool"""
+    client = create_client(url, key, options=ClientOptions(
+        postgrest_client_timeout=_timeout(),
+        storage_client_timeout=SUPABASE_READ_TIMEOUT
+    ))
+    # supabase-py builds the PostgREST session without pool limits; swap in a pooled one
+    postgrest = client.postgrest
+    default_session = postgrest.session
+    postgrest.session = SyncClient(
+        base_url=default_session.base_url,
+        headers=default_session.headers,
+        timeout=_timeout(),
+        limits=_limits()
+    )
+    default_session.close()
+    return client
+
+
+def get_supabase():
+    """
+    Get this process's Supabase client, creating it on first use
+
+    Returns:
+        Client: Shared client, or None if SUPABASE_URL / SUPABASE_ANON_KEY are not set
+    """
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client_pid == pid:
+        return _client
+    with _lock:
+        if _client_pid != pid:
+            # A client inherited across fork would share sockets with the parent: build a new one
+            url = os.getenv('SUPABASE_URL')
+            key = os.getenv('SUPABASE_ANON_KEY')
+            client = None
+            if url and key:
+                try:
+                    client = _create_client(url, key)
+                except Exception as e:
+                    logger.error(f"Failed to create Supabase client: {str(e)}")
+            _client = client
+            _client_pid = pid
+    return _client
+
+
+def reset_supabase():
+    """Drop this process's client (e.g. in a gunicorn post_fork hook) so the next use creates a new one"""
+    global _client, _client_pid
+    with _lock:
+        _client = None
+        _client_pid = None
+
+
+# RPC functions this database doesn't have, remembered per process so callers go
+# straight to their fallback queries instead of paying a failed round trip first
+# (restart the app after installing one of the migrations)
+missing_rpcs = set()
+
+
+def rpc_function_missing(error):
+    """Whether an RPC error means the function isn't installed (vs. a transient failure)"""
+    return str(getattr(error, 'code', '') or '') in ('PGRST202', '42883', '404')
+
+
+class SupabaseHandle:
+    """Module-level stand-in for the shared client; attribute access goes to get_supabase()"""
+
+    def __getattr__(self, name):
+        client = get_supabase()
+        if client is None:
+            raise RuntimeError('Supabase is not configured (SUPABASE_URL / SUPABASE_ANON_KEY)')
+        return getattr(client, name)
+
+    def __bool__(self):
+        return get_supabase() is not None
+
+    def __repr__(self):
+        return f"<SupabaseHandle client={get_supabase()!r}>"
+
+
+# Import this instead of calling create_client() per module
+supabase: Client = SupabaseHandle()
@@ -0,0 +1,72 @@
+"""
+Response-time padding for authentication endpoints
+Failed and successful logins must take the same wall-clock time so response
+timing does not reveal which accounts exist. The padding wait is a plain
+time.sleep, which only holds one request under gthread (the worker's other
+threads keep serving) or gevent (time is monkey-patched, so it yields to other
+greenlets). Under sync workers it holds the whole worker for the padding;
+gunicorn.conf.py warns when sync is selected
+"""
+
+import logging
+import secrets
+import threading
+import time
+import bcrypt
+
+logger = logging.getLogger(__name__)
+
+# Minimum wall-clock duration of a login attempt (seconds)
+LOGIN_MIN_DURATION = 0.3
+
+_dummy_hash_lock = threading.Lock()
+_dummy_hashes = {}
+
+
+class ResponseTimer:
+    """
+    Pads a request to a minimum duration measured on the monotonic clock
+
+    Usage:
+        timer = ResponseTimer(LOGIN_MIN_DURATION)
+        ... authenticate ...
+        timer.pad()
+    """
+
+    def __init__(self, minimum=LOGIN_MIN_DURATION):
+        self.minimum = minimum
+        self.started = time.monotonic()
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def remaining(self):
+        return max(0.0, self.minimum - self.elapsed())
+
+    def pad(self):
+        """Wait out the rest of the minimum duration (returns the seconds waited)"""
+        remaining = self.remaining()
+        if remaining > 0:
+            time.sleep(remaining)
+        return remaining
+
+
+def get_dummy_hash(rounds=12):
+    """
+    A valid bcrypt hash of a random secret, checked when there is no real hash
+    so unknown accounts cost the same bcrypt work as known ones
+
+    Args:
+        rounds: bcrypt cost factor (should match the cost of stored hashes)
+
+    Returns:
+        bytes: bcrypt hash (generated once per process and cost)
+    """
+    dummy_hash = _dummy_hashes.get(rounds)
+    if dummy_hash is None:
+        with _dummy_hash_lock:
+            dummy_hash = _dummy_hashes.get(rounds)
+            if dummy_hash is None:
+                dummy_hash = bcrypt.hashpw(secrets.token_hex(16).encode('ascii'), bcrypt.gensalt(rounds))
+                _dummy_hashes[rounds] = dummy_hash
+    return dummy_hash
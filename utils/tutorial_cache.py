@@ -0,0 +1,128 @@
+"""
+Shared tutorials cache keyed by meeting_date
+The tutorials table has no leader_id, so every leader asks the same questions;
+rows are cached per worker for a short TTL and invalidated when a tutorial is
+uploaded. An upload only invalidates the worker that handled it, so "no
+tutorial" answers are kept for a few seconds only: other workers pick up a
+new upload almost at once instead of after the full TTL
+"""
+
+import logging
+import threading
+import time
+from flask import current_app, has_app_context
+from utils.data_context import fetch
+from utils.models import Tutorial
+
+logger = logging.getLogger(__name__)
+
+# Default time-to-live for cached tutorials (seconds)
+DEFAULT_TTL = 300
+
+# Default time-to-live for cached "no tutorial" answers (seconds)
+DEFAULT_EMPTY_TTL = 5
+
+# Maximum number of meeting dates sent in a single in_() filter
+LOOKUP_CHUNK_SIZE = 100
+
+# Maximum number of meeting dates kept in the cache
+MAX_ENTRIES = 2048
+
+
+def _date_key(meeting_date):
+    """Normalize a datetime.date or date string to YYYY-MM-DD (None if empty)"""
+    if not meeting_date:
+        return None
+    if hasattr(meeting_date, 'isoformat'):
+        return meeting_date.isoformat()[:10]
+    return str(meeting_date)[:10]
+
+
+class TutorialCache:
+    """Tutorial rows per meeting date, including empty results (negative caching)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}  # meeting_date_iso -> (expires_at, tuple of Tutorial models)
+
+    @staticmethod
+    def _ttl(empty=False):
+        if empty:
+            default, name = DEFAULT_EMPTY_TTL, 'TUTORIALS_EMPTY_CACHE_TTL'
+        else:
+            default, name = DEFAULT_TTL, 'TUTORIALS_CACHE_TTL'
+        if has_app_context():
+            return current_app.config.get(name, default)
+        return default
+
+    def _store(self, results):
+        now = time.monotonic()
+        ttl, empty_ttl = self._ttl(), self._ttl(empty=True)
+        with self._lock:
+            for date_iso, rows in results.items():
+                self._entries.pop(date_iso, None)
+                self._entries[date_iso] = (now + (ttl if rows else empty_ttl), tuple(rows))
+            # Dicts keep insertion order, so the first keys are the oldest entries
+            while len(self._entries) > MAX_ENTRIES:
+                self._entries.pop(next(iter(self._entries)))
+
+    def get_many(self, supabase, meeting_dates):
+        """
+        Get tutorials for several meeting dates, querying only the uncached ones
+
+        Args:
+            supabase: Supabase client
+            meeting_dates: Iterable of datetime.date objects or date strings
+
+        Returns:
+            dict: {meeting_date_iso: [Tutorial]} with an entry for every requested date
+        """
+        date_isos = {_date_key(meeting_date) for meeting_date in meeting_dates}
+        date_isos.discard(None)
+
+        tutorials_by_date = {}
+        missing = []
+        now = time.monotonic()
+        with self._lock:
+            for date_iso in date_isos:
+                entry = self._entries.get(date_iso)
+                if entry and entry[0] > now:
+                    tutorials_by_date[date_iso] = list(entry[1])
+                else:
+                    missing.append(date_iso)
+
+        if missing:
+            loaded = {date_iso: [] for date_iso in missing}
+            missing.sort()
+            for start in range(0, len(missing), LOOKUP_CHUNK_SIZE):
+                chunk = missing[start:start + LOOKUP_CHUNK_SIZE]
+                rows = fetch(supabase.table('tutorials')\
+                    .select('*')\
+                    .in_('meeting_date', chunk))
+                for tutorial in Tutorial.from_rows(rows):
+                    row_date = tutorial.date.isoformat() if tutorial.date else None
+                    if row_date in loaded:
+                        loaded[row_date].append(tutorial)
+            self._store(loaded)
+            tutorials_by_date.update(loaded)
+
+        return tutorials_by_date
+
+    def get(self, supabase, meeting_date):
+        """Get the Tutorials for one meeting date (empty list if none)"""
+        date_iso = _date_key(meeting_date)
+        if not date_iso:
+            return []
+        return self.get_many(supabase, [date_iso]).get(date_iso, [])
+
+    def invalidate(self, meeting_date=None):
+        """Drop the cached entry for a meeting date, or everything if no date is given"""
+        with self._lock:
+            if meeting_date is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(_date_key(meeting_date), None)
+
+
+# Shared cache for this worker process
+tutorial_cache = TutorialCache()